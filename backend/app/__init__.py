@@ -1,2 +1,10 @@
 # Make app a package for tests and runtime imports
 
+import pandas as _pd  # type: ignore
+
+from .core.config import settings as _settings
+
+if _settings.pandas_copy_on_write:
+    # process-wide: frames shared between the table cache, registry and services are
+    # only copied when one of them actually writes
+    _pd.set_option("mode.copy_on_write", True)
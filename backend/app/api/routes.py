@@ -1,31 +1,40 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Body, Form, Query, Request
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List, Literal
 from ..core.security import require_api_key
 from ..core.config import settings
-from ..services.ingest import load_table, normalize_headers
-from ..services.profile import profile_table
-from ..schemas.profile import ProfileResponse
+from ..services.table_cache import load_table_cached, get_table_cache
+from ..services.ingest import load_table_chunks, iter_frame_chunks, normalize_headers, resolve_engine
+from ..services.profile import profile_table, profile_sources, update_profile
+from ..services.profile_cache import profile_fingerprint, dataset_fingerprint, cached_profiles, store_profiles
+from ..schemas.profile import ProfileResponse, TableProfile
+from ..schemas.dataset import DatasetInfo, DatasetResponse, FKDiscoverRequest
+from ..services.datasets import register_tables, get_dataset, drop_dataset, dataset_sample, dataset_bloom
+from ..services.sampling import content_seed, sample_frame
+from ..services.uploads import spool_upload
 from ..services.match import suggest_mappings
 from ..services.table_pairing import pair_tables
 from ..schemas.pairing import PairRequest, PairResponse, PairingSettings, PairingMatrix, PairSuggestion
 from ..schemas.match import MatchResponse, CandidateMapping
 from fastapi import HTTPException
-from ..services.merge import merge_datasets, er_lite_customers
+from ..services.merge import merge_datasets, er_lite_customers, iter_merge_chunks
 from ..schemas.merge import MappingDecision
-from ..services.validate import run_validation
+from ..services.validate import run_validation, run_validation_chunks
 from ..schemas.validate import ValidateResponse
 from ..services.docs import generate_docs
 from ..services.db import add_input_files, save_manifest, add_artifacts
 from ..services.db import create_run, complete_run, get_run
 from ..services.templates import save_template, apply_template
 from ..services.drift import drift_between
+from ..services.inclusion import discover_foreign_keys, parent_columns
 from ..services.copilot import triage as copilot_triage, fixit as copilot_fixit
 from ..routers.agent_verify import router as agent_verify_router
 
 
 router = APIRouter()
 
+Engine = Literal["pandas", "pyarrow"]
+
 
 @router.get("/healthz")
 async def healthz():
@@ -35,45 +44,222 @@ async def healthz():
         "regulated_mode": settings.regulated_mode,
         "masking_policy": {"match_explain": True, "profile_examples_masked": settings.profile_examples_masked},
         "embeddings_enabled": settings.embeddings_enabled,
+        "ingest_cache": get_table_cache().stats(),
     }
 
 
+async def _load_inputs(files: List[UploadFile] | None, dataset_ids: List[str] | None, engine: str | None = None) -> tuple[list[tuple[str, pd.DataFrame]], list[dict]]:
+    """Resolve uploaded files and/or registered dataset ids into (name, frame) pairs.
+
+    Uploaded files come first, followed by dataset ids, each in request order; a workbook
+    contributes its first sheet. Uploads are spooled to disk and parsed from there, never
+    read whole into memory.
+    """
+    named: list[tuple[str, pd.DataFrame]] = []
+    inputs_meta: list[dict] = []
+    for f in files or []:
+        up = await spool_upload(f)
+        try:
+            df = load_table_cached(up.path, f.filename, sha256=up.sha256, engine=resolve_engine(engine))
+            named.append((f.filename, df))
+        finally:
+            up.cleanup()
+        inputs_meta.append({"name": f.filename, "size": up.size, "sha256": f"sha256:{up.sha256}"})
+    for dsid in dataset_ids or []:
+        entry = get_dataset(dsid)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dsid}")
+        meta = entry["meta"]
+        named.append((meta["name"], entry["df"]))
+        inputs_meta.append({"name": meta["name"], "size": meta["size"], "sha256": meta["sha256"], "dataset_id": dsid})
+    if not named:
+        raise HTTPException(status_code=400, detail="Provide files or dataset_ids.")
+    return named, inputs_meta
+
+
+@router.post("/datasets", response_model=DatasetResponse, dependencies=[Depends(require_api_key)])
+async def datasets_upload(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    engine: Engine | None = Query(default=None),
+    columns: List[str] | None = Query(default=None),
+    nrows: int | None = Query(default=None, ge=1),
+):
+    run_id = getattr(request.state, "run_id", None)
+    infos: list[dict] = []
+    for f in files:
+        up = await spool_upload(f)
+        try:
+            infos.extend(register_tables(
+                up.path, f.filename, run_id=run_id, engine=engine, columns=columns, nrows=nrows,
+                sha256=up.sha256, size=up.size,
+            ))
+        finally:
+            up.cleanup()
+    add_input_files(run_id, [{"name": i["name"], "size": i["size"], "sha256": i["sha256"], "dataset_id": i["dataset_id"]} for i in infos])
+    return DatasetResponse(datasets=[DatasetInfo.model_validate(i) for i in infos], run_id=run_id)
+
+
+@router.get("/datasets/{dataset_id}", response_model=DatasetInfo, dependencies=[Depends(require_api_key)])
+async def datasets_get(dataset_id: str):
+    entry = get_dataset(dataset_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}")
+    return DatasetInfo.model_validate(entry["meta"])
+
+
+@router.delete("/datasets/{dataset_id}", dependencies=[Depends(require_api_key)])
+async def datasets_delete(dataset_id: str):
+    if not drop_dataset(dataset_id):
+        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}")
+    return {"dataset_id": dataset_id, "deleted": True}
+
+
 # Stubs for B1..B8
 @router.post("/profile", response_model=ProfileResponse, dependencies=[Depends(require_api_key)])
-async def profile(request: Request, files: List[UploadFile] = File(...)):
+async def profile(request: Request, files: List[UploadFile] | None = File(default=None), dataset_ids: List[str] | None = Form(default=None), engine: Engine | None = Query(default=None), sketches: bool | None = Query(default=None), key_search: bool | None = Query(default=None)):
+    # import settings at request time so tests that toggle env are respected
+    from app.core.config import settings as cfg_settings
+    from fastapi.concurrency import run_in_threadpool
+    import time
+    entries = []
+    for dsid in dataset_ids or []:
+        entry = get_dataset(dsid)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dsid}")
+        entries.append(entry)
+    if not files and not entries:
+        raise HTTPException(status_code=400, detail="Provide files or dataset_ids.")
     profiles: Dict[str, dict] = {}
-    # capture simple file hashes when possible (size only here; names recorded)
-    import hashlib
+    timings: Dict[str, float] = {}
     inputs_meta: list[dict] = []
-    for f in files:
-        content = await f.read()
-        df = load_table(content, f.filename)
-        df = normalize_headers(df)
-        prof = profile_table(df, f.filename, settings.sample_n)
-        profiles[f.filename] = prof.model_dump()
-        h = hashlib.sha256(content).hexdigest()
-        inputs_meta.append({"name": f.filename, "size": len(content), "sha256": f"sha256:{h}"})
+    cache_hits: list[str] = []
+    eff_engine = resolve_engine(engine)
+    if key_search is None:
+        key_search = cfg_settings.profile_key_search
+    fingerprint = profile_fingerprint(eff_engine, cfg_settings.profile_sketches if sketches is None else sketches, key_search)
+    spooled = [await spool_upload(f) for f in files or []]
+    results: dict[int, tuple] = {}
+    try:
+        # unchanged content profiled with unchanged settings comes straight from the cache
+        if cfg_settings.profile_cache_enabled:
+            for i, up in enumerate(spooled):
+                start = time.perf_counter()
+                hit = cached_profiles(up.sha256, up.filename, cfg_settings.sample_n, fingerprint)
+                if hit is not None:
+                    results[i] = (hit, (time.perf_counter() - start) * 1000.0)
+                    cache_hits.append(up.filename)
+        misses = [i for i in range(len(spooled)) if i not in results]
+        # parse + profile each remaining upload in a worker process; results keep request order
+        fresh = await run_in_threadpool(
+            profile_sources,
+            [(spooled[i].path, spooled[i].filename, spooled[i].sha256) for i in misses],
+            cfg_settings.sample_n,
+            eff_engine,
+            cfg_settings.ingest_workers,
+            sketches,
+            key_search,
+        )
+    finally:
+        for up in spooled:
+            up.cleanup()
+    for i, result in zip(misses, fresh):
+        results[i] = result
+        if cfg_settings.profile_cache_enabled:
+            store_profiles(spooled[i].sha256, spooled[i].filename, cfg_settings.sample_n, fingerprint, result[0])
+    for i, up in enumerate(spooled):
+        tables, elapsed_ms = results[i]
+        for name, prof in tables:
+            profiles[name] = prof.model_dump()
+        timings[up.filename] = round(elapsed_ms, 2)
+        inputs_meta.append({"name": up.filename, "size": up.size, "sha256": f"sha256:{up.sha256}"})
+    # registered datasets are already parsed; profile them in-process
+    for entry in entries:
+        meta = entry["meta"]
+        start = time.perf_counter()
+        sample = dataset_sample(meta["dataset_id"], cfg_settings.sample_n)
+        profiles[meta["name"]] = profile_table(entry["df"], meta["name"], cfg_settings.sample_n, sketches=sketches, sample=sample, key_search=key_search).model_dump()
+        timings[meta["name"]] = round((time.perf_counter() - start) * 1000.0, 2)
+        inputs_meta.append({"name": meta["name"], "size": meta["size"], "sha256": meta["sha256"], "dataset_id": meta["dataset_id"]})
     add_input_files(getattr(request.state, "run_id", None), inputs_meta)
-    # import settings at request time so tests that toggle env are respected
+    return {"profiles": profiles, "examples_masked": cfg_settings.profile_examples_masked, "timings_ms": timings, "cache_hits": cache_hits}
+
+
+@router.post("/profile/update", response_model=TableProfile, dependencies=[Depends(require_api_key)])
+async def profile_update(request: Request, profile: str = Form(...), files: List[UploadFile] | None = File(default=None), dataset_ids: List[str] | None = Form(default=None), engine: Engine | None = Query(default=None)):
+    """Extend a stored profile (built with sketches) with one appended batch of rows."""
+    import json
+    from fastapi.concurrency import run_in_threadpool
+    if len(files or []) + len(dataset_ids or []) != 1:
+        raise HTTPException(status_code=400, detail="Provide exactly one file or dataset_id with the appended rows.")
+    try:
+        base = TableProfile.model_validate(json.loads(profile))
+    except Exception:
+        raise HTTPException(status_code=422, detail="profile must be a TableProfile JSON object")
+    named, inputs_meta = await _load_inputs(files, dataset_ids, engine)
+    try:
+        updated = await run_in_threadpool(update_profile, base, named[0][1])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    add_input_files(getattr(request.state, "run_id", None), inputs_meta)
+    return updated.model_dump()
+
+
+@router.post("/fk/discover", dependencies=[Depends(require_api_key)])
+async def fk_discover(payload: FKDiscoverRequest):
+    """Propose foreign keys among registered datasets from profile sketches, verified exactly."""
     from app.core.config import settings as cfg_settings
-    return {"profiles": profiles, "examples_masked": cfg_settings.profile_examples_masked}
+    from fastapi.concurrency import run_in_threadpool
+    entries = []
+    for dsid in payload.dataset_ids:
+        entry = get_dataset(dsid)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dsid}")
+        entries.append(entry)
+    key_search = cfg_settings.profile_key_search
+    fingerprint = profile_fingerprint(resolve_engine(None), True, key_search)
+
+    def _profile(entry) -> TableProfile:
+        # sketched profiles of unchanged datasets come from the profile cache
+        meta, df = entry["meta"], entry["df"]
+        digest, fp = meta["sha256"].split(":", 1)[-1], dataset_fingerprint(fingerprint, df)
+        if cfg_settings.profile_cache_enabled:
+            hit = cached_profiles(digest, meta["name"], cfg_settings.sample_n, fp)
+            if hit:
+                return hit[0][1]
+        sample = dataset_sample(meta["dataset_id"], cfg_settings.sample_n)
+        prof = profile_table(df, meta["name"], cfg_settings.sample_n, sketches=True, sample=sample, key_search=key_search)
+        if cfg_settings.profile_cache_enabled:
+            store_profiles(digest, meta["name"], cfg_settings.sample_n, fp, [(meta["name"], prof)])
+        return prof
+
+    def _run():
+        profiles = {entry["meta"]["name"]: _profile(entry) for entry in entries}
+        blooms = {
+            (entry["meta"]["name"], col): bloom
+            for entry in entries
+            for col in parent_columns(profiles[entry["meta"]["name"]])
+            if (bloom := dataset_bloom(entry["meta"]["dataset_id"], col)) is not None
+        }
+        frames = {entry["meta"]["name"]: entry["df"] for entry in entries}
+        return discover_foreign_keys(profiles, frames, payload.min_containment, payload.verify_top, blooms)
+
+    return {"candidates": await run_in_threadpool(_run)}
 
 
 @router.post("/match", response_model=MatchResponse, dependencies=[Depends(require_api_key)])
-async def match(request: Request, files: List[UploadFile] = File(...), threshold: float | None = Query(default=None)):
-    if len(files) != 2:
+async def match(request: Request, files: List[UploadFile] | None = File(default=None), dataset_ids: List[str] | None = Form(default=None), threshold: float | None = Query(default=None), engine: Engine | None = Query(default=None), blocking: bool | None = Query(default=None), top_k: int | None = Query(default=None, ge=0)):
+    if len(files or []) + len(dataset_ids or []) != 2:
         raise HTTPException(status_code=400, detail="Provide exactly two files (left and right).")
-    dfs = []
-    inputs_meta: list[dict] = []
-    for f in files:
-        content = await f.read()
-        import hashlib
-        inputs_meta.append({"name": f.filename, "size": len(content), "sha256": f"sha256:{hashlib.sha256(content).hexdigest()}"})
-        df = load_table(content, f.filename)
-        df = normalize_headers(df)
-        dfs.append(df)
-    left_df, right_df = dfs
-    candidates = suggest_mappings(left_df, right_df, sample_n=settings.sample_n, threshold=threshold)
+    named, inputs_meta = await _load_inputs(files, dataset_ids, engine)
+    (_, left_df), (_, right_df) = named
+    # registered datasets reuse their cached sample; uploads are sampled once here, each
+    # seeded by its own content so the two sides are not drawn at the same row positions
+    samples = tuple(
+        dataset_sample(meta["dataset_id"], settings.sample_n) if "dataset_id" in meta else sample_frame(df, settings.sample_n, seed=content_seed(meta["sha256"]))
+        for (_, df), meta in zip(named, inputs_meta)
+    )
+    candidates = suggest_mappings(left_df, right_df, sample_n=settings.sample_n, threshold=threshold, samples=samples, blocking=blocking, top_k=top_k)
     # mark best pick per left
     best_by_left: dict[str, float] = {}
     for c in candidates:
@@ -123,19 +309,11 @@ async def pair(payload: PairRequest):
 
 
 @router.post("/merge", dependencies=[Depends(require_api_key)])
-async def merge(request: Request, files: List[UploadFile] = File(...), decisions: str | None = Form(default=None), limit: int | None = Query(default=None, ge=1), entity_resolution: str | None = Query(default=None)):
-    if len(files) != 2:
+async def merge(request: Request, files: List[UploadFile] | None = File(default=None), dataset_ids: List[str] | None = Form(default=None), decisions: str | None = Form(default=None), limit: int | None = Query(default=None, ge=1), entity_resolution: str | None = Query(default=None), engine: Engine | None = Query(default=None)):
+    if len(files or []) + len(dataset_ids or []) != 2:
         raise HTTPException(status_code=400, detail="Provide exactly two files (left and right).")
-    dfs = []
-    inputs_meta: list[dict] = []
-    for f in files:
-        content = await f.read()
-        import hashlib
-        inputs_meta.append({"name": f.filename, "size": len(content), "sha256": f"sha256:{hashlib.sha256(content).hexdigest()}"})
-        df = load_table(content, f.filename)
-        df = normalize_headers(df)
-        dfs.append(df)
-    left_df, right_df = dfs
+    named, inputs_meta = await _load_inputs(files, dataset_ids, engine)
+    (_, left_df), (_, right_df) = named
     import json
     try:
         raw = json.loads(decisions or "[]")
@@ -165,14 +343,100 @@ async def merge(request: Request, files: List[UploadFile] = File(...), decisions
     return resp
 
 
+async def _chunked_inputs(files: List[UploadFile] | None, dataset_ids: List[str] | None) -> tuple[list[tuple[str, Iterator[pd.DataFrame]]], list[dict], list]:
+    """Like _load_inputs, but each input becomes a lazy iterator of normalized row chunks.
+
+    The chunks are read from spooled files, returned last so the caller can remove them
+    once the iterators are exhausted.
+    """
+    named: list[tuple[str, Iterator[pd.DataFrame]]] = []
+    inputs_meta: list[dict] = []
+    spooled = []
+    try:
+        for f in files or []:
+            up = await spool_upload(f)
+            spooled.append(up)
+            chunks = (normalize_headers(c) for c in load_table_chunks(up.path, f.filename))
+            named.append((f.filename, chunks))
+            inputs_meta.append({"name": f.filename, "size": up.size, "sha256": f"sha256:{up.sha256}"})
+        for dsid in dataset_ids or []:
+            entry = get_dataset(dsid)
+            if entry is None:
+                raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dsid}")
+            meta = entry["meta"]
+            named.append((meta["name"], iter_frame_chunks(entry["df"], settings.ingest_chunk_rows)))
+            inputs_meta.append({"name": meta["name"], "size": meta["size"], "sha256": meta["sha256"], "dataset_id": dsid})
+    except BaseException:
+        for up in spooled:
+            up.cleanup()
+        raise
+    return named, inputs_meta, spooled
+
+
+@router.post("/merge/export", dependencies=[Depends(require_api_key)])
+async def merge_export(request: Request, files: List[UploadFile] | None = File(default=None), dataset_ids: List[str] | None = Form(default=None), decisions: str | None = Form(default=None)):
+    """Stream the full merged table as CSV, chunk by chunk, without materializing it."""
+    from fastapi.responses import StreamingResponse
+    if len(files or []) + len(dataset_ids or []) != 2:
+        raise HTTPException(status_code=400, detail="Provide exactly two files (left and right).")
+    named, inputs_meta, spooled = await _chunked_inputs(files, dataset_ids)
+    (_, left_chunks), (_, right_chunks) = named
+    import json
+    try:
+        raw = json.loads(decisions or "[]")
+        decisions_models = [MappingDecision.model_validate(d) for d in raw or []]
+    except Exception:
+        decisions_models = []
+    run_id = getattr(request.state, "run_id", None)
+    add_input_files(run_id, inputs_meta)
+
+    def _csv_stream():
+        header = True
+        try:
+            for chunk in iter_merge_chunks(left_chunks, right_chunks, decisions_models, lineage_meta={}):
+                yield chunk.to_csv(index=False, header=header)
+                header = False
+        finally:
+            # spooled inputs are only needed while the response streams
+            for up in spooled:
+                up.cleanup()
+
+    headers = {"Content-Disposition": 'attachment; filename="merged.csv"'}
+    if run_id:
+        headers["X-Run-Id"] = run_id
+    return StreamingResponse(_csv_stream(), media_type="text/csv", headers=headers)
+
+
 @router.post("/validate", response_model=ValidateResponse, dependencies=[Depends(require_api_key)])
-async def validate(request: Request, payload: dict = Body(...)):
-    rows = payload.get("rows")
-    if not isinstance(rows, list):
-        raise HTTPException(status_code=400, detail="Expect rows: list")
-    df = pd.DataFrame(rows)
-    contract = payload.get("contract", "customers")
-    result = run_validation(df, contract, aux_tables=None)
+async def validate(request: Request):
+    """Validate JSON ``{"contract", "rows"}``, or a multipart form with one ``files`` upload
+    or ``dataset_ids`` entry (plus ``contract``) validated chunk by chunk."""
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        files = [f for f in form.getlist("files") if not isinstance(f, str)]
+        dataset_ids = [str(d) for d in form.getlist("dataset_ids")]
+        if len(files) + len(dataset_ids) != 1:
+            raise HTTPException(status_code=400, detail="Provide exactly one file or dataset_id.")
+        contract = str(form.get("contract") or "customers")
+        named, inputs_meta, spooled = await _chunked_inputs(files, dataset_ids)
+        from fastapi.concurrency import run_in_threadpool
+        try:
+            result = await run_in_threadpool(run_validation_chunks, named[0][1], contract, None)
+        finally:
+            for up in spooled:
+                up.cleanup()
+        add_input_files(getattr(request.state, "run_id", None), inputs_meta)
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Expect a JSON body or a multipart upload")
+        rows = payload.get("rows") if isinstance(payload, dict) else None
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Expect rows: list")
+        df = pd.DataFrame(rows)
+        contract = payload.get("contract", "customers")
+        result = run_validation(df, contract, aux_tables=None)
     # add gate flag
     gate = False
     if settings.required_rules:
@@ -29,13 +29,76 @@ class Settings:
 
     # Features
     embeddings_enabled: bool = os.getenv("EMBEDDINGS_ENABLED", "false").lower() in {"1", "true", "yes"}
+    # Sentence-transformers model for header embeddings (loaded once per process)
+    embeddings_model: str = os.getenv("EMBEDDINGS_MODEL", "all-MiniLM-L6-v2")
+    # JSONL file of header -> vector embeddings kept across runs (relative paths resolve under
+    # backend/); empty, the default, keeps them in memory only
+    embeddings_cache_path: str = os.getenv("EMBEDDINGS_CACHE_PATH", "")
     match_auto_threshold: float = float(os.getenv("MATCH_AUTO_THRESHOLD", "0.70"))
     sample_n: int = int(os.getenv("SAMPLE_N", "2000"))
+    # How sample_n rows are drawn: "reservoir" (uniform, single pass), "head" (first rows) or
+    # "stratified" (reservoir per value of SAMPLE_STRATIFY, where a table has that column)
+    sample_method: str = os.getenv("SAMPLE_METHOD", "reservoir").lower()
+    sample_stratify: str = os.getenv("SAMPLE_STRATIFY", "")
+    # Seed for reservoir sampling, so profiles and matches are reproducible
+    sample_seed: int = int(os.getenv("SAMPLE_SEED", "0"))
+    # Dataset registry (parsed uploads kept in memory and referenced by id)
+    dataset_registry_max: int = int(os.getenv("DATASET_REGISTRY_MAX", "32"))
+    # Parsed-table cache budget in bytes (DataFrame.memory_usage(deep=True)); 0 disables
+    ingest_cache_max_bytes: int = int(os.getenv("INGEST_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    # Parse engine for CSV/TSV/NDJSON: "pandas" (C parser) or "pyarrow" (multi-threaded, Arrow-backed dtypes)
+    ingest_engine: str = os.getenv("INGEST_ENGINE", "pandas").lower()
+    # Excel reader: "auto" prefers calamine when installed, else openpyxl (read-only)
+    excel_engine: str = os.getenv("EXCEL_ENGINE", "auto").lower()
+    # Worker processes for parallel ingest (workbook sheets, files posted together to /profile)
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Inputs smaller than this (bytes, summed per call) are parsed in-process, not in the pool
+    ingest_parallel_min_bytes: int = int(os.getenv("INGEST_PARALLEL_MIN_BYTES", str(16 * 1024 * 1024)))
+    # Threads profiling column groups of one wide table (1 = serial); output keeps column order
+    profile_column_workers: int = int(os.getenv("PROFILE_COLUMN_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Tables narrower than this are profiled serially (thread hand-off costs more than it saves)
+    profile_parallel_min_columns: int = int(os.getenv("PROFILE_PARALLEL_MIN_COLUMNS", "64"))
+    # Row count per chunk for streamed CSV/TSV ingest
+    ingest_chunk_rows: int = int(os.getenv("INGEST_CHUNK_ROWS", "100000"))
+    # Persist /profile results keyed by content hash + sample_n + profiling-settings fingerprint
+    profile_cache_enabled: bool = os.getenv("PROFILE_CACHE", "true").lower() in {"1", "true", "yes"}
+    # Full-data column sketches in profiles (HLL distinct, t-digest quantiles, Misra-Gries top-k); opt-in
+    profile_sketches: bool = os.getenv("PROFILE_SKETCHES", "false").lower() in {"1", "true", "yes"}
+    # HyperLogLog precision: 2**p registers, ~1.04/sqrt(2**p) relative error
+    sketch_hll_p: int = int(os.getenv("SKETCH_HLL_P", "12"))
+    # Misra-Gries counters (heavy hitters kept) per column
+    sketch_topk: int = int(os.getenv("SKETCH_TOPK", "10"))
+    # MinHash (bottom-k) signature size per sketched column; drives containment estimates
+    sketch_minhash_k: int = int(os.getenv("SKETCH_MINHASH_K", "128"))
+    # Foreign-key discovery: containment needed to propose / accept, candidates verified exactly
+    fk_min_containment: float = float(os.getenv("FK_MIN_CONTAINMENT", "0.95"))
+    fk_verify_top: int = int(os.getenv("FK_VERIFY_TOP", "20"))
+    # Bloom filters built per dataset key column for FK discovery (kept server-side, not in
+    # profiles): target false-positive rate and size cap in bits
+    fk_bloom_fpp: float = float(os.getenv("FK_BLOOM_FPP", "0.01"))
+    fk_bloom_max_bits: int = int(os.getenv("FK_BLOOM_MAX_BITS", str(1 << 23)))
+    # Run pandas under Copy-on-Write (copies become lazy; services skip defensive full-frame copies)
+    pandas_copy_on_write: bool = os.getenv("PANDAS_COPY_ON_WRITE", "true").lower() in {"1", "true", "yes"}
+    # Uploads are spooled to disk in chunks of this many bytes (hashed as they stream)
+    upload_chunk_bytes: int = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+    # Directory for spooled uploads; empty uses the system temp dir
+    upload_spool_dir: str = os.getenv("UPLOAD_SPOOL_DIR", "")
     # Match weights
     match_weight_name: float = float(os.getenv("MATCH_WEIGHT_NAME", "0.45"))
     match_weight_type: float = float(os.getenv("MATCH_WEIGHT_TYPE", "0.20"))
     match_weight_overlap: float = float(os.getenv("MATCH_WEIGHT_OVERLAP", "0.20"))
     match_weight_embed: float = float(os.getenv("MATCH_WEIGHT_EMBED", "0.15"))
+    # Value overlap in /match: "exact" (Jaccard of sampled values) or "minhash" (full-column
+    # signatures of MATCH_MINHASH_K bins, pairs retrieved by LSH with MATCH_LSH_BANDS bands)
+    match_overlap_mode: str = os.getenv("MATCH_OVERLAP_MODE", "exact").lower()
+    match_minhash_k: int = int(os.getenv("MATCH_MINHASH_K", "128"))
+    match_lsh_bands: int = int(os.getenv("MATCH_LSH_BANDS", "64"))
+    # Blocking: return only pairs of compatible family, plus each left column's most similar headers
+    match_blocking: bool = os.getenv("MATCH_BLOCKING", "false").lower() in {"1", "true", "yes"}
+    # Right columns with the most similar headers always shortlisted per left column when blocking
+    match_blocking_name_k: int = int(os.getenv("MATCH_BLOCKING_NAME_K", "2"))
+    # Candidates returned per left column in /match (0 keeps all)
+    match_top_k: int = int(os.getenv("MATCH_TOP_K", "0"))
     # Drift thresholds
     drift_warn_delta: float = float(os.getenv("DRIFT_WARN_DELTA", "0.15"))
     drift_crit_delta: float = float(os.getenv("DRIFT_CRIT_DELTA", "0.30"))
@@ -44,6 +107,11 @@ class Settings:
     merge_preview_max: int = int(os.getenv("MERGE_PREVIEW_MAX", "500"))
     # PK heuristic ratio
     pk_unique_ratio: float = float(os.getenv("PK_UNIQUE_RATIO", "0.99"))
+    # Composite candidate keys: opt-in lattice search on /profile (single-column keys are always
+    # checked), widest column combination searched (0 disables) and time budget
+    profile_key_search: bool = os.getenv("PROFILE_KEY_SEARCH", "false").lower() in {"1", "true", "yes"}
+    pk_max_arity: int = int(os.getenv("PK_MAX_ARITY", "3"))
+    pk_search_budget_s: float = float(os.getenv("PK_SEARCH_BUDGET_S", "1.0"))
     # Outliers
     outlier_iqr_k: float = float(os.getenv("OUTLIER_IQR_K", "1.5"))
     outlier_z: float = float(os.getenv("OUTLIER_Z", "3.0"))
@@ -7,6 +7,7 @@ from starlette.middleware.cors import CORSMiddleware
 from .core.logging import setup_logging, generate_request_id
 from .core.config import settings
 from .api.routes import router as api_router
+from .services.workers import shutdown_pool
 from .core.config import settings
 
 
@@ -52,6 +53,11 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.on_event("shutdown")
+def _stop_workers():
+    shutdown_pool()
+
+
 @app.get("/healthz")
 async def healthz():
     return {"service": settings.service_name, "version": settings.version}
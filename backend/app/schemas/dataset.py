@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class DatasetInfo(BaseModel):
+    dataset_id: str
+    name: str
+    size: int
+    sha256: str
+    rows: int
+    columns: List[str] = Field(default_factory=list)
+    run_id: str | None = None
+    created_at: str | None = None
+
+
+class DatasetResponse(BaseModel):
+    datasets: List[DatasetInfo]
+    run_id: str | None = None
+
+
+class FKDiscoverRequest(BaseModel):
+    dataset_ids: List[str] = Field(min_length=2)
+    # defaults: FK_MIN_CONTAINMENT / FK_VERIFY_TOP
+    min_containment: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+    verify_top: Optional[int] = Field(default=None, ge=0)
@@ -2,7 +2,7 @@ from __future__ import annotations
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Literal
 
-ScoreKey = Literal["name", "type", "value_overlap", "embedding"]
+ScoreKey = Literal["name", "type", "value_overlap", "embedding", "containment"]
 
 
 class CandidateMapping(BaseModel):
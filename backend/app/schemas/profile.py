@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Union
 
 
 class ColumnProfile(BaseModel):
@@ -12,6 +12,15 @@ class ColumnProfile(BaseModel):
     candidate_primary_key_sampled: bool
     examples: List[str] = Field(default_factory=list)
     semantic_tags: List[str] = Field(default_factory=list)
+    # numeric / datetime columns only (ISO strings for datetimes)
+    min_value: Optional[Union[int, float, str]] = None
+    max_value: Optional[Union[int, float, str]] = None
+    # text columns whose sample parses as numbers/dates: "integer"|"number"|"date"|"datetime"
+    inferred_type: Optional[str] = None
+    # the winning parse format (utils.normalize NUMBER_FORMATS label or strptime pattern)
+    format: Optional[str] = None
+    # full-data sketch state + summary (services.sketches.ColumnSketch.to_dict); None unless requested
+    sketches: Optional[Dict[str, Any]] = None
 
 
 class TableProfile(BaseModel):
@@ -20,11 +29,20 @@ class TableProfile(BaseModel):
     columns: int
     sample_n: int
     columns_profile: List[ColumnProfile]
+    # unique, null-free columns over all rows; minimal column combinations when the
+    # composite search ran (services.keys)
+    candidate_keys: List[List[str]] = Field(default_factory=list)
+    # False when PK_SEARCH_BUDGET_S ran out first; None when no composite search ran
+    candidate_keys_complete: Optional[bool] = None
 
 
 class ProfileResponse(BaseModel):
     profiles: Dict[str, TableProfile]
     examples_masked: bool | None = None
+    # wall-clock parse + profile time per input (file name or dataset name), in request order
+    timings_ms: Dict[str, float] = Field(default_factory=dict)
+    # uploads served from the persistent profile cache (unchanged content and settings)
+    cache_hits: List[str] = Field(default_factory=list)
 
 
 
@@ -0,0 +1,147 @@
+"""Dataset registry: parse an upload once and reuse it across a run."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd  # type: ignore
+
+from ..core.config import settings
+from .ingest import is_multi_table, load_tables, normalize_headers, project_frame, resolve_engine
+from .sampling import content_seed, sample_frame
+from .sketches import BloomFilter
+from .table_cache import load_table_cached
+
+# dataset_id -> {"meta": {...}, "df": DataFrame, "samples": {(n, method, seed): DataFrame},
+#                "blooms": {(column, fpp, max_bits): BloomFilter}};
+# insertion order doubles as age for eviction
+_DATASETS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LOCK = threading.Lock()
+
+# raw bytes, or the path of a spooled upload (see services.uploads)
+Content = Union[bytes, str, os.PathLike]
+
+
+def _digest_and_size(content: Content, sha256: Optional[str], size: Optional[int]) -> tuple[str, int]:
+    if sha256 is None or size is None:
+        # spooled uploads arrive with both already computed
+        if not isinstance(content, (bytes, bytearray)):
+            raise ValueError("sha256 and size are required when registering a file path")
+        return hashlib.sha256(content).hexdigest(), len(content)
+    return sha256.split(":", 1)[-1], int(size)
+
+
+def register_dataset(
+    content: Content,
+    filename: str,
+    run_id: Optional[str] = None,
+    engine: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    nrows: Optional[int] = None,
+    sha256: Optional[str] = None,
+    size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Parse and normalize an upload, keep the frame in memory and return its metadata.
+
+    ``columns``/``nrows`` restrict what is read (e.g. only the fields a mapping needs).
+    """
+    digest, nbytes = _digest_and_size(content, sha256, size)
+    df = load_table_cached(
+        content, filename, sha256=digest, engine=resolve_engine(engine),
+        columns=tuple(columns) if columns else None, nrows=nrows,
+    )
+    return _store(df, filename, nbytes, digest, run_id)
+
+
+def register_tables(
+    content: Content,
+    filename: str,
+    run_id: Optional[str] = None,
+    engine: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    nrows: Optional[int] = None,
+    sha256: Optional[str] = None,
+    size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Like register_dataset, but every sheet of a workbook becomes its own dataset."""
+    if not is_multi_table(filename):
+        return [register_dataset(content, filename, run_id=run_id, engine=engine, columns=columns, nrows=nrows, sha256=sha256, size=size)]
+    digest, nbytes = _digest_and_size(content, sha256, size)
+    tables = load_tables(content, filename, engine=resolve_engine(engine))
+    return [
+        _store(normalize_headers(project_frame(df, columns, nrows)), name, nbytes, digest, run_id)
+        for name, df in tables.items()
+    ]
+
+
+def _store(df: pd.DataFrame, name: str, size: int, digest: str, run_id: Optional[str]) -> Dict[str, Any]:
+    meta = {
+        "dataset_id": str(uuid.uuid4()),
+        "name": name,
+        "size": size,
+        "sha256": f"sha256:{digest}",
+        "rows": int(len(df)),
+        "columns": [str(c) for c in df.columns],
+        "run_id": run_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with _LOCK:
+        _DATASETS[meta["dataset_id"]] = {"meta": meta, "df": df, "samples": {}, "blooms": {}}
+        # evict oldest datasets beyond the configured cap
+        while len(_DATASETS) > max(1, settings.dataset_registry_max):
+            _DATASETS.popitem(last=False)
+    return dict(meta)
+
+
+def get_dataset(dataset_id: str) -> Optional[Dict[str, Any]]:
+    with _LOCK:
+        entry = _DATASETS.get(dataset_id)
+    if entry is None:
+        return None
+    return {"meta": dict(entry["meta"]), "df": entry["df"]}
+
+
+def dataset_sample(dataset_id: str, n: int) -> Optional[pd.DataFrame]:
+    """``n``-row sample of a registered dataset, drawn once and shared by profile and match
+    (seeded by its content, see ``sampling.content_seed``)."""
+    from app.core.config import settings as cfg_settings
+    key = (int(n), cfg_settings.sample_method, cfg_settings.sample_stratify, cfg_settings.sample_seed)
+    with _LOCK:
+        entry = _DATASETS.get(dataset_id)
+        if entry is None:
+            return None
+        cached = entry["samples"].get(key)
+    if cached is None:
+        cached = sample_frame(entry["df"], int(n), seed=content_seed(entry["meta"]["sha256"]))
+        with _LOCK:
+            entry["samples"][key] = cached
+    return cached
+
+
+def dataset_bloom(dataset_id: str, column: str) -> Optional[BloomFilter]:
+    """Bloom filter of every value of a dataset column (for FK discovery), built once and
+    kept with the dataset; None for unknown datasets or columns."""
+    from app.core.config import settings as cfg_settings
+    from .inclusion import key_bloom
+    key = (column, cfg_settings.fk_bloom_fpp, cfg_settings.fk_bloom_max_bits)
+    with _LOCK:
+        entry = _DATASETS.get(dataset_id)
+        if entry is None or column not in entry["df"].columns:
+            return None
+        cached = entry["blooms"].get(key)
+    if cached is None:
+        cached = key_bloom(entry["df"][column])
+        with _LOCK:
+            entry["blooms"][key] = cached
+    return cached
+
+
+def drop_dataset(dataset_id: str) -> bool:
+    with _LOCK:
+        return _DATASETS.pop(dataset_id, None) is not None
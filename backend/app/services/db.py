@@ -46,6 +46,17 @@ class Template(Base):
     content_json: Mapped[str] = mapped_column(Text)
 
 
+class ProfileCacheEntry(Base):
+    __tablename__ = "profile_cache"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    sha256: Mapped[str] = mapped_column(String(80), index=True)
+    sample_n: Mapped[int] = mapped_column(Integer)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    content_json: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
 # Compute a stable, absolute SQLite path by default (under backend/)
 if settings.db_dsn:
     _dsn = settings.db_dsn
@@ -153,3 +164,22 @@ def add_artifacts(run_id: Optional[str], artifacts: List[Dict[str, Any]]) -> Non
         r.artifacts_json = json.dumps(existing + artifacts)
 
 
+def get_cached_profiles(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    with get_session() as s:
+        e: Optional[ProfileCacheEntry] = s.query(ProfileCacheEntry).filter(ProfileCacheEntry.cache_key == cache_key).one_or_none()
+        return json.loads(e.content_json) if e is not None else None
+
+
+def put_cached_profiles(cache_key: str, sha256: str, sample_n: int, fingerprint: str, tables: List[Dict[str, Any]]) -> None:
+    with get_session() as s:
+        e: Optional[ProfileCacheEntry] = s.query(ProfileCacheEntry).filter(ProfileCacheEntry.cache_key == cache_key).one_or_none()
+        if e is None:
+            e = ProfileCacheEntry(cache_key=cache_key, sha256=sha256, sample_n=sample_n, fingerprint=fingerprint, content_json="")
+            s.add(e)
+        e.content_json = json.dumps(tables)
+        e.created_at = datetime.now(timezone.utc)
+
+
+def clear_profile_cache() -> int:
+    with get_session() as s:
+        return s.query(ProfileCacheEntry).delete()
@@ -4,6 +4,14 @@ from typing import Dict, Any, List
 from app.core.config import settings
 
 
+def null_rate(col: Dict[str, Any], profile: Dict[str, Any]) -> float:
+    sk = col.get("sketches") or {}
+    if sk.get("count"):
+        return float(sk.get("null_count", 0)) / float(sk["count"])
+    rows = float(profile.get("rows", 1) or 1)
+    return float(col.get("null_count", 0)) / (rows or 1)
+
+
 def drift_between(baseline: Dict[str, Any], current: Dict[str, Any]):
     # baseline/current expected shape: { table: { columns_profile: [{name,dtype,null_count, ...}], rows, ... } }
     def colmap(profile: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -26,14 +34,10 @@ def drift_between(baseline: Dict[str, Any], current: Dict[str, Any]):
             ct = ccols[name].get("dtype")
             if bt != ct:
                 type_changed.append({"col": name, "from": bt, "to": ct})
-            # null rate delta (approx, using null_count / rows)
+            # null rate delta (exact from full-data sketches when present, else null_count / rows)
             try:
-                bnull = float(bcols[name].get("null_count", 0))
-                cnull = float(ccols[name].get("null_count", 0))
-                brows = float(bprof.get("rows", 1) or 1)
-                crows = float(cprof.get("rows", 1) or 1)
-                b_rate = bnull / (brows or 1)
-                c_rate = cnull / (crows or 1)
+                b_rate = null_rate(bcols[name], bprof)
+                c_rate = null_rate(ccols[name], cprof)
                 delta = c_rate - b_rate
                 if abs(delta) > 1e-9:
                     nullrate_delta.append({"col": name, "delta": round(delta, 6)})
@@ -0,0 +1,143 @@
+"""Header embeddings: one model per process and a persistent, content-keyed vector cache.
+
+The sentence-transformers model is loaded on first use and shared by every request; the
+load holds its own lock, so cached lookups are not held up by it. Vectors are cached by a
+hash of (model name, header text) in memory and appended to a JSONL file
+(``EMBEDDINGS_CACHE_PATH``, relative paths under backend/ like the SQLite DB), so recurring
+column names are only encoded once across restarts. Each row records its model; rows of
+other models are skipped. Without a usable model, headers that are not cached get zero
+vectors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# guards _VECTORS / _LOADED_FROM; _LOAD_LOCK serializes model loads only
+_LOCK = threading.Lock()
+_LOAD_LOCK = threading.Lock()
+# model name -> loaded model, or None when it could not be loaded
+_MODELS: Dict[str, Any] = {}
+# cache key -> vector, for one model; _LOADED_FROM is the (file, model) read into it
+_VECTORS: Dict[str, List[float]] = {}
+_LOADED_FROM: Optional[Tuple[str, str]] = None
+_BACKEND_DIR = Path(__file__).resolve().parents[2]  # .../backend
+# dimension of the offline vectors when nothing is cached yet
+_FALLBACK_DIM = 3
+
+logger = logging.getLogger("app")
+
+
+def _settings():
+    # Import settings at call time to honor env changes in tests
+    from app.core.config import settings as cfg_settings
+    return cfg_settings
+
+
+def _load_model(name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(name)
+
+
+def get_model(name: Optional[str] = None) -> Any:
+    """The shared model (loaded on first call), or None when it is unavailable."""
+    name = name or _settings().embeddings_model
+    if name in _MODELS:
+        return _MODELS[name]
+    with _LOAD_LOCK:
+        if name not in _MODELS:
+            try:
+                _MODELS[name] = _load_model(name)
+            except Exception as exc:
+                # remembered, so an offline process does not retry the import on every request
+                logger.warning("embedding model %s unavailable: %s", name, exc)
+                _MODELS[name] = None
+        return _MODELS[name]
+
+
+def cache_path(path: Optional[str] = None) -> str:
+    """``EMBEDDINGS_CACHE_PATH`` with relative paths resolved under backend/ ("" = memory only)."""
+    path = _settings().embeddings_cache_path if path is None else path
+    if not path:
+        return ""
+    return str(Path(path) if Path(path).is_absolute() else _BACKEND_DIR / path)
+
+
+def _key(model: str, header: str) -> str:
+    return hashlib.sha256(f"{model}\0{header}".encode("utf-8")).hexdigest()
+
+
+def _load_cache(path: str, model: str) -> None:
+    # caller holds _LOCK
+    global _LOADED_FROM
+    if _LOADED_FROM == (path, model):
+        return
+    _VECTORS.clear()
+    _LOADED_FROM = (path, model)
+    if not path or not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                row = json.loads(line)
+                if row["model"] == model:
+                    _VECTORS[row["key"]] = [float(x) for x in row["vector"]]
+            except (ValueError, KeyError, TypeError):
+                continue  # a torn last line from an interrupted write, or an unlabeled row
+
+
+def _store(path: str, model: str, rows: Dict[str, List[float]]) -> None:
+    # caller holds _LOCK
+    if _LOADED_FROM != (path, model):
+        return  # settings changed while encoding; these vectors belong to another cache
+    _VECTORS.update(rows)
+    if not path or not rows:
+        return
+    try:
+        with open(path, "a", encoding="utf-8") as fh:
+            for key, vector in rows.items():
+                fh.write(json.dumps({"model": model, "key": key, "vector": vector}) + "\n")
+    except OSError as exc:
+        logger.warning("could not persist header embeddings to %s: %s", path, exc)
+
+
+def embed_headers(headers: List[str]) -> List[List[float]]:
+    """Normalized embedding of each header; only headers missing from the cache hit the model."""
+    cfg = _settings()
+    model_name, path = cfg.embeddings_model, cache_path(cfg.embeddings_cache_path)
+    keys = [_key(model_name, h) for h in headers]
+    with _LOCK:
+        _load_cache(path, model_name)
+        missing = list(dict.fromkeys(h for h, k in zip(headers, keys) if k not in _VECTORS))
+    if missing:
+        model = get_model(model_name)
+        if model is not None:
+            try:
+                vectors = model.encode(missing, normalize_embeddings=True).tolist()
+            except Exception as exc:
+                logger.warning("header embedding failed: %s", exc)
+            else:
+                with _LOCK:
+                    _store(path, model_name, {_key(model_name, h): v for h, v in zip(missing, vectors)})
+    with _LOCK:
+        if _LOADED_FROM != (path, model_name):
+            _load_cache(path, model_name)
+        # only vectors of this model say what its dimension is
+        dim = len(next(iter(_VECTORS.values()), [0.0] * _FALLBACK_DIM))
+        return [list(_VECTORS.get(k, [0.0] * dim)) for k in keys]
+
+
+def reset() -> None:
+    """Forget the loaded models and the in-memory cache (the file stays)."""
+    global _LOADED_FROM
+    with _LOCK:
+        _MODELS.clear()
+        _VECTORS.clear()
+        _LOADED_FROM = None
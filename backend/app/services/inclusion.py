@@ -0,0 +1,139 @@
+"""Inclusion-dependency (foreign-key) discovery across profiled tables.
+
+Every column pair would be a full join; instead containment is estimated from the
+sketches each profile already carries (built with ``sketches=True``):
+
+- parents are single-column keys (``candidate_keys`` / sampled PK flag);
+- a child column is any column of another table with the same sketch kind and no more
+  distinct values than the parent (HLL estimates, with slack);
+- containment of the child in the parent is estimated from the child's MinHash
+  (bottom-k) values: tested against a Bloom filter of the parent column when one is
+  passed in (corrected for its false-positive rate), else against the parent's own
+  bottom-k signature. Bloom filters grow with the column, so they are not part of the
+  profiles; callers build them per dataset (see ``key_bloom``, ``datasets.dataset_bloom``).
+
+Only the best ``verify_top`` estimates are then checked exactly against the frames.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from ..schemas.profile import TableProfile
+from .sketches import BloomFilter, ColumnSketch, sketch_kind
+
+# estimates are proposed this far below the acceptance threshold (bottom-k sampling noise)
+_ESTIMATE_SLACK = 0.1
+# a child may show a few % more distinct values than its parent (HLL error)
+_DISTINCT_SLACK = 1.1
+
+
+def _sketches(prof: TableProfile) -> Dict[str, ColumnSketch]:
+    return {c.name: ColumnSketch.from_dict(c.sketches) for c in prof.columns_profile if c.sketches and c.sketches.get("hll")}
+
+
+def parent_columns(prof: TableProfile) -> List[str]:
+    """Columns of ``prof`` that can be referenced: single-column keys and sampled PKs."""
+    keys = [k[0] for k in prof.candidate_keys if len(k) == 1]
+    keys += [c.name for c in prof.columns_profile if c.candidate_primary_key_sampled and c.name not in keys]
+    return keys
+
+
+def key_bloom(s: pd.Series, fpp: Optional[float] = None, max_bits: Optional[int] = None) -> BloomFilter:
+    """Bloom filter of every value of ``s``, hashed the way its column sketch hashes them."""
+    from app.core.config import settings as cfg_settings
+    hashes = ColumnSketch(sketch_kind(s.dtype)).value_hashes(s)
+    bloom = BloomFilter.for_capacity(
+        len(np.unique(hashes)),
+        fpp=cfg_settings.fk_bloom_fpp if fpp is None else fpp,
+        max_bits=cfg_settings.fk_bloom_max_bits if max_bits is None else max_bits,
+    )
+    bloom.add_hashes(hashes)
+    return bloom
+
+
+def estimate_containment(child: ColumnSketch, parent: ColumnSketch, bloom: Optional[BloomFilter] = None) -> Optional[float]:
+    """Estimated share of the child's distinct values present in the parent column
+    (``bloom``, when given, holds every value of the parent column)."""
+    if not len(child.minhash.hashes):
+        return None
+    if bloom is not None:
+        hit = float(bloom.contains(child.minhash.hashes).mean())
+        fpp = bloom.fpp
+        return max(0.0, min(1.0, (hit - fpp) / (1.0 - fpp))) if fpp < 1.0 else None
+    return child.minhash.containment_in(parent.minhash)
+
+
+def exact_containment(child: pd.Series, parent: pd.Series) -> float:
+    values = pd.unique(child.dropna())
+    if not len(values):
+        return 0.0
+    return float(pd.Series(values).isin(parent.dropna()).mean())
+
+
+def discover_foreign_keys(
+    profiles: Mapping[str, TableProfile],
+    frames: Optional[Mapping[str, pd.DataFrame]] = None,
+    min_containment: Optional[float] = None,
+    verify_top: Optional[int] = None,
+    blooms: Optional[Mapping[Tuple[str, str], BloomFilter]] = None,
+) -> List[Dict[str, Any]]:
+    """Proposed ``child.column -> parent.key`` references, best first.
+
+    ``blooms`` maps ``(table, column)`` of parent columns to their Bloom filters.
+
+    With ``frames`` (same keys as ``profiles``) the top ``verify_top`` proposals are checked
+    exactly and only those reaching ``min_containment`` are kept, marked ``verified``;
+    without frames the estimates are returned as they are.
+    """
+    from app.core.config import settings as cfg_settings
+    min_containment = cfg_settings.fk_min_containment if min_containment is None else min_containment
+    verify_top = cfg_settings.fk_verify_top if verify_top is None else verify_top
+    sketches = {t: _sketches(p) for t, p in profiles.items()}
+    proposals: List[Dict[str, Any]] = []
+    for ptable, pprof in profiles.items():
+        for pcol in parent_columns(pprof):
+            parent = sketches[ptable].get(pcol)
+            if parent is None:
+                continue
+            p_distinct = parent.hll.estimate()
+            for ctable, cols in sketches.items():
+                if ctable == ptable:
+                    continue
+                for ccol, child in cols.items():
+                    if child.kind != parent.kind or child.count == child.null_count:
+                        continue
+                    c_distinct = child.hll.estimate()
+                    if c_distinct > p_distinct * _DISTINCT_SLACK:
+                        continue
+                    est = estimate_containment(child, parent, (blooms or {}).get((ptable, pcol)))
+                    if est is None or est < min_containment - _ESTIMATE_SLACK:
+                        continue
+                    proposals.append({
+                        "child_table": ctable,
+                        "child_column": ccol,
+                        "parent_table": ptable,
+                        "parent_column": pcol,
+                        "estimated_containment": round(est, 4),
+                        "containment": None,
+                        "verified": False,
+                        "_rank": (est, c_distinct),
+                    })
+    proposals.sort(key=lambda r: r["_rank"], reverse=True)
+    for r in proposals:
+        del r["_rank"]
+    if frames is None:
+        return proposals
+    kept: List[Dict[str, Any]] = []
+    for r in proposals[: max(0, verify_top)]:
+        child_df, parent_df = frames.get(r["child_table"]), frames.get(r["parent_table"])
+        if child_df is None or parent_df is None:
+            continue
+        exact = exact_containment(child_df[r["child_column"]], parent_df[r["parent_column"]])
+        if exact >= min_containment:
+            kept.append({**r, "containment": round(exact, 4), "verified": True})
+    kept.sort(key=lambda r: (r["containment"], r["estimated_containment"]), reverse=True)
+    return kept
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import codecs
+import gzip
 import io
 import json
+import os
 import re
-from typing import List
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterator, List, Sequence
 
 import pandas as pd  # type: ignore
 
+try:  # pragma: no cover - optional fast path (requirements-arrow.txt)
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+    import pyarrow.json as pa_json  # type: ignore
+    import pyarrow.parquet as pa_parquet  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None
+
 
 def _decode_bytes_utf8_fallback(content: bytes) -> str:
     for enc in ("utf-8", "utf-8-sig", "latin-1"):
@@ -20,59 +32,520 @@ def _decode_bytes_utf8_fallback(content: bytes) -> str:
     return content.decode("utf-8", errors="ignore")
 
 
-def load_table(content: bytes, filename: str) -> pd.DataFrame:
+def _sniff_encoding(head: bytes) -> str:
+    """Pick a codec from the first bytes of a stream, mirroring _decode_bytes_utf8_fallback."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False so a multi-byte char split at the boundary is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+_CODECS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def _is_path(content) -> bool:
+    return isinstance(content, (str, os.PathLike))
+
+
+def _as_stream(content: bytes | BinaryIO | str | os.PathLike) -> BinaryIO:
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return io.BytesIO(content)
+    if _is_path(content):
+        return open(content, "rb")
+    content.seek(0)
+    return content
+
+
+def _file_source(content: bytes | BinaryIO | str | os.PathLike):
+    """What pandas/zipfile readers accept: a path is passed through (they open it), bytes get a buffer."""
+    return os.fspath(content) if _is_path(content) else _as_stream(content)
+
+
+def _head(content: bytes | BinaryIO | str | os.PathLike, size: int = 64 * 1024) -> bytes:
+    if _is_path(content):
+        with open(content, "rb") as fh:
+            return fh.read(size)
+    stream = _as_stream(content)
+    head = stream.read(size)
+    stream.seek(0)
+    return head
+
+
+def _read_all(content: bytes | BinaryIO | str | os.PathLike) -> bytes:
+    if isinstance(content, (bytes, bytearray)):
+        return content
+    if _is_path(content):
+        with open(content, "rb") as fh:
+            return fh.read()
+    return _as_stream(content).read()
+
+
+def _split_codec(name: str) -> tuple[str | None, str]:
+    """(codec, inner name) for ``data.csv.gz`` style names; codec is None when uncompressed."""
+    for ext, codec in _CODECS.items():
+        if name.endswith(ext):
+            return codec, name[: -len(ext)]
+    return None, name
+
+
+def _is_delimited(name: str) -> bool:
+    # CSV/TSV and unknown extensions (parsed as CSV)
+    return not name.endswith((".json", ".ndjson", ".zip") + _EXCEL_EXTS + _COLUMNAR_EXTS + tuple(_CODECS))
+
+
+def _open_decompressed(content: bytes | BinaryIO | str | os.PathLike, codec: str) -> BinaryIO:
+    """Streaming decompressor over the upload; nothing is inflated up front."""
+    if codec == "gzip":
+        return gzip.open(_file_source(content), "rb")
+    try:
+        import zstandard  # type: ignore
+        return zstandard.ZstdDecompressor().stream_reader(_as_stream(content))
+    except ImportError:
+        if pa is None:
+            raise ValueError("zstandard (or pyarrow) is required to read .zst uploads")
+        return pa.CompressedInputStream(_arrow_source(content), "zstd")
+
+
+def _peek(open_stream: Callable[[], BinaryIO]) -> bytes:
+    with open_stream() as fh:
+        return fh.read(64 * 1024)
+
+
+def _open_source(content: bytes | BinaryIO | str | os.PathLike) -> Callable[[], BinaryIO | str]:
+    # a path is reopened by the parser itself; anything else is rewound
+    return (lambda: os.fspath(content)) if _is_path(content) else (lambda: _as_stream(content))
+
+
+def _csv_kwargs(name: str, columns: Sequence[str] | None, encoding: str) -> dict:
+    return {"sep": "\t" if name.endswith(".tsv") else ",", "usecols": _column_filter(columns),
+            "encoding": encoding, "encoding_errors": "strict"}
+
+
+def _read_delimited(open_stream: Callable[[], BinaryIO | str], head: bytes, name: str, columns: Sequence[str] | None = None,
+                    nrows: int | None = None) -> pd.DataFrame:
+    """pd.read_csv straight from a binary stream or path, decoding incrementally.
+
+    The codec is sniffed from the first 64 KiB, but the read is strict: a byte that is not
+    valid UTF-8 further in re-reads the whole file as latin-1, like the in-memory path.
+    """
+    try:
+        return pd.read_csv(open_stream(), nrows=nrows, **_csv_kwargs(name, columns, _sniff_encoding(head)))
+    except UnicodeDecodeError:
+        return pd.read_csv(open_stream(), nrows=nrows, **_csv_kwargs(name, columns, "latin-1"))
+
+
+def _iter_delimited(open_stream: Callable[[], BinaryIO | str], head: bytes, name: str, columns: Sequence[str] | None,
+                    chunksize: int) -> Iterator[pd.DataFrame]:
+    """Chunked ``_read_delimited``. When a non-UTF-8 byte shows up after chunks were already
+    yielded, the file is reopened as latin-1 and resumes after the rows handed out so far."""
+    done = 0
+    try:
+        with pd.read_csv(open_stream(), chunksize=chunksize, **_csv_kwargs(name, columns, _sniff_encoding(head))) as reader:
+            for chunk in reader:
+                yield chunk
+                done += len(chunk)
+        return
+    except UnicodeDecodeError:
+        pass
+    skip = range(1, done + 1) if done else None
+    with pd.read_csv(open_stream(), chunksize=chunksize, skiprows=skip, **_csv_kwargs(name, columns, "latin-1")) as reader:
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(done, done + len(chunk))
+            done += len(chunk)
+            yield chunk
+
+
+def _zip_members(zf: zipfile.ZipFile) -> List[str]:
+    return [
+        info.filename for info in zf.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not os.path.basename(info.filename).startswith(".")
+    ]
+
+
+def _load_zip_member(zf: zipfile.ZipFile, member: str, engine: str, columns: Sequence[str] | None, nrows: int | None) -> pd.DataFrame:
+    inner = member.lower()
+    if _is_delimited(inner):
+        try:
+            return _read_delimited(lambda: zf.open(member), _peek(lambda: zf.open(member)), inner, columns, nrows)
+        except Exception:
+            if inner.endswith((".csv", ".tsv")):
+                raise
+            return pd.DataFrame()
+    # formats that need random access are read member by member
+    return load_table(zf.read(member), member, engine=engine, columns=columns, nrows=nrows)
+
+
+def _load_compressed(content: bytes | str | os.PathLike, codec: str, inner: str, engine: str, columns: Sequence[str] | None, nrows: int | None) -> pd.DataFrame:
+    if _is_delimited(inner):
+        try:
+            return _read_delimited(lambda: _open_decompressed(content, codec), _peek(lambda: _open_decompressed(content, codec)), inner, columns, nrows)
+        except Exception:
+            if inner.endswith((".csv", ".tsv")):
+                raise
+            return pd.DataFrame()
+    with _open_decompressed(content, codec) as fh:
+        data = fh.read()
+    return load_table(data, inner, engine=engine, columns=columns, nrows=nrows)
+
+
+def load_table_chunks(
+    content: bytes | BinaryIO | str | os.PathLike,
+    filename: str,
+    chunksize: int | None = None,
+    columns: Sequence[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks of ``chunksize`` rows without decoding the whole upload.
+
+    CSV/TSV (and unknown extensions, parsed as CSV) are streamed; the encoding is sniffed
+    from the first 64 KiB and the rest is decoded incrementally by the parser (strictly,
+    switching to latin-1 at the first invalid byte, see _iter_delimited). Parquet,
+    Feather and Arrow IPC are streamed record batch by record batch. Other formats are
+    returned as a single chunk. The row index continues across chunks.
+    """
+    from ..core.config import settings as cfg_settings
+    rows = int(chunksize or cfg_settings.ingest_chunk_rows)
+    name = (filename or "").lower()
+    if name.endswith(_COLUMNAR_EXTS):
+        _, batches = _columnar_batches(content, name, columns, rows)
+        start = 0
+        for batch in batches:
+            df = _arrow_to_pandas(pa.Table.from_batches([batch]), resolve_engine(None))
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+        return
+    codec, inner = _split_codec(name)
+    if codec is not None and _is_delimited(inner):
+        yield from _iter_delimited(lambda: _open_decompressed(content, codec), _peek(lambda: _open_decompressed(content, codec)), inner, columns, rows)
+        return
+    if name.endswith(".zip"):
+        # stream the first member (as load_table does); load_tables exposes the others
+        with zipfile.ZipFile(_file_source(content)) as zf:
+            members = _zip_members(zf)
+            if not members:
+                yield pd.DataFrame()
+                return
+            first = members[0]
+            if not _is_delimited(first.lower()):
+                yield load_table(zf.read(first), first, columns=columns)
+                return
+            yield from _iter_delimited(lambda: zf.open(first), _peek(lambda: zf.open(first)), first.lower(), columns, rows)
+        return
+    known = name.endswith((".csv", ".tsv"))
+    if not _is_delimited(name):
+        data = content if isinstance(content, bytes) or _is_path(content) else content.read()
+        yield load_table(data, filename, columns=columns)
+        return
+    chunks = _iter_delimited(_open_source(content), _head(content), name, columns, rows)
+    try:
+        first = next(chunks, None)
+    except Exception:
+        if known:
+            raise
+        # Unknown: attempt CSV as default, empty on failure (as load_table)
+        yield pd.DataFrame()
+        return
+    if first is not None:
+        yield first
+        yield from chunks
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Slice an in-memory frame into row chunks (views, no copies)."""
+    step = max(1, int(chunksize))
+    for start in range(0, len(df), step):
+        yield df.iloc[start:start + step]
+
+
+_COLUMNAR_EXTS = (".parquet", ".pq", ".feather", ".arrow", ".ipc", ".arrows")
+_EXCEL_EXTS = (".xlsx", ".xlsm", ".xls")
+
+
+def _to_snake(value: str) -> str:
+    v = str(value).strip().lower()
+    v = re.sub(r"[^a-z0-9]+", "_", v)
+    v = re.sub(r"_+", "_", v)
+    v = v.strip("_")
+    return v or "col"
+
+
+def _column_filter(columns: Sequence[str] | None) -> Callable[[str], bool] | None:
+    """Predicate accepting a source column by its raw or normalized (snake_case) name."""
+    if not columns:
+        return None
+    wanted = {str(c) for c in columns} | {_to_snake(c) for c in columns}
+    return lambda c: str(c) in wanted or _to_snake(c) in wanted
+
+
+def project_frame(df: pd.DataFrame, columns: Sequence[str] | None, nrows: int | None) -> pd.DataFrame:
+    keep = _column_filter(columns)
+    if keep is not None:
+        df = df[[c for c in df.columns if keep(c)]]
+    if nrows is not None:
+        df = df.head(nrows)
+    return df
+
+
+def _arrow_pandas_dtype(arrow_type):
+    """types_mapper for Table.to_pandas: Arrow-backed strings and nullable ints/bools."""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    if pa.types.is_integer(arrow_type):
+        return pd.Int64Dtype()
+    if pa.types.is_boolean(arrow_type):
+        return pd.BooleanDtype()
+    return None
+
+
+def _arrow_to_pandas(table, engine: str) -> pd.DataFrame:
+    if engine == "pyarrow":
+        return table.to_pandas(types_mapper=_arrow_pandas_dtype, date_as_object=False)
+    return table.to_pandas()
+
+
+def _arrow_source(content: bytes | BinaryIO | str | os.PathLike):
+    # bytes are wrapped zero-copy; paths are memory-mapped
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(content)
+    if hasattr(content, "read"):
+        return pa.PythonFile(content, mode="r")
+    return pa.memory_map(os.fspath(content), "r")
+
+
+def _columnar_batches(content: bytes | BinaryIO | str | os.PathLike, name: str, columns: Sequence[str] | None, batch_rows: int):
+    """(schema, record-batch iterator) for Parquet / Feather v2 / Arrow IPC, with column pushdown."""
+    if pa is None:
+        raise ValueError("pyarrow is required to read Parquet, Feather and Arrow IPC files")
+    keep = _column_filter(columns)
+    source = _arrow_source(content)
+    if name.endswith((".parquet", ".pq")):
+        pf = pa_parquet.ParquetFile(source)
+        full = pf.schema_arrow
+        cols = [c for c in full.names if keep(c)] if keep else None
+        schema = full if cols is None else pa.schema([full.field(c) for c in cols])
+        return schema, pf.iter_batches(batch_size=batch_rows, columns=cols)
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        # .arrows / stream-format payloads have no footer
+        source.seek(0)
+        reader = pa.ipc.open_stream(source)
+        batches = iter(reader)
+    schema = reader.schema
+    if keep:
+        cols = [c for c in schema.names if keep(c)]
+        schema = pa.schema([schema.field(c) for c in cols])
+        batches = (b.select(cols) for b in batches)
+    return schema, batches
+
+
+def _load_columnar(content: bytes | str | os.PathLike, name: str, engine: str, columns: Sequence[str] | None, nrows: int | None) -> pd.DataFrame:
+    batch_rows = min(nrows, 65536) if nrows else 65536
+    schema, batches = _columnar_batches(content, name, columns, batch_rows)
+    taken = []
+    have = 0
+    for batch in batches:
+        # stop reading once the row limit is covered
+        if nrows is not None and have >= nrows:
+            break
+        taken.append(batch)
+        have += batch.num_rows
+    table = pa.Table.from_batches(taken, schema=schema)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    return _arrow_to_pandas(table, engine)
+
+
+def _load_table_arrow(content: bytes | str | os.PathLike, name: str) -> pd.DataFrame | None:
+    """Multi-threaded Arrow parse of CSV/TSV/NDJSON; None when the pandas path should be used."""
+    if name.endswith((".csv", ".tsv")):
+        encoding = _sniff_encoding(_head(content))
+        read_opts = pa_csv.ReadOptions(use_threads=True, encoding="utf8" if encoding.startswith("utf-8") else encoding)
+        parse_opts = pa_csv.ParseOptions(delimiter="\t" if name.endswith(".tsv") else ",")
+        table = pa_csv.read_csv(_arrow_source(content), read_options=read_opts, parse_options=parse_opts)
+    elif name.endswith(".ndjson"):
+        table = pa_json.read_json(_arrow_source(content), read_options=pa_json.ReadOptions(use_threads=True))
+    else:
+        return None
+    return _arrow_to_pandas(table, "pyarrow")
+
+
+def resolve_engine(engine: str | None) -> str:
+    from ..core.config import settings as cfg_settings
+    eff = (engine or cfg_settings.ingest_engine or "pandas").lower()
+    return eff if eff in {"pandas", "pyarrow"} else "pandas"
+
+
+def load_table(
+    content: bytes | str | os.PathLike,
+    filename: str,
+    engine: str | None = None,
+    columns: Sequence[str] | None = None,
+    nrows: int | None = None,
+) -> pd.DataFrame:
+    """Parse an upload into a DataFrame.
+
+    ``content`` is the raw bytes or the path of a spooled upload; paths are streamed (or
+    memory-mapped for columnar formats) instead of being read into memory. ``columns``
+    keeps only the named source columns (raw or snake_case names) and ``nrows`` caps the
+    rows read; both are pushed down into the reader where the format allows.
+    """
     name = (filename or "").lower()
+    eff_engine = resolve_engine(engine)
+    codec, inner = _split_codec(name)
+    if codec is not None:
+        return _load_compressed(content, codec, inner, eff_engine, columns, nrows)
+    if name.endswith(".zip"):
+        # first member, like the first sheet of a workbook; load_tables exposes all of them
+        with zipfile.ZipFile(_file_source(content)) as zf:
+            members = _zip_members(zf)
+            return _load_zip_member(zf, members[0], eff_engine, columns, nrows) if members else pd.DataFrame()
+    if name.endswith(_COLUMNAR_EXTS):
+        return _load_columnar(content, name, eff_engine, columns, nrows)
+    if eff_engine == "pyarrow" and pa is not None:
+        try:
+            df = _load_table_arrow(content, name)
+            if df is not None:
+                return project_frame(df, columns, nrows)
+        except Exception:
+            # fall back to the pandas parser on anything Arrow rejects
+            pass
+    usecols = _column_filter(columns)
+    if _is_path(content) and _is_delimited(name):
+        # spooled upload: let the parser stream the file instead of decoding it in one piece
+        try:
+            return _read_delimited(_open_source(content), _head(content), name, columns, nrows)
+        except Exception:
+            if name.endswith((".csv", ".tsv")):
+                raise
+            return pd.DataFrame()
     if name.endswith((".csv", ".tsv")):
         text = _decode_bytes_utf8_fallback(content)
         # Use comma/tsv explicit separators to avoid over-splitting on short samples
         if name.endswith((".tsv",)):
-            return pd.read_csv(io.StringIO(text), sep="\t")
-        return pd.read_csv(io.StringIO(text))
+            return pd.read_csv(io.StringIO(text), sep="\t", usecols=usecols, nrows=nrows)
+        return pd.read_csv(io.StringIO(text), usecols=usecols, nrows=nrows)
     if name.endswith((".json", ".ndjson")):
-        text = _decode_bytes_utf8_fallback(content)
+        text = _decode_bytes_utf8_fallback(_read_all(content))
         # Try records/lines first
         try:
-            return pd.read_json(io.StringIO(text), lines=True)
+            return project_frame(pd.read_json(io.StringIO(text), lines=True), columns, nrows)
         except Exception:
             pass
         # Try standard JSON (array or object)
         try:
             obj = json.loads(text)
             if isinstance(obj, list):
-                return pd.json_normalize(obj)
+                return project_frame(pd.json_normalize(obj), columns, nrows)
             if isinstance(obj, dict):
                 # single object
-                return pd.json_normalize([obj])
+                return project_frame(pd.json_normalize([obj]), columns, nrows)
         except Exception:
             pass
         # Fallback empty
         return pd.DataFrame()
-    if name.endswith((".xlsx", ".xlsm", ".xls")):
-        return pd.read_excel(io.BytesIO(content), sheet_name=0)
+    if name.endswith(_EXCEL_EXTS):
+        return pd.read_excel(_file_source(content), sheet_name=0, usecols=usecols, nrows=nrows, engine=_excel_engine(name))
     # Unknown: attempt CSV as default
     text = _decode_bytes_utf8_fallback(content)
     try:
-        return pd.read_csv(io.StringIO(text))
+        return pd.read_csv(io.StringIO(text), usecols=usecols, nrows=nrows)
     except Exception:
         return pd.DataFrame()
 
 
+def _excel_engine(name: str) -> str | None:
+    """calamine (Rust reader) when installed, else openpyxl (pandas opens it read-only) / xlrd."""
+    from ..core.config import settings as cfg_settings
+    pref = cfg_settings.excel_engine
+    if pref in {"auto", "calamine"}:
+        try:
+            import python_calamine  # type: ignore  # noqa: F401
+            return "calamine"
+        except Exception:
+            pass
+    if name.endswith(".xls"):
+        return None
+    return "openpyxl"
+
+
+def _read_sheet(content: bytes | str, sheet: str, engine: str | None) -> pd.DataFrame:
+    # top-level so it can run in a worker process; workers get the spooled path, not the bytes
+    return pd.read_excel(_file_source(content), sheet_name=sheet, engine=engine)
+
+
+def _load_excel_sheets(content: bytes | str | os.PathLike, name: str, workers: int) -> Dict[str, pd.DataFrame]:
+    engine = _excel_engine(name)
+    if _is_path(content):
+        content = os.fspath(content)
+    with pd.ExcelFile(_file_source(content), engine=engine) as book:
+        sheets = [str(sh) for sh in book.sheet_names]
+    from ..core.config import settings as cfg_settings
+    from .workers import source_size, submit
+    if len(sheets) <= 1 or workers <= 1 or source_size(content) < cfg_settings.ingest_parallel_min_bytes:
+        return {sh: _read_sheet(content, sh, engine) for sh in sheets}
+    futures = [submit(min(workers, len(sheets)), _read_sheet, content, sh, engine) for sh in sheets]
+    return dict(zip(sheets, [f.result() for f in futures]))
+
+
+def is_multi_table(filename: str) -> bool:
+    """True when an upload can hold several tables (load_tables may return more than one)."""
+    _, inner = _split_codec((filename or "").lower())
+    return inner.endswith(_EXCEL_EXTS + (".zip",))
+
+
+def load_tables(content: bytes | str | os.PathLike, filename: str, engine: str | None = None, workers: int | None = None) -> Dict[str, pd.DataFrame]:
+    """Parse an upload into one or more named tables.
+
+    Workbooks expose every sheet as ``"<filename>::<sheet>"`` and zip archives every member
+    as ``"<filename>::<member>"`` (a single table keeps the plain filename). Sheets are parsed
+    in the shared worker pool (services.workers); zip members are decompressed one at a time as streams.
+    Other formats return ``{filename: load_table(...)}``.
+    """
+    from ..core.config import settings as cfg_settings
+    name = (filename or "").lower()
+    if not is_multi_table(name):
+        return {filename: load_table(content, filename, engine=engine)}
+    codec, inner = _split_codec(name)
+    if codec is not None:
+        with _open_decompressed(content, codec) as fh:
+            data = fh.read()
+        tables = load_tables(data, filename[: len(inner)], engine=engine, workers=workers)
+        return {filename if k == filename[: len(inner)] else filename + k[len(inner):]: v for k, v in tables.items()}
+    if name.endswith(".zip"):
+        found: Dict[str, pd.DataFrame] = {}
+        with zipfile.ZipFile(_file_source(content)) as zf:
+            for member in _zip_members(zf):
+                if is_multi_table(member):
+                    for sub, df in load_tables(zf.read(member), member, engine=engine, workers=workers).items():
+                        found[f"{filename}::{sub}"] = df
+                else:
+                    found[f"{filename}::{member}"] = _load_zip_member(zf, member, resolve_engine(engine), None, None)
+    else:
+        sheets = _load_excel_sheets(content, name, int(workers or cfg_settings.ingest_workers))
+        found = {f"{filename}::{sheet}": df for sheet, df in sheets.items()}
+    if len(found) == 1:
+        return {filename: next(iter(found.values()))}
+    return found
+
+
 def normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # only the labels change: a shallow copy gets its own column index and attrs, data is shared
+    df = df.copy(deep=False)
     original: List[str] = list(df.columns)
     df.attrs["original_columns"] = original
 
-    def to_snake(value: str) -> str:
-        v = str(value).strip().lower()
-        v = re.sub(r"[^a-z0-9]+", "_", v)
-        v = re.sub(r"_+", "_", v)
-        v = v.strip("_")
-        return v or "col"
-
     new_cols: List[str] = []
     seen: dict[str, int] = {}
     for col in original:
-        base = to_snake(col)
+        base = _to_snake(col)
         count = seen.get(base, 0)
         if count == 0:
             new_name = base
@@ -0,0 +1,164 @@
+"""Candidate-key discovery: minimal unique column combinations via a pruned lattice search.
+
+Levels of the column lattice are walked bottom-up (apriori style). A combination is a
+candidate only if none of its subsets is already a key (minimality) and all of its
+immediate subsets were found non-unique. Each candidate then has to pass cheap checks
+before the exact one:
+
+1. distinct-count bound: the product of per-column distinct counts (HLL estimates from
+   the profile sketches when available) must reach the row count;
+2. sample check: any duplicate among the profile sample rows rules the combination out;
+3. exact check on the full table: per-column factorized codes are combined into one
+   int64 per row (mixed radix while the product fits, 64-bit hashing beyond) and tested
+   for duplicates, first on a strided slice of large tables, then on every row; hashed
+   duplicates are confirmed with an exact row comparison.
+
+The search stops at ``max_arity`` columns or when ``budget_s`` is spent, reporting
+whether it completed. ``single_column_keys`` is the cheap arity-1 check used when the
+lattice search is off.
+"""
+
+from __future__ import annotations
+
+import time
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_RADIX_LIMIT = 1 << 62
+# rows in the strided slice checked before a full-table uniqueness test
+_PROBE_ROWS = 1 << 16
+
+
+def _splitmix(x: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        x = (x + _MIX).astype(np.uint64)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+class _Codes:
+    """Factorized columns of one frame, computed on first use."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._codes: Dict[str, Tuple[np.ndarray, int]] = {}
+
+    def get(self, col: str) -> Tuple[np.ndarray, int]:
+        if col not in self._codes:
+            codes, uniques = pd.factorize(self.df[col], use_na_sentinel=True)
+            self._codes[col] = (codes.astype(np.int64, copy=False), len(uniques))
+        return self._codes[col]
+
+    def has_nulls(self, cols: Sequence[str]) -> bool:
+        return any((self.get(c)[0] < 0).any() for c in cols)
+
+    def unique(self, cols: Sequence[str]) -> bool:
+        """True when no two rows agree on every column of ``cols``."""
+        n = len(self.df)
+        if n <= 1:
+            return True
+        acc = np.zeros(n, dtype=np.int64)
+        bound, hashed = 1, False
+        for c in cols:
+            codes, card = self.get(c)
+            if not hashed and bound * max(card, 1) < _RADIX_LIMIT:
+                acc = acc * max(card, 1) + codes
+                bound *= max(card, 1)
+            else:
+                hashed = True
+                acc = _splitmix(acc.view(np.uint64) ^ _splitmix(codes.view(np.uint64))).view(np.int64)
+        if not hashed and bound < n:
+            return False  # fewer possible tuples than rows
+        if n > 4 * _PROBE_ROWS:
+            # duplicates usually show up in a strided slice already; any found there are real
+            probe = acc[:: n // _PROBE_ROWS]
+            if len(pd.unique(probe)) < len(probe):
+                return False
+        if not hashed and bound <= 16 * n:
+            # dense code space: counting beats hashing
+            return int(np.bincount(acc, minlength=1).max()) <= 1
+        if len(pd.unique(acc)) == n:
+            return True
+        # a mixed-radix code is exact; a hash duplicate may be a collision
+        return hashed and not self.df.duplicated(subset=list(cols)).any()
+
+
+def single_column_keys(df: pd.DataFrame, columns: Iterable[str]) -> List[List[str]]:
+    """Those of ``columns`` that are null-free and unique over every row of ``df``."""
+    return [[c] for c in columns if not df[c].hasnans and df[c].is_unique]
+
+
+def _next_level(nonkeys: List[Tuple[str, ...]], deadline: float) -> Iterator[Tuple[str, ...]]:
+    """Apriori join: (k+1)-combinations whose k-subsets are all non-keys.
+
+    That alone keeps supersets of keys out, since no superset of a key is ever a non-key.
+    Lazy and deadline-bound, so a wide table's next level is only built as far as the
+    budget allows.
+    """
+    known = set(nonkeys)
+    by_prefix: Dict[Tuple[str, ...], List[str]] = {}
+    for combo in nonkeys:
+        by_prefix.setdefault(combo[:-1], []).append(combo[-1])
+    for prefix, tails in by_prefix.items():
+        if time.perf_counter() > deadline:
+            return
+        for a, b in combinations(tails, 2):
+            cand = prefix + (a, b)
+            if all(sub in known for sub in combinations(cand, len(cand) - 1)):
+                yield cand
+
+
+def discover_keys(
+    df: pd.DataFrame,
+    sample: Optional[pd.DataFrame] = None,
+    max_arity: Optional[int] = None,
+    budget_s: Optional[float] = None,
+    distinct: Optional[Dict[str, float]] = None,
+) -> Tuple[List[List[str]], bool]:
+    """Minimal unique, null-free column combinations of ``df`` up to ``max_arity`` columns.
+
+    ``sample`` (a subset of ``df``'s rows) prunes cheaply; ``distinct`` maps columns to
+    distinct-count estimates. Returns ``(keys, complete)``; ``complete`` is False when the
+    ``budget_s`` deadline cut the search short (keys found so far are still exact).
+    """
+    from app.core.config import settings as cfg_settings
+    max_arity = cfg_settings.pk_max_arity if max_arity is None else max_arity
+    budget_s = cfg_settings.pk_search_budget_s if budget_s is None else budget_s
+    deadline = time.perf_counter() + budget_s
+    rows = len(df)
+    sample = df if sample is None else sample
+    if rows == 0 or max_arity < 1:
+        return [], True
+    small = _Codes(sample)
+    full = small if sample is df else _Codes(df)
+    # null-bearing and constant columns never belong to a minimal key
+    level = [(str(c),) for c in sample.columns if not small.has_nulls([c]) and (small.get(c)[1] > 1 or len(sample) <= 1)]
+    names = [c[0] for c in level]
+    if len(set(names)) != len(names):
+        return [], True
+    keys: List[Tuple[str, ...]] = []
+    candidates: Iterable[Tuple[str, ...]] = level
+    for _ in range(max_arity):
+        nonkeys: List[Tuple[str, ...]] = []
+        for cand in candidates:
+            if time.perf_counter() > deadline:
+                return [list(k) for k in keys], False
+            if distinct is not None and all(c in distinct for c in cand):
+                # the product is an upper bound on distinct tuples; allow a few % HLL error
+                if float(np.prod([distinct[c] for c in cand])) * 1.05 < rows:
+                    nonkeys.append(cand)
+                    continue
+            if not small.unique(cand) or (full is not small and (full.has_nulls(cand) or not full.unique(cand))):
+                nonkeys.append(cand)
+                continue
+            keys.append(cand)
+        if not nonkeys:
+            break
+        candidates = _next_level(nonkeys, deadline)
+    # the lazy level generator stops silently at the deadline
+    return [list(k) for k in keys], time.perf_counter() <= deadline
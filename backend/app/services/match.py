@@ -1,14 +1,21 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple
-import math
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+import re
+import numpy as np
 import pandas as pd
 from app.core.config import settings
 from ._masking import mask_examples
+from .embeddings import embed_headers
+from .minhash import column_signature, overlap_matrices, value_hashes
+from .sketches import sketch_kind
+from .sampling import sample_frame
 
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except Exception:  # pragma: no cover
     fuzz = None
+    process = None
 
 
 def _dtype_simple(series: pd.Series) -> str:
@@ -23,10 +30,6 @@ def _dtype_simple(series: pd.Series) -> str:
     return "string"
 
 
-def _types_compatible(a: pd.Series, b: pd.Series) -> bool:
-    sa, sb = _dtype_simple(a), _dtype_simple(b)
-    # Strict equality only; differing families are considered mismatched
-    return sa == sb
 def _infer_family(name: str, tags: List[str]) -> str:
     n = name.lower()
     tagset = {t.lower() for t in (tags or [])}
@@ -65,73 +68,172 @@ _FAMILY_COMPAT: Dict[str, set[str]] = {
 }
 
 
-def _name_score(a: str, b: str) -> float:
-    def _norm(x: str) -> str:
-        s = x.lower().strip()
-        s = s.replace("_", " ")
-        # common abbreviations
-        synonyms = {
-            "acct": "account",
-            "cust": "customer",
-            "num": "number",
-            "no": "number",
-            "id": "id",
-            "fname": "first name",
-            "lname": "last name",
-            "addr": "address",
-            "e_mail": "email",
-        }
-        for k, v in synonyms.items():
-            s = re.sub(rf"\b{k}\b", v, s)
-        return s
-
-    try:
-        import re  # local to avoid global import if not needed
-    except Exception:
-        re = None  # type: ignore
-
-    a0, b0 = a, b
-    a1, b1 = _norm(a), _norm(b)
-    if not fuzz:
-        return 1.0 if a1 == b1 else (1.0 if a0.lower() == b0.lower() else 0.0)
-    return max(
-        fuzz.token_sort_ratio(a0, b0),
-        fuzz.partial_ratio(a0, b0),
-        fuzz.token_sort_ratio(a1, b1),
-        fuzz.partial_ratio(a1, b1),
-    ) / 100.0
-
-
-def _cosine(a: List[float], b: List[float]) -> float:
-    num = sum(x * y for x, y in zip(a, b))
-    da = math.sqrt(sum(x * x for x in a))
-    db = math.sqrt(sum(y * y for y in b))
-    if da == 0 or db == 0:
-        return 0.0
-    return num / db / da
+# common abbreviations, applied in order to lower-cased headers
+_SYNONYMS = [
+    (re.compile(rf"\b{k}\b"), v)
+    for k, v in {
+        "acct": "account",
+        "cust": "customer",
+        "num": "number",
+        "no": "number",
+        "id": "id",
+        "fname": "first name",
+        "lname": "last name",
+        "addr": "address",
+        "e_mail": "email",
+    }.items()
+]
+
+
+def _norm_header(x: str) -> str:
+    s = x.lower().strip()
+    s = s.replace("_", " ")
+    for pattern, v in _SYNONYMS:
+        s = pattern.sub(v, s)
+    return s
+
+
+def _name_scores(left: List[str], right: List[str]) -> np.ndarray:
+    """L x R name similarity: the best of token-sort and partial ratio over raw and
+    normalized headers, each scorer run once over the whole matrix."""
+    left_n = [_norm_header(x) for x in left]
+    right_n = [_norm_header(x) for x in right]
+    if not fuzz or process is None:
+        same_n = np.array(left_n, dtype=object)[:, None] == np.array(right_n, dtype=object)[None, :]
+        same = np.array([x.lower() for x in left], dtype=object)[:, None] == np.array([x.lower() for x in right], dtype=object)[None, :]
+        return (same_n | same).astype(np.float64)
+    out = np.zeros((len(left), len(right)), dtype=np.float64)
+    if not len(left) or not len(right):
+        return out
+    for a, b in ((left, right), (left_n, right_n)):
+        for scorer in (fuzz.token_sort_ratio, fuzz.partial_ratio):
+            np.maximum(out, process.cdist(a, b, scorer=scorer, dtype=np.float64, workers=-1), out=out)
+    return out / 100.0
+
+
+def _cosine_matrix(a: List[List[float]], b: List[List[float]]) -> np.ndarray:
+    """L x R cosine similarity of two embedding lists (0 where either vector is zero)."""
+    ma, mb = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if ma.size == 0 or mb.size == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    na, nb = np.linalg.norm(ma, axis=1), np.linalg.norm(mb, axis=1)
+    num = ma @ mb.T
+    den = na[:, None] * nb[None, :]
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
 
 
 def _header_embeddings(headers: List[str]) -> List[List[float]]:
     if not settings.embeddings_enabled:
         return [[0.0, 0.0, 0.0] for _ in headers]
-    try:
-        from sentence_transformers import SentenceTransformer
+    return embed_headers([str(h) for h in headers])
 
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        return model.encode(headers, normalize_embeddings=True).tolist()
-    except Exception:
-        return [[0.0, 0.0, 0.0] for _ in headers]
 
+@dataclass(frozen=True)
+class ColumnFingerprint:
+    """What pair scoring needs from one column, computed once per side."""
+
+    name: str
+    dtype: str
+    family: str
+    examples: List[str]
+    # sorted distinct 64-bit hashes of the sampled non-null values, hashed as in the MinHash
+    # signatures (exact overlap mode only; empty when signatures are used instead)
+    hashes: np.ndarray
+    # MinHash signature and distinct count over the full column (minhash overlap mode only)
+    signature: Optional[np.ndarray] = None
+    distinct: float = 0.0
 
-def _value_overlap(sa: pd.Series, sb: pd.Series, sample_n: int) -> Tuple[float, List[str], List[str]]:
-    la = set(sa.dropna().astype(str).head(sample_n).unique().tolist())
-    lb = set(sb.dropna().astype(str).head(sample_n).unique().tolist())
-    inter = la & lb
-    union = la | lb
-    jacc = len(inter) / max(1, len(union))
-    ex_a = list(sa.dropna().astype(str).head(3).unique())
-    ex_b = list(sb.dropna().astype(str).head(3).unique())
-    return jacc, mask_examples(ex_a), mask_examples(ex_b)
+
+def column_fingerprints(df: pd.DataFrame, sample: pd.DataFrame, signatures: bool = False) -> List[ColumnFingerprint]:
+    """Fingerprints of ``df``'s columns; values and examples come from ``sample`` (its rows).
+
+    With ``signatures`` each column's MinHash signature is streamed over all of ``df``
+    instead of hashing the sampled values.
+    """
+    out: List[ColumnFingerprint] = []
+    empty = np.empty(0, dtype=np.uint64)
+    for col in df.columns:
+        if signatures:
+            signature, distinct = column_signature(df[col], settings.match_minhash_k)
+            hashes = empty
+            examples = sample[col].dropna().head(3).astype(str)
+        else:
+            signature, distinct = None, 0.0
+            present = sample[col].dropna()
+            hashes = np.unique(value_hashes(present, sketch_kind(present.dtype))) if len(present) else empty
+            examples = present.head(3).astype(str)
+        out.append(ColumnFingerprint(
+            name=str(col),
+            dtype=_dtype_simple(df[col]),
+            family=_infer_family(str(col), []),
+            examples=mask_examples(list(examples.unique())),
+            hashes=hashes,
+            signature=signature,
+            distinct=distinct,
+        ))
+    return out
+
+
+def _overlap_matrix(left: List[ColumnFingerprint], right: List[ColumnFingerprint]) -> np.ndarray:
+    """Jaccard of the value sets of every left/right pair, as one L x R array.
+
+    All (hash, column) entries of both sides are joined on the hash in a single merge and
+    the matches counted per pair, instead of intersecting sets pair by pair.
+    """
+    size_l = np.array([len(f.hashes) for f in left], dtype=np.int64)
+    size_r = np.array([len(f.hashes) for f in right], dtype=np.int64)
+    inter = np.zeros(len(left) * len(right), dtype=np.int64)
+    if size_l.sum() and size_r.sum():
+        lh = pd.DataFrame({"h": np.concatenate([f.hashes for f in left]), "l": np.repeat(np.arange(len(left)), size_l)})
+        rh = pd.DataFrame({"h": np.concatenate([f.hashes for f in right]), "r": np.repeat(np.arange(len(right)), size_r)})
+        pairs = lh.merge(rh, on="h")
+        inter = np.bincount(pairs["l"].to_numpy() * len(right) + pairs["r"].to_numpy(), minlength=len(inter))
+    inter = inter.reshape(len(left), len(right))
+    union = size_l[:, None] + size_r[None, :] - inter
+    return inter / np.maximum(1, union)
+
+
+def _family_compat(left: List[ColumnFingerprint], right: List[ColumnFingerprint]) -> np.ndarray:
+    """L x R: whether the right column's family is compatible with the left one's."""
+    right_families = np.array([f.family for f in right], dtype=object)
+    out = np.zeros((len(left), len(right)), dtype=bool)
+    for i, f in enumerate(left):
+        out[i] = np.isin(right_families, list(_FAMILY_COMPAT.get(f.family, {f.family})))
+    return out
+
+
+def _shortlist(compat: np.ndarray, names: np.ndarray, blocking: bool) -> np.ndarray:
+    """L x R mask of the pairs to score.
+
+    Without blocking that is every pair. With it, a left column meets the right columns of
+    a compatible family (``compat``) and, whatever their family or dtype, the
+    ``MATCH_BLOCKING_NAME_K`` right columns with the most similar headers (``names``), so
+    a text ``amount`` still meets a float ``amt``.
+    """
+    if not blocking:
+        return np.ones(names.shape, dtype=bool)
+    mask = compat.copy()
+    k = min(max(0, settings.match_blocking_name_k), names.shape[1])
+    if k:
+        np.put_along_axis(mask, np.argsort(-names, axis=1, kind="stable")[:, :k], True, axis=1)
+    return mask
+
+
+# families whose values are identifiers: a small column may be contained in a large one
+_ID_LIKE = {"id", "code"}
+
+
+def _minhash_overlaps(left: List[ColumnFingerprint], right: List[ColumnFingerprint]) -> Tuple[np.ndarray, np.ndarray]:
+    """Estimated overlap (Jaccard, or containment when higher for ID-like pairs) and the
+    containment estimates themselves (NaN outside ID-like pairs), from full-column signatures."""
+    id_pairs = [(i, j) for i, lf in enumerate(left) if lf.family in _ID_LIKE for j, rf in enumerate(right) if rf.family in _ID_LIKE]
+    jac, cont = overlap_matrices(
+        [f.signature for f in left], [f.distinct for f in left],
+        [f.signature for f in right], [f.distinct for f in right],
+        bands=settings.match_lsh_bands,
+        containment_pairs=id_pairs,
+    )
+    return np.fmax(jac, cont), cont
 
 
 def _reasons_and_warnings(scores: Dict[str, float], embeddings_enabled: bool) -> Tuple[List[str], List[str]]:
@@ -166,71 +268,108 @@ def _reasons_and_warnings(scores: Dict[str, float], embeddings_enabled: bool) ->
     return reasons, warnings
 
 
-def suggest_mappings(left_df: pd.DataFrame, right_df: pd.DataFrame, sample_n: int = 1000, threshold: float | None = None) -> List[Dict]:
+def suggest_mappings(
+    left_df: pd.DataFrame,
+    right_df: pd.DataFrame,
+    sample_n: int = 1000,
+    threshold: float | None = None,
+    samples: Tuple[pd.DataFrame, pd.DataFrame] | None = None,
+    blocking: bool | None = None,
+    top_k: int | None = None,
+) -> List[Dict]:
+    """Score left/right column pairs. Value overlap is computed on ``sample_n``-row
+    samples of each side, drawn once here unless precomputed ``samples`` are passed, or
+    with ``MATCH_OVERLAP_MODE=minhash`` estimated from full-column MinHash signatures.
+
+    Every score is computed as one L x R matrix. With ``blocking`` only the shortlisted
+    pairs (see ``_shortlist``) are returned; with ``top_k`` only the best ``top_k`` of
+    them per left column. Both default to the MATCH_BLOCKING / MATCH_TOP_K settings (off / all).
+    """
+    blocking = settings.match_blocking if blocking is None else blocking
+    top_k = settings.match_top_k if top_k is None else top_k
     left_cols = list(left_df.columns)
     right_cols = list(right_df.columns)
+    left_s, right_s = samples if samples is not None else (sample_frame(left_df, sample_n), sample_frame(right_df, sample_n))
+    minhash = settings.match_overlap_mode == "minhash"
+    left_fp = column_fingerprints(left_df, left_s, signatures=minhash)
+    right_fp = column_fingerprints(right_df, right_s, signatures=minhash)
+    # one vector per header
+    left_emb = np.asarray(_header_embeddings(left_cols), dtype=np.float64)
+    right_emb = np.asarray(_header_embeddings(right_cols), dtype=np.float64)
+
+    w_n = settings.match_weight_name
+    w_t = settings.match_weight_type
+    w_o = settings.match_weight_overlap
+    w_e = settings.match_weight_embed
+    total = max(1e-9, (w_n + w_t + w_o + w_e))
+    # normalize if weights do not sum ~1
+    w_n, w_t, w_o, w_e = (w_n/total, w_t/total, w_o/total, w_e/total)
+    thr = threshold if threshold is not None else settings.match_auto_threshold
+
+    names = _name_scores([f.name for f in left_fp], [f.name for f in right_fp])
+    # families come from simple heuristics over column names (see fingerprints)
+    compat = _family_compat(left_fp, right_fp)
+    candidates = _shortlist(compat, names, blocking)
+    if minhash:
+        overlaps, containments = _minhash_overlaps(left_fp, right_fp)
+    else:
+        overlaps, containments = _overlap_matrix(left_fp, right_fp), None
+    embeds = _cosine_matrix(left_emb, right_emb)
+    types = np.where(
+        np.array([f.dtype for f in left_fp], dtype=object)[:, None] == np.array([f.dtype for f in right_fp], dtype=object)[None, :],
+        1.0,
+        0.5,
+    )
+    conf = w_n * names + w_t * types + w_o * overlaps + w_e * embeds
+    # semantic family gate
+    # allow id↔address codes if name similarity and overlap are weak? keep cap
+    crossed = ~compat if settings.family_gate_enabled else np.zeros_like(compat)
+    conf = np.where(crossed, np.minimum(conf, settings.family_gate_cap), conf)
 
-    le = _header_embeddings(left_cols)
-    re = _header_embeddings(right_cols)
+    # pairs returned: the shortlisted ones, cut to the best top_k per left column
+    keep = candidates
+    if top_k and top_k > 0:
+        ranked = np.where(candidates, conf, -np.inf)
+        keep = np.zeros_like(candidates)
+        np.put_along_axis(keep, np.argsort(-ranked, axis=1, kind="stable")[:, :top_k], True, axis=1)
+        keep &= candidates
 
     out: List[Dict] = []
-    for i, lc in enumerate(left_cols):
-        for j, rc in enumerate(right_cols):
-            name = _name_score(lc, rc)
-            type_compat = 1.0 if _types_compatible(left_df[lc], right_df[rc]) else 0.5
-            overlap, ex_a, ex_b = _value_overlap(left_df[lc], right_df[rc], sample_n=sample_n)
-            emb = _cosine(le[i], re[j])
-
-            w_n = settings.match_weight_name
-            w_t = settings.match_weight_type
-            w_o = settings.match_weight_overlap
-            w_e = settings.match_weight_embed
-            total = max(1e-9, (w_n + w_t + w_o + w_e))
-            # normalize if weights do not sum ~1
-            w_n, w_t, w_o, w_e = (w_n/total, w_t/total, w_o/total, w_e/total)
-            conf = w_n * name + w_t * type_compat + w_o * overlap + w_e * emb
-
-            # semantic family gate
-            if settings.family_gate_enabled:
-                # try to infer using simple heuristics over column names
-                lf = _infer_family(lc, [])
-                rf = _infer_family(rc, [])
-                # allow id↔address codes if name similarity and overlap are weak? keep cap
-                if rf not in _FAMILY_COMPAT.get(lf, {lf}):
-                    conf = min(conf, settings.family_gate_cap)
-                    cap_warn = True
-                else:
-                    cap_warn = False
-            thr = threshold if threshold is not None else settings.match_auto_threshold
-            decision = "auto" if conf >= thr else "review"
-            reasons, warnings = _reasons_and_warnings({
-                "name": name,
-                "type": type_compat,
-                "value_overlap": overlap,
-                "embedding": emb,
-            }, settings.embeddings_enabled)
-            if settings.family_gate_enabled and 'cap_warn' in locals() and cap_warn:
-                warnings.append("Cross-family pair")
-
-            out.append(
-                {
-                    "left_column": lc,
-                    "right_column": rc,
-                    "scores": {
-                        "name": round(name, 6),
-                        "type": round(type_compat, 6),
-                        "value_overlap": round(overlap, 6),
-                        "embedding": round(emb, 6),
-                    },
-                    "confidence": round(conf, 6),
-                    "decision": decision,
-                    "reasons": reasons,
-                    "warnings": warnings,
-                    "explain": {"left_examples": ex_a, "right_examples": ex_b},
-                }
-            )
+    for i, j in zip(*np.nonzero(keep)):
+        lf, rf = left_fp[i], right_fp[j]
+        name = float(names[i, j])
+        type_compat = float(types[i, j])
+        overlap = float(overlaps[i, j])
+        emb = float(embeds[i, j])
+        c = float(conf[i, j])
+        decision = "auto" if c >= thr else "review"
+        reasons, warnings = _reasons_and_warnings({
+            "name": name,
+            "type": type_compat,
+            "value_overlap": overlap,
+            "embedding": emb,
+        }, settings.embeddings_enabled)
+        if crossed[i, j]:
+            warnings.append("Cross-family pair")
+
+        scores = {
+            "name": round(name, 6),
+            "type": round(type_compat, 6),
+            "value_overlap": round(overlap, 6),
+            "embedding": round(emb, 6),
+        }
+        if containments is not None and not np.isnan(containments[i, j]):
+            scores["containment"] = round(float(containments[i, j]), 6)
+        out.append({
+            "left_column": left_cols[i],
+            "right_column": right_cols[j],
+            "scores": scores,
+            "confidence": round(c, 6),
+            "decision": decision,
+            "reasons": reasons,
+            "warnings": warnings,
+            "explain": {"left_examples": lf.examples, "right_examples": rf.examples},
+        })
 
     out.sort(key=lambda r: (r["left_column"].lower(), -r["confidence"]))
     return out
-
-
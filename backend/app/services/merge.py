@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 
 import pandas as pd
 
@@ -19,6 +19,31 @@ def _build_colmap_and_ops(decisions: List[MappingDecision]) -> tuple[Dict[str, s
     return colmap, ops_all
 
 
+def _lineage_values(lineage_meta: Dict) -> tuple[str, str, str, str]:
+    left_bank = lineage_meta.get("left", {}).get("_source_bank", lineage_meta.get("left_bank", "left"))
+    left_file = lineage_meta.get("left", {}).get("_source_file", lineage_meta.get("left_file", "left.csv"))
+    right_bank = lineage_meta.get("right", {}).get("_source_bank", lineage_meta.get("right_bank", "right"))
+    right_file = lineage_meta.get("right", {}).get("_source_file", lineage_meta.get("right_file", "right.csv"))
+    return left_bank, left_file, right_bank, right_file
+
+
+def _prepare_right(right_df: pd.DataFrame, colmap: Dict[str, str], validated: List[TransformOp]) -> pd.DataFrame:
+    # Apply transforms on right df (pure operations), then rename per accepted/auto mappings
+    if validated:
+        right_df = apply_ops(right_df, validated)
+    return right_df.rename(columns=colmap)
+
+
+def _align_with_lineage(df: pd.DataFrame, all_cols: List[str], bank: str, file: str, chain: str) -> pd.DataFrame:
+    # reindex already returns a new frame (lazy under Copy-on-Write); lineage columns are added to it
+    aligned = df.reindex(columns=all_cols)
+    aligned["_source_bank"] = bank
+    aligned["_source_file"] = file
+    aligned["_source_row"] = aligned.index
+    aligned["_transform_chain"] = chain
+    return aligned
+
+
 def merge_datasets(
     dfs: Dict[str, pd.DataFrame],
     decisions: List[MappingDecision],
@@ -30,44 +55,52 @@ def merge_datasets(
         raise ValueError("dfs must include 'left' and 'right'")
 
     colmap, ops_all = _build_colmap_and_ops(decisions)
-
-    # Apply transforms on right df (pure operations)
-    if ops_all:
-        validated = validate_ops([op.model_dump() for op in ops_all])
-        right_df = apply_ops(right_df, validated)
-        transform_chain = format_chain(validated)
-    else:
-        transform_chain = ""
-
-    # Rename right columns according to accepted/auto mappings
-    right_renamed = right_df.rename(columns=colmap)
+    validated = validate_ops([op.model_dump() for op in ops_all]) if ops_all else []
+    transform_chain = format_chain(validated) if validated else ""
+    right_renamed = _prepare_right(right_df, colmap, validated)
 
     # Align columns: union of left and right_renamed
     all_cols = list(dict.fromkeys(list(left_df.columns) + list(right_renamed.columns)))
-    left_aligned = left_df.reindex(columns=all_cols)
-    right_aligned = right_renamed.reindex(columns=all_cols)
 
     # Lineage columns
-    left_bank = lineage_meta.get("left", {}).get("_source_bank", lineage_meta.get("left_bank", "left"))
-    left_file = lineage_meta.get("left", {}).get("_source_file", lineage_meta.get("left_file", "left.csv"))
-    right_bank = lineage_meta.get("right", {}).get("_source_bank", lineage_meta.get("right_bank", "right"))
-    right_file = lineage_meta.get("right", {}).get("_source_file", lineage_meta.get("right_file", "right.csv"))
+    left_bank, left_file, right_bank, right_file = _lineage_values(lineage_meta)
+    left_aligned = _align_with_lineage(left_df, all_cols, left_bank, left_file, "")
+    right_aligned = _align_with_lineage(right_renamed, all_cols, right_bank, right_file, transform_chain)
+
+    merged = pd.concat([left_aligned, right_aligned], ignore_index=True)
+    return merged
 
-    left_aligned = left_aligned.copy()
-    right_aligned = right_aligned.copy()
 
-    left_aligned["_source_bank"] = left_bank
-    left_aligned["_source_file"] = left_file
-    left_aligned["_source_row"] = left_aligned.index
-    left_aligned["_transform_chain"] = ""
+def iter_merge_chunks(
+    left_chunks: Iterable[pd.DataFrame],
+    right_chunks: Iterable[pd.DataFrame],
+    decisions: List[MappingDecision],
+    lineage_meta: Dict,
+) -> Iterator[pd.DataFrame]:
+    """Chunked ``merge_datasets``: yields aligned left chunks, then transformed right chunks.
 
-    right_aligned["_source_bank"] = right_bank
-    right_aligned["_source_file"] = right_file
-    right_aligned["_source_row"] = right_aligned.index
-    right_aligned["_transform_chain"] = transform_chain if ops_all else ""
+    Only the first chunk of each side is read ahead (to fix the output columns); the
+    concatenation of the yielded chunks matches ``merge_datasets`` up to the row index.
+    """
+    left_it = iter(left_chunks)
+    right_it = iter(right_chunks)
+    first_left = next(left_it, pd.DataFrame())
+    first_right = next(right_it, pd.DataFrame())
 
-    merged = pd.concat([left_aligned, right_aligned], ignore_index=True)
-    return merged
+    colmap, ops_all = _build_colmap_and_ops(decisions)
+    validated = validate_ops([op.model_dump() for op in ops_all]) if ops_all else []
+    transform_chain = format_chain(validated) if validated else ""
+    first_right = _prepare_right(first_right, colmap, validated)
+    all_cols = list(dict.fromkeys(list(first_left.columns) + list(first_right.columns)))
+    left_bank, left_file, right_bank, right_file = _lineage_values(lineage_meta)
+
+    yield _align_with_lineage(first_left, all_cols, left_bank, left_file, "")
+    for chunk in left_it:
+        yield _align_with_lineage(chunk, all_cols, left_bank, left_file, "")
+    yield _align_with_lineage(first_right, all_cols, right_bank, right_file, transform_chain)
+    for chunk in right_it:
+        chunk = _prepare_right(chunk, colmap, validated)
+        yield _align_with_lineage(chunk, all_cols, right_bank, right_file, transform_chain)
 
 
 def er_lite_customers(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
@@ -85,7 +118,7 @@ def er_lite_customers(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
     before = len(df)
     # sort so that left rows appear first; then groupby keeps first non-null values
     sort_cols = ["_source_bank"] if "_source_bank" in df.columns else []
-    work = df.copy()
+    work = df.copy(deep=False)
     if sort_cols:
         work["_source_bank_sort"] = work["_source_bank"].map({"left": 0, "right": 1}).fillna(2)
         sort_cols = ["_source_bank_sort"]
@@ -0,0 +1,123 @@
+"""One-permutation MinHash signatures and LSH banding for column value overlap.
+
+A column's values are hashed the way the profile sketches hash them (numeric and
+datetime columns by value, so ``1`` and ``1.0`` agree; everything else as text) and
+split into ``k`` bins by hash; the signature keeps the smallest hash per bin. The column
+is streamed in row chunks, so memory does not grow with its length, and a HyperLogLog
+alongside gives its distinct count.
+
+- Jaccard of two columns is the share of agreeing bins among bins used by either.
+- Containment of A in B follows from Jaccard and both distinct counts:
+  ``|A & B| = J * (|A| + |B|) / (1 + J)``.
+- LSH banding groups ``k // bands`` consecutive bins into a band key; columns sharing a
+  band key are candidates, so only those pairs need comparing (the threshold is roughly
+  ``(1 / bands) ** (bands / k)``).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from .sketches import HyperLogLog, _hashes, _numeric, sketch_kind
+
+# bin value of a signature bin no value fell into
+EMPTY = np.iinfo(np.uint64).max
+
+
+def value_hashes(present: pd.Series, kind: Optional[str]) -> np.ndarray:
+    """64-bit hashes of the non-null values ``present`` of a column of sketch ``kind``."""
+    if kind is None:
+        # stringify only the distinct values
+        present = pd.Series(pd.unique(present)).astype(str)
+    return _hashes(present, _numeric(present, kind))
+
+
+def column_signature(s: pd.Series, k: int = 128, chunk_rows: int = 1 << 17, hll_p: int = 12) -> Tuple[np.ndarray, float]:
+    """``(signature, distinct estimate)`` of the non-null values of ``s`` over all its rows."""
+    k = max(1, int(k))
+    kind = sketch_kind(s.dtype)
+    sig = np.full(k, EMPTY, dtype=np.uint64)
+    hll = HyperLogLog(hll_p)
+    seen = False
+    for start in range(0, len(s), chunk_rows):
+        present = s.iloc[start : start + chunk_rows].dropna()
+        if not len(present):
+            continue
+        h = value_hashes(present, kind)
+        hll.add_hashes(h)
+        np.minimum.at(sig, (h % np.uint64(k)).astype(np.int64), h)
+        seen = True
+    return sig, (hll.estimate() if seen else 0.0)
+
+
+def jaccard(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard of ``sig`` against each row of ``others`` (or row by row, same shapes)."""
+    used = (sig != EMPTY) | (others != EMPTY)
+    agree = (sig == others) & (sig != EMPTY)
+    return agree.sum(axis=-1) / np.maximum(1, used.sum(axis=-1))
+
+
+def containment(j: np.ndarray, size_a: np.ndarray, size_b: np.ndarray) -> np.ndarray:
+    """Estimated share of A's distinct values found in B, from their Jaccard and sizes."""
+    inter = j * (size_a + size_b) / (1.0 + j)
+    return np.clip(inter / np.maximum(size_a, 1.0), 0.0, 1.0)
+
+
+class LSHIndex:
+    """Band buckets over a list of signatures; ``query`` returns the indexes sharing a band."""
+
+    def __init__(self, k: int, bands: int = 64) -> None:
+        self.bands = max(1, min(int(bands), int(k)))
+        self.rows = max(1, int(k) // self.bands)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def _keys(self, sig: np.ndarray):
+        for b in range(self.bands):
+            band = sig[b * self.rows : (b + 1) * self.rows]
+            # bins empty on both sides would collide without any shared value
+            if (band != EMPTY).any():
+                yield b, band.tobytes()
+
+    def add(self, idx: int, sig: np.ndarray) -> None:
+        for key in self._keys(sig):
+            self._buckets.setdefault(key, []).append(idx)
+
+    def query(self, sig: np.ndarray) -> Set[int]:
+        found: Set[int] = set()
+        for key in self._keys(sig):
+            found.update(self._buckets.get(key, ()))
+        return found
+
+
+def overlap_matrices(
+    left: Sequence[np.ndarray],
+    left_sizes: Sequence[float],
+    right: Sequence[np.ndarray],
+    right_sizes: Sequence[float],
+    bands: int = 64,
+    containment_pairs: Sequence[Tuple[int, int]] = (),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """L x R estimated Jaccard (0 for pairs LSH does not retrieve) and containment of the
+    smaller column in the larger one for ``containment_pairs`` (NaN elsewhere)."""
+    jac = np.zeros((len(left), len(right)), dtype=np.float64)
+    cont = np.full((len(left), len(right)), np.nan)
+    if not len(left) or not len(right):
+        return jac, cont
+    sl, sr = np.vstack(left), np.vstack(right)
+    nl, nr = np.asarray(left_sizes, dtype=np.float64), np.asarray(right_sizes, dtype=np.float64)
+    index = LSHIndex(sr.shape[1], bands)
+    for j, sig in enumerate(sr):
+        index.add(j, sig)
+    for i, sig in enumerate(sl):
+        cands = sorted(index.query(sig))
+        if cands:
+            jac[i, cands] = jaccard(sig, sr[cands])
+    if len(containment_pairs):
+        li, ri = (np.asarray(x, dtype=np.int64) for x in zip(*containment_pairs))
+        j = jaccard(sl[li], sr[ri])
+        small, large = np.minimum(nl[li], nr[ri]), np.maximum(nl[li], nr[ri])
+        cont[li, ri] = containment(j, small, large)
+    return jac, cont
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import math
-import re
-from typing import List
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd  # type: ignore
 
 from ..schemas.profile import ColumnProfile, TableProfile
+from ..utils.normalize import infer_format, parse_dates
 from ._masking import mask_examples
+from .keys import discover_keys, single_column_keys
+from .ingest import is_multi_table, iter_frame_chunks, load_table, load_tables, normalize_headers
+from .sampling import sample_chunks, sample_frame, sample_positions
+from .sketches import ColumnSketch, sketch_chunks, update_sketches
+from .tagger import MAJORITY, tag_counts, tag_strings
 
 
 def dtype_to_simple(pd_dtype) -> str:
@@ -24,69 +31,338 @@ def dtype_to_simple(pd_dtype) -> str:
     return "string"
 
 
-_SEMANTIC_PATTERNS = {
-    "email_like": re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"),
-    "phone_like": re.compile(r"^(\+?\d[\d\s\-().]{6,}\d)$"),
-    "canadian_postal_code": re.compile(r"^[ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z]\s?\d[ABCEGHJ-NPRSTV-Z]\d$", re.I),
-    "date_iso": re.compile(r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:Z|[+-]\d{2}:?\d{2})?)?$"),
-    "currency_amount_like": re.compile(r"^\$?\s?-?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?$"),
-    "iban_like": re.compile(r"^[A-Z]{2}\d{2}[A-Z0-9]{1,30}$", re.I),
-}
+def _tag_sample(present: pd.Series, k: int = 200) -> pd.Series:
+    """Up to ``k`` non-null values as str, drawn with the configured sampling method."""
+    if len(present) > k:
+        present = present.iloc[sample_positions(len(present), k)]
+    return present.astype(str)
 
 
 def infer_semantic_tags(series: pd.Series) -> List[str]:
-    tags: List[str] = []
-    sample = series.dropna().astype(str).head(200)
-    if sample.empty:
-        return tags
-    for name, pattern in _SEMANTIC_PATTERNS.items():
-        try:
-            matches = sample.str.fullmatch(pattern).mean()  # fraction
-        except Exception:
-            matches = 0.0
-        if matches >= 0.5:  # heuristic majority threshold
-            tags.append(name)
-    return tags
-
-
-def _safe_examples(series: pd.Series, k: int = 3) -> List[str]:
-    vals = series.dropna().astype(str).unique().tolist()
+    return tag_strings(_tag_sample(series.dropna()))
+
+
+def _examples(present: pd.Series, head_str: pd.Series, k: int = 3) -> List[str]:
+    """First ``k`` distinct values as str; only converts the whole column when the head repeats."""
+    vals = pd.unique(head_str).tolist()
+    if len(vals) < k and len(present) > len(head_str):
+        vals = present.astype(str).unique().tolist()
     return vals[:k]
 
 
-def profile_table(df: pd.DataFrame, table_name: str, sample_n: int) -> TableProfile:
-    df_sample = df.head(sample_n)
-    columns: List[ColumnProfile] = []
-    for col in df_sample.columns:
-        s = df_sample[col]
-        dtype = dtype_to_simple(s.dtype)
-        nulls = int(s.isna().sum())
-        unique_count = int(s.nunique(dropna=True))
-        from app.core.config import settings as cfg_settings
-        cand_pk = unique_count >= min(len(df_sample), sample_n) * cfg_settings.pk_unique_ratio and nulls == 0
-        examples = _safe_examples(s, 3)
-        # Import settings at call time to honor env changes in tests
-        from app.core.config import settings as cfg_settings
-        if cfg_settings.profile_examples_masked:
-            examples = mask_examples(examples)
-        semantic = infer_semantic_tags(s)
-        columns.append(
-            ColumnProfile(
-                name=str(col),
-                dtype=dtype,
-                null_count=nulls,
-                unique_count_sampled=unique_count,
-                candidate_primary_key_sampled=bool(cand_pk),
-                examples=examples,
-                semantic_tags=semantic,
-            )
-        )
-    return TableProfile(
+def _min_max(present: pd.Series, dtype: str) -> tuple[Any, Any]:
+    """(min, max) for numeric and datetime columns, JSON-safe; (None, None) otherwise."""
+    if present.empty or dtype not in {"integer", "number", "datetime"}:
+        return None, None
+    lo, hi = present.min(), present.max()
+    if dtype == "datetime":
+        return lo.isoformat(), hi.isoformat()
+    if dtype == "integer":
+        return int(lo), int(hi)
+    lo, hi = float(lo), float(hi)
+    return (lo if math.isfinite(lo) else None), (hi if math.isfinite(hi) else None)
+
+
+def _with_sketches(prof: TableProfile, sketches: Dict[str, ColumnSketch], masked: bool) -> TableProfile:
+    cols = [
+        c.model_copy(update={"sketches": sketches[c.name].to_dict(masked=masked)}) if c.name in sketches else c
+        for c in prof.columns_profile
+    ]
+    return prof.model_copy(update={"columns_profile": cols})
+
+
+def _profile_column(s: pd.Series, null_count: int, unique_count: int, pk_floor: float, masked: bool) -> ColumnProfile:
+    dtype = dtype_to_simple(s.dtype)
+    present = s.dropna() if null_count else s
+    # one str conversion, shared by the examples and the semantic tags
+    head_str = _tag_sample(present)
+    examples = _examples(present, head_str, 3)
+    if masked:
+        examples = mask_examples(examples)
+    lo, hi = _min_max(present, dtype)
+    # text that parses as numbers or dates: record the type and the format that parses it
+    inferred, fmt = infer_format(head_str) if dtype == "string" else (None, None)
+    return ColumnProfile(
+        name=str(s.name),
+        dtype=dtype,
+        null_count=null_count,
+        unique_count_sampled=unique_count,
+        candidate_primary_key_sampled=bool(unique_count >= pk_floor and null_count == 0),
+        examples=examples,
+        semantic_tags=tag_strings(head_str),
+        min_value=lo,
+        max_value=hi,
+        inferred_type=inferred,
+        format=fmt,
+    )
+
+
+def profile_table(
+    df: pd.DataFrame,
+    table_name: str,
+    sample_n: int,
+    sketches: Optional[bool] = None,
+    sample: Optional[pd.DataFrame] = None,
+    keys: bool = True,
+    key_search: Optional[bool] = None,
+) -> TableProfile:
+    """Sampled statistics from ``sample_n`` rows (``SAMPLE_METHOD``; or a precomputed ``sample``).
+
+    With ``sketches`` (default ``PROFILE_SKETCHES``) every column also gets full-data
+    HLL / t-digest / top-k sketches, built chunk by chunk over the whole frame.
+    Tables of at least ``PROFILE_PARALLEL_MIN_COLUMNS`` columns are split into contiguous
+    column groups profiled on ``PROFILE_COLUMN_WORKERS`` threads. With ``keys`` columns
+    unique on the sample are checked over the whole frame; with ``key_search`` as well
+    (default ``PROFILE_KEY_SEARCH``) minimal unique column combinations (up to
+    ``PK_MAX_ARITY``) are searched instead.
+    """
+    # Import settings at call time to honor env changes in tests
+    from app.core.config import settings as cfg_settings
+    df_sample = sample if sample is not None else sample_frame(df, sample_n)
+    # null and distinct counts for every column in two vectorized passes over the frame
+    nulls = df_sample.isna().sum().to_numpy()
+    uniques = df_sample.nunique(dropna=True).to_numpy()
+    pk_floor = min(len(df_sample), sample_n) * cfg_settings.pk_unique_ratio
+    masked = cfg_settings.profile_examples_masked
+
+    def _columns(idx: range) -> List[ColumnProfile]:
+        return [
+            _profile_column(df_sample.iloc[:, i], int(nulls[i]), int(uniques[i]), pk_floor, masked)
+            for i in idx
+        ]
+
+    width = df_sample.shape[1]
+    workers = min(cfg_settings.profile_column_workers, width)
+    if workers > 1 and width >= cfg_settings.profile_parallel_min_columns:
+        # contiguous column groups, one per thread; map() returns them in column order
+        from concurrent.futures import ThreadPoolExecutor
+        step = -(-width // workers)
+        groups = [range(lo, min(lo + step, width)) for lo in range(0, width, step)]
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            columns = [c for part in pool.map(_columns, groups) for c in part]
+    else:
+        columns = _columns(range(width))
+    prof = TableProfile(
         table=table_name,
         rows=int(len(df)),
         columns=int(df.shape[1]),
         sample_n=int(min(sample_n, len(df))),
         columns_profile=columns,
     )
+    if sketches is None:
+        sketches = cfg_settings.profile_sketches
+    full: Dict[str, ColumnSketch] = {}
+    if sketches:
+        full = sketch_chunks(iter_frame_chunks(df, cfg_settings.ingest_chunk_rows))
+    if key_search is None:
+        key_search = cfg_settings.profile_key_search
+    if keys and key_search and cfg_settings.pk_max_arity > 0:
+        distinct = {name: sk.hll.estimate() for name, sk in full.items()} if full else None
+        found, complete = discover_keys(df, sample=df_sample, distinct=distinct)
+        prof = prof.model_copy(update={"candidate_keys": found, "candidate_keys_complete": complete})
+    elif keys:
+        # only columns unique on the sample can be keys
+        found = single_column_keys(df, [c.name for c in columns if c.candidate_primary_key_sampled])
+        prof = prof.model_copy(update={"candidate_keys": found})
+    if full:
+        prof = _with_sketches(prof, full, cfg_settings.profile_examples_masked)
+    return prof
+
+
+def profile_table_chunks(chunks: Iterable[pd.DataFrame], table_name: str, sample_n: int, sketches: Optional[bool] = None) -> TableProfile:
+    """Profile a chunked table: ``sample_n`` rows are kept (see ``sampling.sample_chunks``),
+    the rest are only counted (and, with ``sketches``, folded into the per-column sketches
+    as they stream past)."""
+    from app.core.config import settings as cfg_settings
+    if sketches is None:
+        sketches = cfg_settings.profile_sketches
+    full: Dict[str, ColumnSketch] = {}
+    rows = 0
+
+    def _scan():
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            if sketches:
+                update_sketches(full, chunk)
+            yield chunk
+
+    scanned = _scan()
+    sample = sample_chunks(scanned, sample_n)
+    # head sampling stops reading early; counts and sketches need the rest
+    for _ in scanned:
+        pass
+    # only the sample is held, so keys (which need every row) are not searched here
+    prof = profile_table(sample, table_name, sample_n, sketches=False, keys=False).model_copy(update={"rows": int(rows)})
+    if sketches:
+        prof = _with_sketches(prof, full, cfg_settings.profile_examples_masked)
+    return prof
+
+
+def _updated_column(
+    col: ColumnProfile,
+    state: ColumnSketch,
+    joining: pd.Series,
+    rest: pd.Series,
+    sample_n: int,
+    pk_ratio: float,
+    masked: bool,
+) -> ColumnProfile:
+    """Fold ``joining`` (rows entering the sample) and ``rest`` (the others) into one column.
+
+    Only called with rows ``joining`` when the old sample covered the whole table, so
+    ``state`` then describes exactly the old sample and its merge with them is the new one.
+    """
+    chunk = state.empty_like().update(joining)
+    update: Dict[str, Any] = {}
+    if len(joining):
+        sample = ColumnSketch.from_dict(col.sketches).merge(chunk)
+        present = joining.dropna()
+        head_str = present.astype(str)
+        unique = min(int(round(sample.hll.estimate())), sample.count - sample.null_count)
+        update.update(
+            null_count=sample.null_count,
+            unique_count_sampled=unique,
+            candidate_primary_key_sampled=bool(unique >= sample_n * pk_ratio and sample.null_count == 0),
+        )
+        if len(col.examples) < 3:
+            extra = [v for v in pd.unique(head_str).tolist() if v not in col.examples]
+            update["examples"] = col.examples + (mask_examples(extra) if masked else extra)[: 3 - len(col.examples)]
+        lo, hi = _min_max(present, col.dtype)
+        if lo is not None:
+            update["min_value"] = lo if col.min_value is None else min(col.min_value, lo)
+            update["max_value"] = hi if col.max_value is None else max(col.max_value, hi)
+        # tags were decided on up to 200 present values; top those up too
+        old_n = min(200, state.count - state.null_count)
+        new_str = head_str.head(max(0, 200 - old_n))
+        if len(new_str):
+            # an old tag is only known to cover a majority of its values: count that lower bound
+            old_w = MAJORITY * old_n
+            need = MAJORITY * (old_n + len(new_str))
+            counts = tag_counts(new_str, need - old_w)
+            update["semantic_tags"] = [
+                name for name, w in counts.items() if w + (old_w if name in col.semantic_tags else 0.0) >= need
+            ]
+    state.merge(chunk.update(rest))
+    update["sketches"] = state.to_dict(masked=masked)
+    return col.model_copy(update=update)
+
+
+def _as_profiled(s: pd.Series, dtype: str) -> pd.Series:
+    """``s`` cast to a profiled numeric/datetime dtype when another reader parsed it as text
+    (e.g. the pyarrow engine vs pandas, or a workbook vs a CSV batch); ValueError when
+    values would be lost in the cast."""
+    if dtype in {"integer", "number"} and not pd.api.types.is_numeric_dtype(s):
+        out = pd.to_numeric(s, errors="coerce")
+    elif dtype == "datetime" and not pd.api.types.is_datetime64_any_dtype(s):
+        out = parse_dates(s)
+    else:
+        return s
+    lost = int(out.isna().sum() - s.isna().sum())
+    if lost:
+        raise ValueError(f"Column {s.name!r}: {lost} values do not parse as the profiled dtype {dtype}")
+    return out
+
+
+def update_profile(profile: TableProfile, delta: pd.DataFrame, sample_n: Optional[int] = None) -> TableProfile:
+    """Extend ``profile`` with appended rows, reading only ``delta``.
+
+    The full-data state is the per-column sketches, so ``profile`` must have been built
+    with ``sketches=True``; they are merged with sketches of ``delta`` (counts, null rates,
+    distinct estimates, quantiles, top-k). Sampled fields stay as they are once the sample
+    holds ``sample_n`` rows (exact for ``SAMPLE_METHOD=head``; a reservoir sample then keeps
+    describing the earlier rows). While it does not, rows of ``delta`` drawn with the
+    sampling method top it up (distinct counts then come from the merged HLL).
+    Columns missing from ``delta`` count as null; columns the profile lacks are rejected.
+    Candidate keys the batch breaks by itself (nulls, repeats within it) are dropped;
+    repeats across old and new rows cannot be seen without the old rows.
+    """
+    from app.core.config import settings as cfg_settings
+    if sample_n is None:
+        sample_n = cfg_settings.sample_n
+    names = [c.name for c in profile.columns_profile]
+    unknown = sorted(set(map(str, delta.columns)) - set(names))
+    if unknown:
+        raise ValueError(f"Columns not in the profile: {unknown}")
+    stateless = [c.name for c in profile.columns_profile if not (c.sketches and c.sketches.get("hll"))]
+    if stateless:
+        raise ValueError(f"Profile has no sketch state for {stateless}; profile with sketches=true first")
+    delta = delta.reindex(columns=names)
+    delta = pd.DataFrame({c.name: _as_profiled(delta[c.name], c.dtype) for c in profile.columns_profile}, index=delta.index)
+    # rows past the old sample were never kept, so it can only grow while it held every row
+    room = max(0, sample_n - profile.sample_n) if profile.sample_n == profile.rows else 0
+    joining = np.zeros(len(delta), dtype=bool)
+    joining[sample_positions(len(delta), room)] = True
+    head, rest = delta[joining], delta[~joining]
+    new_sample_n = profile.sample_n + len(head)
+    columns = [
+        _updated_column(
+            col,
+            ColumnSketch.from_dict(col.sketches),
+            head.iloc[:, i],
+            rest.iloc[:, i],
+            new_sample_n,
+            cfg_settings.pk_unique_ratio,
+            cfg_settings.profile_examples_masked,
+        )
+        for i, col in enumerate(profile.columns_profile)
+    ]
+    keys = [k for k in profile.candidate_keys if not delta[k].isna().any().any() and not delta.duplicated(subset=k).any()]
+    return profile.model_copy(update={
+        "rows": profile.rows + len(delta),
+        "sample_n": new_sample_n,
+        "columns_profile": columns,
+        "candidate_keys": keys,
+    })
+
+
+def profile_source(
+    content: Any,
+    filename: str,
+    sample_n: int,
+    engine: Optional[str] = None,
+    sha256: Optional[str] = None,
+    sketches: Optional[bool] = None,
+    key_search: Optional[bool] = None,
+) -> Tuple[List[Tuple[str, TableProfile]], float]:
+    """Parse one upload (bytes or spooled path) and profile every table in it.
+
+    Returns ``([(name, profile), ...], elapsed_ms)``. Top-level so it can run in a worker
+    process; sheets are parsed serially there since the pool already spans the files.
+    With ``sha256`` single-table uploads go through the in-process table cache.
+    """
+    start = time.perf_counter()
+    if is_multi_table(filename):
+        tables = {name: normalize_headers(df) for name, df in load_tables(content, filename, engine=engine, workers=1).items()}
+    elif sha256:
+        from .table_cache import load_table_cached
+        tables = {filename: load_table_cached(content, filename, sha256=sha256, engine=engine)}
+    else:
+        tables = {filename: normalize_headers(load_table(content, filename, engine=engine))}
+    profiles = [(name, profile_table(df, name, sample_n, sketches=sketches, key_search=key_search)) for name, df in tables.items()]
+    return profiles, (time.perf_counter() - start) * 1000.0
+
 
+def profile_sources(
+    sources: Sequence[Tuple[Any, str, Optional[str]]],
+    sample_n: int,
+    engine: Optional[str] = None,
+    workers: int = 1,
+    sketches: Optional[bool] = None,
+    key_search: Optional[bool] = None,
+) -> List[Tuple[List[Tuple[str, TableProfile]], float]]:
+    """profile_source over ``(content, filename, sha256)`` triples, one pool task per file.
 
+    Results come back in input order. A single source, ``workers <= 1`` or less than
+    ``INGEST_PARALLEL_MIN_BYTES`` in total is handled in-process, using the table cache;
+    otherwise the files go to the shared worker pool (services.workers).
+    """
+    from app.core.config import settings as cfg_settings
+    from .workers import source_size, submit
+    if workers <= 1 or len(sources) <= 1 or sum(source_size(c) for c, _, _ in sources) < cfg_settings.ingest_parallel_min_bytes:
+        return [profile_source(content, name, sample_n, engine, sha256, sketches, key_search) for content, name, sha256 in sources]
+    futures = [
+        submit(min(workers, len(sources)), profile_source, content, name, sample_n, engine, None, sketches, key_search)
+        for content, name, _ in sources
+    ]
+    return [f.result() for f in futures]
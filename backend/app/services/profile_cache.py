@@ -0,0 +1,75 @@
+"""Persistent profile cache: unchanged uploads profiled with unchanged settings are served from the DB."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import PurePath
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from ..schemas.profile import TableProfile
+from .db import get_cached_profiles, put_cached_profiles
+from .tagger import MAJORITY, semantic_tags
+
+# bump when profile_table output changes for the same inputs and settings
+PROFILE_CACHE_VERSION = 5
+
+
+def profile_fingerprint(engine: str, sketches: bool, key_search: bool) -> str:
+    """Hash of everything besides the bytes and sample_n that shapes a TableProfile."""
+    from app.core.config import settings as cfg_settings
+    parts = {
+        "version": PROFILE_CACHE_VERSION,
+        "engine": engine,
+        "excel_engine": cfg_settings.excel_engine,
+        # large uploads are profiled chunk by chunk, and samples are drawn per chunk
+        "chunk_rows": cfg_settings.ingest_chunk_rows,
+        "pk_unique_ratio": cfg_settings.pk_unique_ratio,
+        "pk_search": [cfg_settings.pk_max_arity, cfg_settings.pk_search_budget_s] if key_search else None,
+        "sample": [cfg_settings.sample_method, cfg_settings.sample_stratify, cfg_settings.sample_seed],
+        "examples_masked": cfg_settings.profile_examples_masked,
+        "tags": [[t.name, t.pattern, t.flags] for t in semantic_tags()],
+        "tag_majority": MAJORITY,
+        "sketches": [cfg_settings.sketch_hll_p, cfg_settings.sketch_topk, cfg_settings.sketch_minhash_k] if sketches else None,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def dataset_fingerprint(fingerprint: str, df: pd.DataFrame) -> str:
+    """``fingerprint`` narrowed to a registered dataset's frame: its parse (projection, row
+    limit, engine) shows in the columns, dtypes and rows, and its sample is drawn per dataset."""
+    parts = {"profile": fingerprint, "dtypes": [[str(c), str(t)] for c, t in df.dtypes.items()], "rows": len(df)}
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def profile_cache_key(sha256: str, filename: str, sample_n: int, fingerprint: str) -> str:
+    # the extension decides how the bytes are parsed (.csv vs .tsv vs .csv.gz)
+    ext = "".join(PurePath((filename or "").lower()).suffixes[-2:])
+    digest = sha256.split(":", 1)[-1]
+    return hashlib.sha256(f"{digest}|{ext}|{int(sample_n)}|{fingerprint}".encode("utf-8")).hexdigest()
+
+
+def _suffix(name: str, filename: str) -> str:
+    # stored relative to the upload name so a renamed but identical file still hits
+    return name[len(filename):] if name.startswith(filename) else f"::{name}"
+
+
+def cached_profiles(sha256: str, filename: str, sample_n: int, fingerprint: str) -> Optional[List[Tuple[str, TableProfile]]]:
+    rows = get_cached_profiles(profile_cache_key(sha256, filename, sample_n, fingerprint))
+    if rows is None:
+        return None
+    out: List[Tuple[str, TableProfile]] = []
+    for row in rows:
+        name = filename + row["suffix"]
+        out.append((name, TableProfile.model_validate({**row["profile"], "table": name})))
+    return out
+
+
+def store_profiles(sha256: str, filename: str, sample_n: int, fingerprint: str, tables: List[Tuple[str, TableProfile]]) -> None:
+    # a key search cut short by its time budget depends on machine load, not on the inputs
+    if any(prof.candidate_keys_complete is False for _, prof in tables):
+        return
+    rows = [{"suffix": _suffix(name, filename), "profile": prof.model_dump()} for name, prof in tables]
+    put_cached_profiles(profile_cache_key(sha256, filename, sample_n, fingerprint), sha256, int(sample_n), fingerprint, rows)
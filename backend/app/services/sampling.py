@@ -0,0 +1,188 @@
+"""Row sampling: seeded, single-pass reservoir (optionally stratified) over chunk streams.
+
+Each row draws a uniform random key and the sample is the ``n`` rows with the smallest
+keys ("bottom-k"), which is a uniform sample without replacement. Keys make the
+reservoir mergeable chunk by chunk: once it is full, a row can only enter when its key
+beats the current largest one, so later chunks are mostly filtered with one comparison.
+
+Stratified sampling (``SAMPLE_METHOD=stratified`` on the ``SAMPLE_STRATIFY`` column, plain
+reservoir for tables without it) keeps the bottom-k rows of every stratum, k being the
+stratum's share of ``n`` so far rounded up, and at most ``2 * n`` rows in all however many
+strata there are. The final ``n`` is allocated proportionally to the stratum sizes seen
+in the stream (at least one row each while there are no more strata than ``n``).
+Samples are returned in original row order, so "first values" stay meaningful.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+SAMPLE_METHODS = ("reservoir", "head", "stratified")
+
+
+def _settings():
+    # Import settings at call time to honor env changes in tests
+    from app.core.config import settings as cfg_settings
+    return cfg_settings
+
+
+def strata_column(columns: Sequence[object], method: Optional[str] = None, stratify: Optional[str] = None) -> Optional[str]:
+    """The column to stratify on: ``stratify`` if given, else ``SAMPLE_STRATIFY`` when the
+    method is "stratified" and the table has that column."""
+    if stratify is not None:
+        return stratify
+    cfg = _settings()
+    if (method or cfg.sample_method) == "stratified" and cfg.sample_stratify and cfg.sample_stratify in columns:
+        return cfg.sample_stratify
+    return None
+
+
+def content_seed(sha256: str, seed: Optional[int] = None) -> int:
+    """Seed for sampling one input: ``SAMPLE_SEED`` mixed with its content hash, so different
+    inputs are not sampled at the same row positions and reruns stay reproducible."""
+    base = _settings().sample_seed if seed is None else seed
+    digest = sha256.split(":", 1)[-1]
+    return int(hashlib.sha256(f"{base}|{digest}".encode("utf-8")).hexdigest()[:16], 16)
+
+
+class Reservoir:
+    """Uniform sample of ``n`` rows from a stream of frames, in one pass."""
+
+    def __init__(self, n: int, seed: Optional[int] = None, stratify: Optional[str] = None) -> None:
+        self.n = max(0, int(n))
+        self.stratify = stratify
+        self.rng = np.random.default_rng(_settings().sample_seed if seed is None else seed)
+        self.seen = 0
+        self.strata: Dict[object, int] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0, dtype=np.float64)
+        self._pos = np.empty(0, dtype=np.int64)
+
+    def add(self, chunk: pd.DataFrame) -> "Reservoir":
+        m = len(chunk)
+        if not m:
+            if self._frame is None:
+                self._frame = chunk.iloc[:0]
+            return self
+        keys = self.rng.random(m)
+        pos = np.arange(self.seen, self.seen + m, dtype=np.int64)
+        self.seen += m
+        if self.stratify is not None:
+            for value, count in chunk[self.stratify].value_counts(dropna=False).items():
+                self.strata[value] = self.strata.get(value, 0) + int(count)
+        elif len(self._keys) >= self.n:
+            # full reservoir: only rows beating the current largest key can enter
+            keep = keys < (self._keys.max() if self.n else -1.0)
+            if not keep.any():
+                if self._frame is None:
+                    self._frame = chunk.iloc[:0]
+                return self
+            chunk, keys, pos = chunk[keep], keys[keep], pos[keep]
+        frame = chunk if self._frame is None else pd.concat([self._frame, chunk])
+        keys = np.concatenate([self._keys, keys])
+        pos = np.concatenate([self._pos, pos])
+        order = np.argsort(keys, kind="stable")
+        if self.stratify is None:
+            take = order[: self.n]
+        else:
+            # bottom-k per stratum for its share of n so far; the allocation happens in frame()
+            strata = frame[self.stratify].iloc[order]
+            rank = strata.groupby(strata, dropna=False, sort=False).cumcount().to_numpy()
+            quota = np.ceil(self.n * strata.map(self.strata).to_numpy(dtype=np.float64) / self.seen)
+            take = order[rank < quota][: 2 * self.n]
+        self._frame, self._keys, self._pos = frame.iloc[take], keys[take], pos[take]
+        return self
+
+    def _allocation(self) -> Dict[object, int]:
+        values = list(self.strata)
+        counts = np.array([self.strata[v] for v in values], dtype=np.float64)
+        share = self.n * counts / max(1.0, counts.sum())
+        floor = np.floor(share) if len(values) > self.n else np.maximum(np.floor(share), 1.0)
+        alloc = np.minimum(floor, counts)
+        # hand out what is left by largest remainder, never beyond a stratum's size
+        for i in np.argsort(-(share - np.floor(share)), kind="stable"):
+            if alloc.sum() >= self.n:
+                break
+            if alloc[i] < counts[i]:
+                alloc[i] += 1
+        return {v: int(a) for v, a in zip(values, alloc)}
+
+    def frame(self) -> pd.DataFrame:
+        """The sample, in original row order (original index labels kept)."""
+        if self._frame is None:
+            return pd.DataFrame()
+        keys, pos, frame = self._keys, self._pos, self._frame
+        if self.stratify is not None and len(frame):
+            order = np.argsort(keys, kind="stable")
+            strata = frame[self.stratify].iloc[order]
+            rank = strata.groupby(strata, dropna=False, sort=False).cumcount().to_numpy()
+            limit = strata.map(self._allocation()).fillna(0).to_numpy()
+            chosen = rank < limit
+            # strata held below their allocation leave room: fill it with the smallest keys
+            short = self.n - int(chosen.sum())
+            if short > 0:
+                chosen[np.flatnonzero(~chosen)[:short]] = True
+            take = order[chosen]
+            frame, pos = frame.iloc[take], pos[take]
+        return frame.iloc[np.argsort(pos, kind="stable")]
+
+
+def sample_positions(length: int, n: int, method: Optional[str] = None, seed: Optional[int] = None) -> np.ndarray:
+    """Sorted row positions of an ``n``-row sample out of ``length`` rows."""
+    method = method or _settings().sample_method
+    if n >= length:
+        return np.arange(length, dtype=np.int64)
+    if method == "head":
+        return np.arange(max(0, n), dtype=np.int64)
+    rng = np.random.default_rng(_settings().sample_seed if seed is None else seed)
+    return np.sort(np.argpartition(rng.random(length), n)[:n]) if n > 0 else np.empty(0, dtype=np.int64)
+
+
+def sample_frame(
+    df: pd.DataFrame,
+    n: int,
+    method: Optional[str] = None,
+    seed: Optional[int] = None,
+    stratify: Optional[str] = None,
+) -> pd.DataFrame:
+    """``n`` rows of an in-memory frame (all of it when ``n >= len(df)``), in row order."""
+    if n >= len(df):
+        return df
+    stratify = strata_column(list(df.columns), method, stratify)
+    if stratify is not None:
+        return Reservoir(n, seed=seed, stratify=stratify).add(df).frame()
+    return df.iloc[sample_positions(len(df), n, method=method, seed=seed)]
+
+
+def sample_chunks(
+    chunks: Iterable[pd.DataFrame],
+    n: int,
+    method: Optional[str] = None,
+    seed: Optional[int] = None,
+    stratify: Optional[str] = None,
+) -> pd.DataFrame:
+    """Sample a chunk stream in one pass; only the reservoir is ever held in memory.
+
+    With ``method="head"`` the stream is only read until ``n`` rows are in.
+    """
+    method = method or _settings().sample_method
+    if method == "head" and stratify is None:
+        parts, have = [], 0
+        for chunk in chunks:
+            part = chunk.head(n - have)
+            parts.append(part)
+            have += len(part)
+            if have >= n:
+                break
+        return pd.concat(parts) if parts else pd.DataFrame()
+    reservoir: Optional[Reservoir] = None
+    for chunk in chunks:
+        if reservoir is None:
+            # the strata column is known once the first chunk shows the header
+            reservoir = Reservoir(n, seed=seed, stratify=strata_column(list(chunk.columns), method, stratify))
+        reservoir.add(chunk)
+    return reservoir.frame() if reservoir is not None else pd.DataFrame()
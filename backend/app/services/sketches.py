@@ -0,0 +1,456 @@
+"""Mergeable per-column sketches for full-data profiling.
+
+Each sketch is updated chunk by chunk with vectorized numpy work, merges with another
+sketch of the same kind (partitions, worker processes) and round-trips through a JSON
+dict, so a profile can carry its state and be extended later:
+
+- HyperLogLog: distinct count in 2**p one-byte registers.
+- TDigest: quantiles from at most ~compression/2 weighted centroids.
+- MisraGries: top-k heavy hitters keyed by value hash, k counters.
+- BottomK: k smallest distinct hashes (KMV MinHash) for Jaccard / containment estimates.
+- BloomFilter: membership bits over a key column's values, so other columns can be
+  tested against it (foreign-key discovery). Not part of ColumnSketch: it grows with the
+  column, so it is kept server-side with the dataset instead of inside profiles.
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from ._masking import mask_examples
+
+_U64 = np.uint64
+
+
+def _clz64(x: np.ndarray) -> np.ndarray:
+    """Vectorized count of leading zero bits in uint64 values (64 for zero)."""
+    x = x.astype(_U64, copy=True)
+    n = np.zeros(x.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = x < (_U64(1) << _U64(64 - shift))
+        n[empty] += shift
+        x[empty] <<= _U64(shift)
+    n[x == 0] += 1
+    return n
+
+
+class HyperLogLog:
+    def __init__(self, p: int = 12, registers: Optional[np.ndarray] = None) -> None:
+        self.p = int(min(max(p, 4), 18))
+        m = 1 << self.p
+        self.registers = np.zeros(m, dtype=np.uint8) if registers is None else registers.astype(np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        h = hashes.astype(_U64, copy=False)
+        idx = (h >> _U64(64 - self.p)).astype(np.int64)
+        rank = np.minimum(_clz64(h << _U64(self.p)) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # small range: linear counting is exact-ish while registers are sparse
+            return m * math.log(m / zeros)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        packed = base64.b64encode(zlib.compress(self.registers.tobytes())).decode("ascii")
+        return {"p": self.p, "registers": packed}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        raw = zlib.decompress(base64.b64decode(data["registers"]))
+        return cls(int(data["p"]), np.frombuffer(raw, dtype=np.uint8).copy())
+
+
+class TDigest:
+    """Merging t-digest: centroids are re-clustered on the arcsine k-scale after every update."""
+
+    def __init__(self, compression: float = 100.0) -> None:
+        self.compression = float(compression)
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> None:
+        v = np.asarray(values, dtype=np.float64)
+        v = v[np.isfinite(v)]
+        if not v.size:
+            return
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        self._compress(np.concatenate([self.means, v]), np.concatenate([self.weights, np.ones(v.size)]))
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if other.weights.size:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2.0) / total
+        # k1 scale: unit-width buckets are narrow at the tails and wide around the median
+        k = np.floor(self.compression / (2.0 * math.pi) * np.arcsin(np.clip(2.0 * q_mid - 1.0, -1.0, 1.0)))
+        groups = (k - k.min()).astype(np.int64)
+        w = np.bincount(groups, weights=weights)
+        m = np.bincount(groups, weights=means * weights)
+        keep = w > 0
+        self.weights = w[keep]
+        self.means = m[keep] / self.weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.weights.size:
+            return None
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2.0
+        xs = np.concatenate([[0.0], centers, [total]])
+        ys = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(min(max(q, 0.0), 1.0) * total, xs, ys))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "means": [float(x) for x in self.means],
+            "weights": [float(x) for x in self.weights],
+            "min": self.min if self.weights.size else None,
+            "max": self.max if self.weights.size else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        td = cls(float(data.get("compression", 100.0)))
+        td.means = np.asarray(data.get("means") or [], dtype=np.float64)
+        td.weights = np.asarray(data.get("weights") or [], dtype=np.float64)
+        if td.weights.size:
+            td.min, td.max = float(data["min"]), float(data["max"])
+        return td
+
+
+class MisraGries:
+    """k counters; any value more frequent than n/(k+1) is guaranteed to be kept."""
+
+    def __init__(self, k: int = 10) -> None:
+        self.k = max(1, int(k))
+        self.counts: Dict[int, int] = {}
+        self.values: Dict[int, str] = {}
+
+    def _reduce(self) -> None:
+        if len(self.counts) <= self.k:
+            return
+        # subtract the (k+1)-th largest counter from every counter and drop the non-positive ones
+        floor = sorted(self.counts.values(), reverse=True)[self.k]
+        self.counts = {h: c - floor for h, c in self.counts.items() if c > floor}
+        self.values = {h: self.values[h] for h in self.counts}
+
+    def update(self, hashes: np.ndarray, values: pd.Series) -> None:
+        if not len(hashes):
+            return
+        codes, uniques = pd.factorize(hashes)
+        counts = np.bincount(codes)
+        _, first = np.unique(codes, return_index=True)
+        if len(counts) > self.k:
+            floor = np.partition(counts, -(self.k + 1))[-(self.k + 1)]
+            keep = np.flatnonzero(counts > floor)
+            counts = counts[keep] - floor
+        else:
+            keep = np.arange(len(counts))
+        # only the surviving values are ever converted to str
+        shown = values.iloc[first[keep]].astype(str).tolist()
+        for h, c, v in zip(uniques[keep].tolist(), counts.tolist(), shown):
+            self.counts[h] = self.counts.get(h, 0) + int(c)
+            self.values.setdefault(h, v)
+        self._reduce()
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        for h, c in other.counts.items():
+            self.counts[h] = self.counts.get(h, 0) + c
+            self.values.setdefault(h, other.values[h])
+        self._reduce()
+        return self
+
+    def _ranked(self) -> List[int]:
+        return sorted(self.counts, key=lambda h: (-self.counts[h], self.values[h]))
+
+    def top(self) -> List[Dict[str, Any]]:
+        return [{"value": self.values[h], "count": int(self.counts[h])} for h in self._ranked()]
+
+    def to_dict(self, masked: bool = False) -> Dict[str, Any]:
+        ranked = self._ranked()
+        values = [self.values[h] for h in ranked]
+        if masked:
+            values = mask_examples(values)
+        # hashes as strings: uint64 does not survive JSON numbers
+        return {"k": self.k, "items": [[str(h), int(self.counts[h]), v] for h, v in zip(ranked, values)]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MisraGries":
+        mg = cls(int(data.get("k", 10)))
+        for h, c, v in data.get("items") or []:
+            mg.counts[int(h)] = int(c)
+            mg.values[int(h)] = str(v)
+        return mg
+
+
+def _pack(a: np.ndarray) -> str:
+    return base64.b64encode(zlib.compress(a.tobytes())).decode("ascii")
+
+
+def _unpack(data: str, dtype) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(base64.b64decode(data)), dtype=dtype).copy()
+
+
+class BottomK:
+    """KMV / bottom-k MinHash: the k smallest distinct value hashes, kept sorted."""
+
+    def __init__(self, k: int = 128, hashes: Optional[np.ndarray] = None) -> None:
+        self.k = max(1, int(k))
+        self.hashes = np.empty(0, dtype=_U64) if hashes is None else np.unique(hashes.astype(_U64))[: self.k]
+
+    @property
+    def full(self) -> bool:
+        return len(self.hashes) >= self.k
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        h = hashes.astype(_U64, copy=False)
+        if self.full:
+            h = h[h < self.hashes[-1]]
+        if len(h):
+            self.hashes = np.union1d(self.hashes, h)[: self.k]
+
+    def merge(self, other: "BottomK") -> "BottomK":
+        self.hashes = np.union1d(self.hashes, other.hashes)[: min(self.k, other.k)]
+        self.k = min(self.k, other.k)
+        return self
+
+    def containment_in(self, other: "BottomK") -> Optional[float]:
+        """Estimated share of this set's values that also occur in ``other``.
+
+        Up to ``other``'s largest kept hash its membership is exact, so the share among this
+        set's kept hashes in that range is an unbiased estimate; None when none qualify.
+        """
+        mine = self.hashes[self.hashes <= other.hashes[-1]] if other.full else self.hashes
+        if not len(mine):
+            return None
+        return float(np.isin(mine, other.hashes).mean())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "hashes": _pack(self.hashes)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BottomK":
+        return cls(int(data.get("k", 128)), _unpack(data["hashes"], _U64))
+
+
+class BloomFilter:
+    """m-bit Bloom filter over 64-bit value hashes (double hashing, ``n_hashes`` probes)."""
+
+    def __init__(self, m: int, n_hashes: int, bits: Optional[np.ndarray] = None) -> None:
+        self.m = max(8, int(m))
+        self.n_hashes = max(1, int(n_hashes))
+        self.bits = np.zeros(self.m, dtype=bool) if bits is None else bits[: self.m].astype(bool)
+
+    @classmethod
+    def for_capacity(cls, n: int, fpp: float = 0.01, max_bits: int = 1 << 23) -> "BloomFilter":
+        n = max(1, int(n))
+        m = min(int(max_bits), int(math.ceil(-n * math.log(fpp) / (math.log(2) ** 2))))
+        return cls(m, round(max(1.0, m / n * math.log(2))))
+
+    def _probes(self, hashes: np.ndarray) -> np.ndarray:
+        h = hashes.astype(_U64, copy=False)
+        h1, h2 = h & _U64(0xFFFFFFFF), (h >> _U64(32)) | _U64(1)
+        i = np.arange(self.n_hashes, dtype=_U64)[:, None]
+        with np.errstate(over="ignore"):
+            return ((h1[None, :] + i * h2[None, :]) % _U64(self.m)).astype(np.int64)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if len(hashes):
+            self.bits[self._probes(hashes).ravel()] = True
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        if not len(hashes):
+            return np.zeros(0, dtype=bool)
+        return self.bits[self._probes(hashes)].all(axis=0)
+
+    @property
+    def fpp(self) -> float:
+        """False-positive rate at the current fill."""
+        return float(self.bits.mean()) ** self.n_hashes
+
+    def merge(self, other: "BloomFilter") -> "BloomFilter":
+        if (other.m, other.n_hashes) != (self.m, self.n_hashes):
+            raise ValueError("cannot merge Bloom filters of different shape")
+        self.bits |= other.bits
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"m": self.m, "n_hashes": self.n_hashes, "bits": _pack(np.packbits(self.bits))}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        m = int(data["m"])
+        return cls(m, int(data["n_hashes"]), np.unpackbits(_unpack(data["bits"], np.uint8))[:m])
+
+
+def sketch_kind(dtype) -> Optional[str]:
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return None
+
+
+def _numeric(present: pd.Series, kind: Optional[str]) -> Optional[np.ndarray]:
+    """float64 values aligned with ``present`` (NaN where unparsable); None for other kinds."""
+    if kind == "numeric":
+        return pd.to_numeric(present, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    if kind == "datetime":
+        ts = pd.to_datetime(present, errors="coerce")
+        vals = ts.array.asi8.astype(np.float64)
+        vals[ts.isna().to_numpy()] = np.nan
+        return vals
+    return None
+
+
+def _hashes(present: pd.Series, numeric: Optional[np.ndarray]) -> np.ndarray:
+    # numeric columns hash their float64 value so int and float chunks of one column agree
+    base = pd.Series(numeric) if numeric is not None else present
+    return pd.util.hash_pandas_object(base, index=False).to_numpy()
+
+
+class ColumnSketch:
+    """Row/null counts plus HLL, Misra-Gries and (numeric/datetime) t-digest for one column."""
+
+    def __init__(self, kind: Optional[str] = None, hll_p: int = 12, topk: int = 10, compression: float = 100.0, minhash_k: int = 128) -> None:
+        self.kind = kind
+        self.count = 0
+        self.null_count = 0
+        self.hll = HyperLogLog(hll_p)
+        self.top = MisraGries(topk)
+        self.tdigest = TDigest(compression) if kind in {"numeric", "datetime"} else None
+        self.minhash = BottomK(minhash_k)
+
+    def empty_like(self) -> "ColumnSketch":
+        """A fresh sketch with this one's kind and parameters, so the two can merge."""
+        compression = self.tdigest.compression if self.tdigest is not None else 100.0
+        return ColumnSketch(self.kind, hll_p=self.hll.p, topk=self.top.k, compression=compression, minhash_k=self.minhash.k)
+
+    def value_hashes(self, s: pd.Series) -> np.ndarray:
+        """Hashes of the non-null values of ``s``, as this sketch hashes them."""
+        present = s.dropna()
+        return _hashes(present, _numeric(present, self.kind)) if len(present) else np.empty(0, dtype=_U64)
+
+    def update(self, s: pd.Series) -> "ColumnSketch":
+        self.count += int(len(s))
+        present = s.dropna()
+        self.null_count += int(len(s) - len(present))
+        if present.empty:
+            return self
+        numeric = _numeric(present, self.kind)
+        hashes = _hashes(present, numeric)
+        self.hll.add_hashes(hashes)
+        self.minhash.add_hashes(hashes)
+        self.top.update(hashes, present)
+        if self.tdigest is not None and numeric is not None:
+            self.tdigest.update(numeric)
+        return self
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        self.count += other.count
+        self.null_count += other.null_count
+        self.hll.merge(other.hll)
+        self.minhash.merge(other.minhash)
+        self.top.merge(other.top)
+        if self.tdigest is not None and other.tdigest is not None:
+            self.tdigest.merge(other.tdigest)
+        return self
+
+    def quantiles(self) -> Dict[str, Any]:
+        if self.tdigest is None or not self.tdigest.weights.size:
+            return {}
+        out: Dict[str, Any] = {}
+        for label, q in (("min", 0.0), ("p01", 0.01), ("p25", 0.25), ("p50", 0.5), ("p75", 0.75), ("p99", 0.99), ("max", 1.0)):
+            v = self.tdigest.quantile(q)
+            out[label] = pd.Timestamp(int(v)).isoformat() if self.kind == "datetime" else v
+        return out
+
+    def to_dict(self, masked: bool = False) -> Dict[str, Any]:
+        """Serialized state plus derived summary fields (ignored by from_dict)."""
+        return {
+            "kind": self.kind,
+            "count": self.count,
+            "null_count": self.null_count,
+            "distinct_estimate": int(round(self.hll.estimate())),
+            "quantiles": self.quantiles(),
+            "top_k": self.top.to_dict(masked=masked),
+            "hll": self.hll.to_dict(),
+            "tdigest": self.tdigest.to_dict() if self.tdigest is not None else None,
+            "minhash": self.minhash.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnSketch":
+        sk = cls(data.get("kind"))
+        sk.count = int(data.get("count", 0))
+        sk.null_count = int(data.get("null_count", 0))
+        sk.hll = HyperLogLog.from_dict(data["hll"])
+        sk.top = MisraGries.from_dict(data.get("top_k") or {})
+        sk.tdigest = TDigest.from_dict(data["tdigest"]) if data.get("tdigest") else None
+        if data.get("minhash"):
+            sk.minhash = BottomK.from_dict(data["minhash"])
+        return sk
+
+
+def update_sketches(sketches: Dict[str, ColumnSketch], chunk: pd.DataFrame, hll_p: Optional[int] = None, topk: Optional[int] = None) -> Dict[str, ColumnSketch]:
+    """Fold one chunk into per-column sketches (a column's kind comes from its first chunk)."""
+    from app.core.config import settings as cfg_settings
+    p = int(hll_p or cfg_settings.sketch_hll_p)
+    k = int(topk or cfg_settings.sketch_topk)
+    mk = int(cfg_settings.sketch_minhash_k)
+    for i, col in enumerate(chunk.columns):
+        s = chunk.iloc[:, i]
+        name = str(col)
+        if name not in sketches:
+            sketches[name] = ColumnSketch(sketch_kind(s.dtype), hll_p=p, topk=k, minhash_k=mk)
+        sketches[name].update(s)
+    return sketches
+
+
+def sketch_chunks(chunks: Iterable[pd.DataFrame], hll_p: Optional[int] = None, topk: Optional[int] = None) -> Dict[str, ColumnSketch]:
+    """One ColumnSketch per column, fed chunk by chunk."""
+    sketches: Dict[str, ColumnSketch] = {}
+    for chunk in chunks:
+        update_sketches(sketches, chunk, hll_p, topk)
+    return sketches
+
+
+def merge_sketch_dicts(a: Dict[str, Any], b: Dict[str, Any], masked: bool = False) -> Dict[str, Any]:
+    """Combine two serialized column sketches (e.g. from two partitions or workers)."""
+    return ColumnSketch.from_dict(a).merge(ColumnSketch.from_dict(b)).to_dict(masked=masked)
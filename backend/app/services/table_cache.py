@@ -0,0 +1,109 @@
+"""In-process cache of parsed, header-normalized tables keyed by content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import PurePath
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import pandas as pd  # type: ignore
+
+from ..core.config import settings
+from .ingest import load_table, normalize_headers
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    try:
+        return int(df.memory_usage(deep=True, index=True).sum())
+    except Exception:
+        return 0
+
+
+class TableCache:
+    """LRU of DataFrames bounded by total ``memory_usage(deep=True)`` bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = int(max_bytes)
+        self._items: "OrderedDict[Hashable, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        nbytes = frame_nbytes(df)
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            # frames larger than the whole budget are never cached
+            if self.max_bytes <= 0 or nbytes > self.max_bytes:
+                return
+            self._items[key] = (df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._items:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_CACHE = TableCache(settings.ingest_cache_max_bytes)
+
+
+def get_table_cache() -> TableCache:
+    return _CACHE
+
+
+def cache_key(sha256: str, filename: str, **options: Any) -> Tuple:
+    # the extension decides how the bytes are parsed (.csv.gz vs .tsv.gz), as in profile_cache
+    ext = "".join(PurePath((filename or "").lower()).suffixes[-2:])
+    digest = sha256.split(":", 1)[-1]
+    return (digest, ext, tuple(sorted((k, repr(v)) for k, v in options.items())))
+
+
+def load_table_cached(content: Union[bytes, str, os.PathLike], filename: str, sha256: Optional[str] = None, **options: Any) -> pd.DataFrame:
+    """``normalize_headers(load_table(...))`` served from the cache when the bytes were seen before.
+
+    ``content`` may be the path of a spooled upload, in which case ``sha256`` is required.
+    Callers get a shallow copy so renaming columns or attrs never leaks into the cached frame.
+    """
+    if sha256 is None and not isinstance(content, (bytes, bytearray)):
+        raise ValueError("sha256 is required when loading from a file path")
+    digest = sha256 or hashlib.sha256(content).hexdigest()
+    key = cache_key(digest, filename, **options)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached.copy(deep=False)
+    df = normalize_headers(load_table(content, filename, **options))
+    _CACHE.put(key, df)
+    return df.copy(deep=False)
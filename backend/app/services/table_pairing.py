@@ -90,7 +90,7 @@ def _row_ratio(a: int, b: int) -> float:
 
 
 def _has_pk(t: TableProfile) -> bool:
-    return any(c.candidate_primary_key_sampled for c in t.columns_profile)
+    return bool(t.candidate_keys) or any(c.candidate_primary_key_sampled for c in t.columns_profile)
 
 
 def _infer_entity(t: TableProfile) -> str:
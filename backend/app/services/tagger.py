@@ -0,0 +1,163 @@
+"""Semantic tagger: prefilter patterns on a cheap column signature, then match the survivors in one pass.
+
+Every tag declares, next to its regex, necessary conditions a value must meet to match:
+a length range and character classes it must contain. A column's signature (the set
+of characters in its sample and the length of each distinct value) rules out tags that
+cannot reach the majority threshold without running their regex. The remaining patterns
+are combined into a single regex of optional lookaheads, one named group per tag, and
+evaluated in one pass over the distinct sample values.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+DIGITS = frozenset(string.digits)
+LETTERS = frozenset(string.ascii_letters)
+
+# share of (non-null) sample values a pattern must fully match for the tag to apply
+MAJORITY = 0.5
+
+
+@dataclass(frozen=True)
+class SemanticTag:
+    name: str
+    pattern: str  # full-match regex, without ^/$ anchors
+    flags: int = 0
+    min_len: int = 1
+    max_len: Optional[int] = None
+    # each entry is a character class; a matching value contains at least one char of each
+    requires: Tuple[FrozenSet[str], ...] = ()
+
+
+_TAGS: Dict[str, SemanticTag] = {}
+_LOCK = threading.Lock()
+_COMBINED: Dict[Tuple[str, ...], "re.Pattern[str]"] = {}
+
+
+def register_semantic_tag(
+    name: str,
+    pattern: str,
+    flags: int = 0,
+    min_len: int = 1,
+    max_len: Optional[int] = None,
+    requires: Sequence[str | FrozenSet[str]] = (),
+) -> SemanticTag:
+    """Add (or replace) a tag. ``requires`` entries are strings of characters, one class each.
+
+    The bounds are only used to skip the regex, so they must be necessary conditions:
+    a value shorter/longer than the bounds, or without any char of a class, never matches.
+    """
+    re.compile(pattern, flags)  # fail fast on a bad pattern
+    tag = SemanticTag(
+        name=name,
+        pattern=pattern,
+        flags=flags,
+        min_len=max(0, int(min_len)),
+        max_len=None if max_len is None else int(max_len),
+        requires=tuple(frozenset(r) for r in requires),
+    )
+    with _LOCK:
+        _TAGS[name] = tag
+        _COMBINED.clear()
+    return tag
+
+
+def unregister_semantic_tag(name: str) -> bool:
+    with _LOCK:
+        found = _TAGS.pop(name, None) is not None
+        _COMBINED.clear()
+    return found
+
+
+def semantic_tags() -> List[SemanticTag]:
+    with _LOCK:
+        return list(_TAGS.values())
+
+
+register_semantic_tag("email_like", r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", min_len=6, requires=("@", ".", LETTERS))
+register_semantic_tag("phone_like", r"(\+?\d[\d\s\-().]{6,}\d)", min_len=8, requires=(DIGITS,))
+register_semantic_tag(
+    "canadian_postal_code", r"[ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z]\s?\d[ABCEGHJ-NPRSTV-Z]\d",
+    flags=re.I, min_len=6, max_len=7, requires=(DIGITS, LETTERS),
+)
+register_semantic_tag(
+    "date_iso", r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:Z|[+-]\d{2}:?\d{2})?)?",
+    min_len=10, max_len=25, requires=(DIGITS, "-"),
+)
+register_semantic_tag("currency_amount_like", r"\$?\s?-?\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?", requires=(DIGITS,))
+register_semantic_tag("iban_like", r"[A-Z]{2}\d{2}[A-Z0-9]{1,30}", flags=re.I, min_len=5, max_len=34, requires=(DIGITS, LETTERS))
+
+
+def _combined(tags: Sequence[SemanticTag]) -> "re.Pattern[str]":
+    """One regex of optional full-match lookaheads; group ``t<i>`` is set iff tag i matches."""
+    key = tuple(t.name for t in tags)
+    with _LOCK:
+        rx = _COMBINED.get(key)
+    if rx is None:
+        parts = []
+        for i, t in enumerate(tags):
+            body = t.pattern
+            if t.flags & re.I:
+                body = f"(?i:{body})"
+            parts.append(f"(?=(?P<t{i}>{body})\\Z)?")
+        rx = re.compile("^" + "".join(parts))
+        with _LOCK:
+            _COMBINED[key] = rx
+    return rx
+
+
+def _candidates(values: List[str], weights: np.ndarray, min_count: float) -> List[SemanticTag]:
+    """Tags whose necessary conditions can still hold for ``min_count`` of the sample."""
+    chars = frozenset("".join(values))
+    lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+    out = []
+    for t in semantic_tags():
+        if any(not (chars & cls) for cls in t.requires):
+            continue
+        in_range = lengths >= t.min_len
+        if t.max_len is not None:
+            in_range &= lengths <= t.max_len
+        if weights[in_range].sum() < min_count:
+            continue
+        out.append(t)
+    return out
+
+
+def tag_counts(sample: pd.Series, min_count: Optional[float] = None) -> Dict[str, float]:
+    """Number of ``sample`` values fully matching each tag that may reach ``min_count``.
+
+    ``min_count`` defaults to the majority of ``sample``; tags the prefilter rules out
+    are omitted, the others are reported even when they fall short.
+    """
+    if sample.empty:
+        return {}
+    # repeated values are matched once and weighted by their count
+    counts = Counter(sample.tolist())
+    values = list(counts)
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    if min_count is None:
+        min_count = MAJORITY * len(sample)
+    tags = _candidates(values, weights, min_count)
+    if not tags:
+        return {}
+    rx = _combined(tags)
+    cols = [rx.groupindex[f"t{i}"] for i in range(len(tags))]
+    # every lookahead is optional, so match() always succeeds; unset groups span (-1, -1)
+    spans = np.array([m.regs for m in map(rx.match, values)], dtype=np.int64)
+    score = weights @ (spans[:, cols, 0] >= 0)
+    return {t.name: float(w) for t, w in zip(tags, score)}
+
+
+def tag_strings(sample: pd.Series) -> List[str]:
+    """Tags fully matching a majority of ``sample`` (non-null values already converted to str)."""
+    need = MAJORITY * len(sample)
+    return [name for name, w in tag_counts(sample, need).items() if w >= need]
@@ -3,6 +3,7 @@ import re
 import pandas as pd
 from typing import List, Dict, Any
 from app.schemas.merge import TransformOp
+from app.utils.normalize import parse_dates
 
 
 class TransformError(ValueError):
@@ -36,7 +37,7 @@ def validate_ops(ops: List[Dict[str, Any]]) -> List[TransformOp]:
         if name in {"to_int", "to_float", "to_datetime", "split", "regex_extract", "map_values"}:
             _require_args(raw, ["field"], i)
         if name == "to_datetime":
-            # fmt is optional; pandas can infer
+            # fmt is optional; it is probed from the values when absent
             pass
         if name == "concat":
             _require_args(raw, ["fields"], i)
@@ -68,7 +69,8 @@ def _apply_string_op_all(out: pd.DataFrame, func_name: str, field: str | None) -
 
 
 def apply_ops(df: pd.DataFrame, ops: List[TransformOp]) -> pd.DataFrame:
-    out = df.copy()
+    # ops assign whole columns, never write into existing arrays, so the input stays untouched
+    out = df.copy(deep=False)
     for op in ops:
         name = op.op
         args = op.args or {}
@@ -92,8 +94,10 @@ def apply_ops(df: pd.DataFrame, ops: List[TransformOp]) -> pd.DataFrame:
             col = args.get("field")
             if col not in out.columns:
                 raise TransformError("to_datetime.field missing/invalid")
+            # a given format (e.g. ColumnProfile.format) is applied strictly; otherwise one is
+            # probed on the column's values, with rows in other layouts parsed per value
             fmt = args.get("fmt")
-            out[col] = pd.to_datetime(out[col], errors="coerce", format=fmt)
+            out[col] = pd.to_datetime(out[col], errors="coerce", format=fmt) if fmt else parse_dates(out[col])
         elif name == "concat":
             fields = args.get("fields") or []
             sep = args.get("sep", " ")
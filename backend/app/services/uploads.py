@@ -0,0 +1,50 @@
+"""Spool uploads to disk in fixed-size chunks, hashing them on the way through."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import UploadFile
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    filename: str
+    size: int
+    sha256: str  # hex digest, without the "sha256:" prefix
+
+    def cleanup(self) -> None:
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+async def spool_upload(f: UploadFile, chunk_bytes: int | None = None) -> SpooledUpload:
+    """Copy an upload into a temp file; only one chunk is ever held in memory.
+
+    Parsers read the spooled path directly (columnar formats memory-map it). The caller
+    owns the file and must call ``cleanup()`` once parsing is done.
+    """
+    from ..core.config import settings as cfg_settings
+    step = max(1, int(chunk_bytes or cfg_settings.upload_chunk_bytes))
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=".spool", dir=cfg_settings.upload_spool_dir or None)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await f.read(step)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledUpload(path=path, filename=f.filename or "", size=size, sha256=digest.hexdigest())
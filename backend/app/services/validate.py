@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 import numpy as np
 import pandas as pd
 
 from ..schemas.validate import ValidateResponse, ValidationViolation, ValidateSummary
 from ..core.config import settings
+from ..utils.normalize import parse_dates
+from .sketches import TDigest, _hashes, _numeric, sketch_kind
 
 
 def _violation(rule: str, count: int, sample: List[int], severity: str = "error") -> ValidationViolation:
@@ -75,11 +77,15 @@ def _range_num(df: pd.DataFrame, field: str, min_val=None, max_val=None) -> Vali
     return None
 
 
+def _to_datetime(s: pd.Series) -> pd.Series:
+    # text columns are parsed with the format probed on their values; other layouts per value
+    return parse_dates(s)
+
+
 def _date_order(df: pd.DataFrame, start: str, end: str) -> ValidationViolation | None:
     if start not in df.columns or end not in df.columns:
         return _violation(f"date_order({start}<={end})", count=len(df), sample=list(range(min(5, len(df)))))
-    s = pd.to_datetime(df[start], errors="coerce")
-    e = pd.to_datetime(df[end], errors="coerce")
+    s, e = _to_datetime(df[start]), _to_datetime(df[end])
     mask = s > e
     cnt = int(mask.fillna(False).sum())
     if cnt:
@@ -126,7 +132,7 @@ def _fk(child_df: pd.DataFrame, child_field: str, parent_df: pd.DataFrame, paren
     return None
 
 
-def run_validation(df: pd.DataFrame, contract_name: str, aux_tables: Dict[str, pd.DataFrame] | None = None) -> ValidateResponse:
+def _contract_rules(contract_name: str, columns: List[str], aux_tables: Dict[str, pd.DataFrame] | None = None) -> list:
     # Minimal contracts demo
     rules: list = []
     if contract_name == "customers":
@@ -141,7 +147,7 @@ def run_validation(df: pd.DataFrame, contract_name: str, aux_tables: Dict[str, p
             ("range_num", {"field": "balance", "min_val": 0}),
         ]
         # Optional FK to customers if provided
-        if aux_tables and "customers" in aux_tables and "customer_id" in df.columns:
+        if aux_tables and "customers" in aux_tables and "customer_id" in columns:
             rules.append(("fk", {"child_field": "customer_id", "parent_table": "customers", "parent_field": "customer_id"}))
     elif contract_name == "loans":
         rules = [
@@ -149,34 +155,226 @@ def run_validation(df: pd.DataFrame, contract_name: str, aux_tables: Dict[str, p
             ("date_order", {"start": "start_date", "end": "end_date"}),
             ("outliers", {"field": "amount", "method": "iqr"}),
         ]
+    return rules
+
+
+def _kw_fields(kw: dict) -> List[str]:
+    return [kw[k] for k in ("field", "start", "end", "child_field") if k in kw]
+
+
+def _check(name: str, kw: dict, df: pd.DataFrame, aux_tables: Dict[str, pd.DataFrame] | None) -> ValidationViolation | None:
+    if name == "not_null":
+        return _not_null(df, kw["field"])
+    if name == "unique":
+        return _unique(df, kw["field"])
+    if name == "regex":
+        return _regex(df, kw["field"], kw["pattern"])
+    if name == "enum":
+        return _enum(df, kw["field"], kw["values"])
+    if name == "range_num":
+        return _range_num(df, kw["field"], kw.get("min_val"), kw.get("max_val"))
+    if name == "date_order":
+        return _date_order(df, kw["start"], kw["end"])
+    if name == "outliers":
+        return _outliers(df, kw["field"], kw.get("method", "iqr"), kw.get("z", 3.0))
+    if name == "fk" and aux_tables is not None:
+        parent = aux_tables.get(kw.get("parent_table"))
+        if parent is not None:
+            return _fk(df, kw["child_field"], parent, kw["parent_field"])
+    return None
+
+
+def _result(violations: List[ValidationViolation], rows: int, columns: int) -> ValidateResponse:
+    status = "pass" if len([v for v in violations if v.severity == "error"]) == 0 else "fail"
+    summary = ValidateSummary(rows=int(rows), columns=int(columns), warnings=int(len([v for v in violations if v.severity == "warning"])) )
+    return ValidateResponse(status=status, violations=violations, summary=summary)
+
+
+def run_validation(df: pd.DataFrame, contract_name: str, aux_tables: Dict[str, pd.DataFrame] | None = None) -> ValidateResponse:
+    rules = _contract_rules(contract_name, list(df.columns), aux_tables)
 
     violations: List[ValidationViolation] = []
     for name, kw in rules:
-        v = None
-        if name == "not_null":
-            v = _not_null(df, kw["field"])  # type: ignore[index]
-        elif name == "unique":
-            v = _unique(df, kw["field"])  # type: ignore[index]
-        elif name == "regex":
-            v = _regex(df, kw["field"], kw["pattern"])  # type: ignore[index]
-        elif name == "enum":
-            v = _enum(df, kw["field"], kw["values"])  # type: ignore[index]
-        elif name == "range_num":
-            v = _range_num(df, kw["field"], kw.get("min_val"), kw.get("max_val"))  # type: ignore[index]
-        elif name == "date_order":
-            v = _date_order(df, kw["start"], kw["end"])  # type: ignore[index]
-        elif name == "outliers":
-            v = _outliers(df, kw["field"], kw.get("method", "iqr"), kw.get("z", 3.0))  # type: ignore[index]
-        elif name == "fk":
-            if aux_tables is not None:
-                parent = aux_tables.get(kw.get("parent_table"))  # type: ignore[index]
-                if parent is not None:
-                    v = _fk(df, kw["child_field"], parent, kw["parent_field"])  # type: ignore[index]
+        v = _check(name, kw, df, aux_tables)
         if v:
             violations.append(v)
+    return _result(violations, len(df), df.shape[1])
 
-    status = "pass" if len([v for v in violations if v.severity == "error"]) == 0 else "fail"
-    summary = ValidateSummary(rows=int(len(df)), columns=int(df.shape[1]), warnings=int(len([v for v in violations if v.severity == "warning"])) )
-    return ValidateResponse(status=status, violations=violations, summary=summary)
 
+# hash standing for a null value: all nulls of a column count as one value, as in duplicated()
+_NULL_HASH = np.iinfo(np.uint64).max
+
+# extreme values kept per chunk and side for outliers(); counts are exact up to this many
+_OUTLIER_TAIL = 1000
+
+
+class _UniqueState:
+    """Cross-chunk state of unique(field): a 64-bit hash and the row index of every row."""
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.hashes: List[np.ndarray] = []
+        self.index: List[np.ndarray] = []
 
+    def add(self, chunk: pd.DataFrame) -> None:
+        s = chunk[self.field]
+        nulls = s.isna().to_numpy()
+        h = np.full(len(s), _NULL_HASH, dtype=np.uint64)
+        present = s[~nulls]
+        if len(present):
+            # hashed like the profile sketches: numbers by value, so 1 and 1.0 agree across
+            # chunks parsed to different dtypes; everything else as text
+            kind = sketch_kind(present.dtype)
+            h[~nulls] = _hashes(present.astype(str) if kind is None else present, _numeric(present, kind))
+        self.hashes.append(h)
+        self.index.append(chunk.index.to_numpy())
+
+    def violation(self) -> ValidationViolation | None:
+        if not self.hashes:
+            return None
+        h = np.concatenate(self.hashes)
+        _, inverse, counts = np.unique(h, return_inverse=True, return_counts=True)
+        dup = counts[inverse] > 1
+        cnt = int(dup.sum())
+        if not cnt:
+            return None
+        return _violation(f"unique({self.field})", cnt, np.concatenate(self.index)[dup][:10].tolist())
+
+
+class _OutlierState:
+    """Cross-chunk state of outliers(field): running moments, plus per chunk a t-digest and
+    its ``_OUTLIER_TAIL`` lowest and highest values with their row indexes.
+
+    Quartiles come from the merged digests. A chunk's outliers are counted on its kept
+    extremes, exactly unless all of one side's extremes are outliers; then the chunk's
+    digest estimates that side's count (and the sample holds the extremes, not the first rows).
+    """
+
+    def __init__(self, field: str, method: str = "iqr", z: float | None = 3.0) -> None:
+        self.field = field
+        self.method = method
+        self.z = z
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # per chunk: (digest, rows, all kept?, low values, low index, high values, high index)
+        self.chunks: List[tuple] = []
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        x = pd.to_numeric(chunk[self.field], errors="coerce").dropna()
+        if x.empty:
+            return
+        v = x.to_numpy(dtype=np.float64)
+        idx = x.index.to_numpy()
+        digest = TDigest()
+        digest.update(v)
+        # merge the chunk's mean and sum of squared deviations into the running ones
+        n, mean = len(v), float(v.mean())
+        total = self.n + n
+        delta = mean - self.mean
+        self.m2 += float(((v - mean) ** 2).sum()) + delta * delta * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+        if n <= _OUTLIER_TAIL:
+            self.chunks.append((digest, n, True, v, idx, v, idx))
+            return
+        low = np.argpartition(v, _OUTLIER_TAIL - 1)[:_OUTLIER_TAIL]
+        high = np.argpartition(v, n - _OUTLIER_TAIL)[n - _OUTLIER_TAIL:]
+        self.chunks.append((digest, n, False, v[low], idx[low], v[high], idx[high]))
+
+    def _bounds(self) -> tuple | None:
+        if self.method == "iqr":
+            digest = TDigest()
+            for c in self.chunks:
+                digest.merge(c[0])
+            q1, q3 = digest.quantile(0.25), digest.quantile(0.75)
+            k = settings.outlier_iqr_k
+            return q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+        sd = (self.m2 / self.n) ** 0.5
+        if sd == 0:
+            return None
+        zthr = settings.outlier_z if self.z is None else self.z
+        return self.mean - zthr * sd, self.mean + zthr * sd
+
+    def violation(self) -> ValidationViolation | None:
+        bounds = self._bounds() if self.n else None
+        if bounds is None:
+            return None
+        lo, hi = bounds
+        cnt = 0
+        sample: List[int] = []
+        for digest, n, whole, low_v, low_i, high_v, high_i in self.chunks:
+            if whole:
+                hit = (low_v < lo) | (low_v > hi)
+                cnt += int(hit.sum())
+                sample.extend(low_i[hit].tolist())
+                continue
+            below, above = low_v < lo, high_v > hi
+            n_below, n_above = int(below.sum()), int(above.sum())
+            # every kept extreme is an outlier: count the digest's centroids past the bound
+            if n_below == _OUTLIER_TAIL:
+                n_below = max(n_below, int(digest.weights[digest.means < lo].sum()))
+            if n_above == _OUTLIER_TAIL:
+                n_above = max(n_above, int(digest.weights[digest.means > hi].sum()))
+            cnt += n_below + n_above
+            sample.extend(low_i[below].tolist() + high_i[above].tolist())
+        if not cnt:
+            return None
+        return _violation(f"outliers({self.field},{self.method})", cnt, sorted(sample)[:10], severity="warning")
+
+
+def run_validation_chunks(chunks: Iterable[pd.DataFrame], contract_name: str, aux_tables: Dict[str, pd.DataFrame] | None = None) -> ValidateResponse:
+    """Validate a chunked table one chunk at a time, with the same result as run_validation.
+
+    Row-local rules are checked per chunk and their counts and samples added up. Only
+    cross-row rules keep state: unique() keeps a hash per row and finds the duplicates once
+    at the end, outliers() keeps small per-chunk summaries (see _OutlierState; its
+    quartiles are t-digest estimates, so on large tables its result can differ slightly).
+    Rules on columns missing from the table are reported from the total row count. Row
+    indexes must continue across chunks (as ingest.load_table_chunks yields them) so
+    violation samples point at the original rows.
+    """
+    rules: list = []
+    columns: List[str] | None = None
+    found: List[ValidationViolation | None] = []
+    present: List[bool] = []
+    states: Dict[int, _UniqueState | _OutlierState] = {}
+    rows = 0
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            rules = _contract_rules(contract_name, columns, aux_tables)
+            found = [None] * len(rules)
+            # rules on absent columns are reported once the row count is known
+            present = [all(f in columns for f in _kw_fields(kw)) for _, kw in rules]
+            for i, (name, kw) in enumerate(rules):
+                if not present[i]:
+                    continue
+                if name == "unique":
+                    states[i] = _UniqueState(kw["field"])
+                elif name == "outliers":
+                    states[i] = _OutlierState(kw["field"], kw.get("method", "iqr"), kw.get("z", 3.0))
+        rows += len(chunk)
+        for i, (name, kw) in enumerate(rules):
+            state = states.get(i)
+            if state is not None:
+                state.add(chunk)
+            elif present[i]:
+                v = _check(name, kw, chunk, aux_tables)
+                acc = found[i]
+                if v is not None:
+                    found[i] = v if acc is None else _violation(acc.rule, acc.count + v.count, (acc.sample + v.sample)[:10], acc.severity)
+    # rules on absent columns only need the row count: check them against an empty frame of that length
+    blank = pd.DataFrame(index=pd.RangeIndex(rows))
+    violations: List[ValidationViolation] = []
+    for i, (name, kw) in enumerate(rules):
+        state = states.get(i)
+        if state is not None:
+            v = state.violation()
+        elif not present[i]:
+            v = _check(name, kw, blank, aux_tables)
+        else:
+            v = found[i]
+        if v:
+            violations.append(v)
+    return _result(violations, rows, len(columns or []))
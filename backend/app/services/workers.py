@@ -0,0 +1,69 @@
+"""Shared worker-process pool for parallel ingest (workbook sheets, files posted together).
+
+One pool is created lazily on first use and reused across requests; ``shutdown_pool`` is
+called on app shutdown. Workers start through the forkserver context where available
+(else spawn), never by forking the threaded server process. Each task carries a copy of
+the current settings, so workers honor values changed after the pool started.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+_LOCK = threading.Lock()
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    if ctx.get_start_method() == "forkserver":
+        ctx.set_forkserver_preload(["pandas", "app.services.profile"])
+    return ctx
+
+
+def _run(settings: Any, fn: Callable[..., Any], args: tuple) -> Any:
+    # runs in the worker: services read ``config.settings`` at call time, so swapping in
+    # the caller's instance is enough for the task to see the caller's values
+    from app.core import config
+    config.settings = settings
+    return fn(*args)
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared pool, (re)created with at least ``workers`` processes."""
+    global _POOL, _POOL_SIZE
+    with _LOCK:
+        if _POOL is None or _POOL_SIZE < workers:
+            if _POOL is not None:
+                # queued work still finishes; new tasks go to the bigger pool
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=_context())
+            _POOL_SIZE = workers
+        return _POOL
+
+
+def submit(workers: int, fn: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fn(*args)`` in the shared pool under the current settings."""
+    from app.core.config import settings as cfg_settings
+    return get_pool(workers).submit(_run, cfg_settings, fn, args)
+
+
+def source_size(content: Any) -> int:
+    """Byte size of an upload given as bytes or a spooled path."""
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return len(content)
+    return os.path.getsize(content)
+
+
+def shutdown_pool() -> None:
+    global _POOL, _POOL_SIZE
+    with _LOCK:
+        pool, _POOL, _POOL_SIZE = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 from typing import Any
-from ..utils.normalize import norm_string, norm_number, norm_date
+from ..utils.normalize import detect_date_format, norm_string, norm_number, norm_date
 import datetime as _dt
 
 
-def _norm_value(v: Any) -> Any:
+def _norm_value(v: Any, date_fmt: str | None = None) -> Any:
     if v is None:
         return None
     # try number
     n = norm_number(v)
     if n is not None:
         return n
-    d = norm_date(v)
+    d = norm_date(v, date_fmt)
     if d is not None:
         return d
     s = norm_string(v)
@@ -68,12 +68,17 @@ async def compare(a: dict, b: dict, options: dict | None = None) -> dict:
     by_col_counts: dict[str, int] = {c: 0 for c in common}
     total_cells = n * max(1, len(common))
     diff_cells = 0
+    # date format per column, probed once on the compared rows instead of per value
+    fmts = {
+        c: (detect_date_format(r.get(c) for r in rows_a[:n]), detect_date_format(r.get(c) for r in rows_b[:n]))
+        for c in common
+    }
     for i in range(n):
         ra = rows_a[i]
         rb = rows_b[i]
         for c in common:
-            va = _norm_value(ra.get(c))
-            vb = _norm_value(rb.get(c))
+            va = _norm_value(ra.get(c), fmts[c][0])
+            vb = _norm_value(rb.get(c), fmts[c][1])
             if va != vb:
                 diff_cells += 1
                 by_col_counts[c] += 1
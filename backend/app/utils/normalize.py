@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import datetime as _dt
 import re
-from typing import Any, Literal
+from typing import Any, Iterable, Literal, Optional, Tuple
+
+import pandas as pd  # type: ignore
 
 
 _SPACE_RE = re.compile(r"\s+")
@@ -14,6 +16,25 @@ _DATE_PATTERNS = [
     "%d/%m/%Y",
     "%Y/%m/%d",
 ]
+# probed in order (ties keep the earlier format); all strptime-compatible so norm_date can reuse them
+DATE_FORMATS = _DATE_PATTERNS + [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%d.%m.%Y",
+    "%Y%m%d",
+]
+# number layouts: label -> (full-match shape, characters to drop, decimal separator)
+NUMBER_FORMATS = {
+    "plain": (r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?", "", "."),
+    "thousands_comma": (r"[+-]?\d{1,3}(?:,\d{3})*(?:\.\d+)?", ",", "."),
+    "decimal_comma": (r"[+-]?\d{1,3}(?:\.\d{3})*,\d+", ".", ","),
+    "currency": (r"[+-]?[$€£]\s?[+-]?\d{1,3}(?:,?\d{3})*(?:\.\d+)?", "$€£, ", "."),
+}
+# share of non-null sample values a format must parse to be adopted for the column
+FORMAT_MIN_SHARE = 0.95
+# dates and numbers in any of the formats above only use these characters
+_FORMAT_CHARS = r"[\d\s\-/.:,+$€£TZeE]+"
 
 
 def norm_string(s: Any) -> str | None:
@@ -49,7 +70,8 @@ def norm_number(v: Any) -> float | None:
         return None
 
 
-def norm_date(v: Any) -> str | None:
+def norm_date(v: Any, fmt: str | None = None) -> str | None:
+    """ISO date of ``v``; a known column ``fmt`` (see detect_date_format) is tried first."""
     if v is None:
         return None
     if isinstance(v, (_dt.date, _dt.datetime)):
@@ -57,6 +79,11 @@ def norm_date(v: Any) -> str | None:
     s = str(v).strip()
     if s == "":
         return None
+    if fmt:
+        try:
+            return _dt.datetime.strptime(s, fmt).date().isoformat()
+        except ValueError:
+            pass
     for fmt in _DATE_PATTERNS:
         try:
             dt = _dt.datetime.strptime(s, fmt)
@@ -73,6 +100,102 @@ def norm_date(v: Any) -> str | None:
     return None
 
 
+def _probe_values(values: Iterable[Any], k: int = 200) -> pd.Series:
+    s = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    return s.dropna().head(k).astype(str).str.strip()
+
+
+def _shaped(s: pd.Series, min_share: float) -> bool:
+    # cheap prefilter: most values must be made of digits and separators only
+    return bool(len(s)) and s.str.fullmatch(_FORMAT_CHARS).mean() >= min_share
+
+
+def _date_format(s: pd.Series, min_share: float) -> Optional[str]:
+    best, best_share = None, min_share
+    for fmt in DATE_FORMATS:
+        share = float(pd.to_datetime(s, format=fmt, errors="coerce").notna().mean())
+        if share > best_share or (best is None and share >= best_share):
+            best, best_share = fmt, share
+            if share == 1.0:
+                break
+    return best
+
+
+def _number_format(s: pd.Series, min_share: float) -> Optional[str]:
+    for fmt, (shape, _, _) in NUMBER_FORMATS.items():
+        if s.str.fullmatch(shape).mean() >= min_share:
+            return fmt
+    return None
+
+
+def detect_date_format(values: Iterable[Any], min_share: float = FORMAT_MIN_SHARE) -> Optional[str]:
+    """The DATE_FORMATS entry parsing the most of ``values`` (at least ``min_share``), probed vectorized."""
+    s = _probe_values(values)
+    return _date_format(s, min_share) if _shaped(s, min_share) else None
+
+
+def detect_number_format(values: Iterable[Any], min_share: float = FORMAT_MIN_SHARE) -> Optional[str]:
+    """The NUMBER_FORMATS label whose shape fully matches at least ``min_share`` of ``values``."""
+    s = _probe_values(values)
+    return _number_format(s, min_share) if _shaped(s, min_share) else None
+
+
+def parse_numbers(values: pd.Series, fmt: str) -> pd.Series:
+    """Vectorized float parse of a string column in a NUMBER_FORMATS layout (unparseable -> NaN)."""
+    _, drop, decimal = NUMBER_FORMATS[fmt]
+    s = values.astype(str).str.strip()
+    if drop:
+        s = s.str.replace(f"[{re.escape(drop)}]", "", regex=True)
+    if decimal != ".":
+        s = s.str.replace(decimal, ".", regex=False)
+    return pd.to_numeric(s, errors="coerce")
+
+
+def parse_dates(values: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """Vectorized datetime parse of a column (unparseable -> NaT).
+
+    Text is parsed with ``fmt`` or the probed DATE_FORMATS entry; rows that format leaves
+    unparsed, or every row when no format dominates, are parsed with ``format="mixed"``.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, errors="coerce")
+    fmt = fmt or detect_date_format(values)
+    if fmt is None:
+        return pd.to_datetime(values, errors="coerce", format="mixed")
+    out = pd.to_datetime(values, errors="coerce", format=fmt)
+    retry = out.isna() & values.notna()
+    if retry.any():
+        try:
+            out[retry] = pd.to_datetime(values[retry], errors="coerce", format="mixed")
+        except (TypeError, ValueError):
+            pass  # e.g. timezone-aware stragglers in a naive column stay NaT
+    return out
+
+
+def infer_format(values: Iterable[Any], min_share: float = FORMAT_MIN_SHARE) -> Tuple[Optional[str], Optional[str]]:
+    """``(inferred_type, format)`` for text values: ("integer"|"number", NUMBER_FORMATS label),
+    ("date"|"datetime", strptime format) or (None, None). Digit-only text counts as a number,
+    except fixed-width 8-digit values that parse as YYYYMMDD dates, and columns with
+    leading-zero digit strings (account numbers, codes), which stay text."""
+    s = _probe_values(values)
+    if not _shaped(s, min_share):
+        return None, None
+    if s.str.fullmatch(r"0\d+").any():
+        return None, None
+    if s.str.fullmatch(r"\d{8}").mean() >= min_share:
+        fmt = _date_format(s, min_share)
+        if fmt is not None:
+            return "date", fmt
+    fmt = _number_format(s, min_share)
+    if fmt is not None:
+        integral = fmt == "plain" and not s.str.contains(r"[.eE]").any()
+        return ("integer" if integral else "number"), fmt
+    fmt = _date_format(s, min_share)
+    if fmt is not None:
+        return ("datetime" if "%H" in fmt else "date"), fmt
+    return None, None
+
+
 def infer_type(v: Any) -> Literal["string", "number", "boolean", "date", "unknown"]:
     if v is None:
         return "unknown"
@@ -1,10 +1,44 @@
+import dataclasses
 import os
 import sys
 
+import pytest
+
 # Ensure the backend root (containing the `app` package) is importable
 HERE = os.path.dirname(__file__)
 BACKEND_ROOT = os.path.abspath(os.path.join(HERE, ".."))
 if BACKEND_ROOT not in sys.path:
     sys.path.insert(0, BACKEND_ROOT)
 
+# modules that bind ``settings`` at import time and so need the override as well
+_SETTINGS_MODULES = (
+    "app.api.routes",
+    "app.core.security",
+    "app.main",
+    "app.services.datasets",
+    "app.services.db",
+    "app.services.drift",
+    "app.services.match",
+    "app.services.storage",
+    "app.services.table_cache",
+    "app.services.table_pairing",
+    "app.services.validate",
+)
+
+
+@pytest.fixture
+def override_settings(monkeypatch):
+    """Swap in a copy of the settings with some fields changed, for one test:
+    ``override_settings(sample_method="head", sample_seed=1)``.
+    """
+    from app.core import config
+
+    def apply(**values):
+        patched = dataclasses.replace(config.settings, **values)
+        monkeypatch.setattr(config, "settings", patched)
+        for name in _SETTINGS_MODULES:
+            module = sys.modules.get(name)
+            if module is not None and hasattr(module, "settings"):
+                monkeypatch.setattr(module, "settings", patched)
 
+    return apply
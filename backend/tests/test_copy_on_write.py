@@ -0,0 +1,49 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+from app.schemas.merge import MappingDecision, TransformOp
+from app.services.ingest import normalize_headers
+from app.services.merge import merge_datasets, er_lite_customers
+from app.services.transform_dsl import apply_ops
+
+
+def _frames(n: int = 1_000_000) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    left = pd.DataFrame({"id": np.arange(n), "amount": rng.random(n), "balance": rng.random(n), "score": rng.random(n)})
+    right = pd.DataFrame({"cust_id": np.arange(n), "amount": rng.random(n), "balance": rng.random(n), "score": rng.random(n)})
+    return left, right
+
+
+def _merge_peak(cow: bool) -> int:
+    left, right = _frames()
+    decisions = [MappingDecision(left_table="l", right_table="r", left_column="id", right_column="cust_id", decision="accept", confidence=1.0)]
+    with pd.option_context("mode.copy_on_write", cow):
+        tracemalloc.start()
+        try:
+            merged = merge_datasets({"left": left, "right": right}, decisions, lineage_meta={})
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    assert merged.shape == (2_000_000, 8)
+    return peak
+
+
+def test_merge_peak_memory_drops_under_copy_on_write():
+    eager = _merge_peak(False)
+    lazy = _merge_peak(True)
+    # the aligned per-side copies (~32 MB each) are never materialized
+    assert lazy < eager * 0.8
+
+
+def test_services_leave_inputs_untouched():
+    with pd.option_context("mode.copy_on_write", True):
+        df = pd.DataFrame({"Customer ID": ["c1", "c1"], "Email": [" A@B.COM ", " A@B.COM "]})
+        snapshot = df.copy()
+        norm = normalize_headers(df)
+        out = apply_ops(norm, [TransformOp(op="strip"), TransformOp(op="to_int", args={"field": "customer_id"})])
+        dedup, _ = er_lite_customers(norm)
+        pd.testing.assert_frame_equal(df, snapshot)
+        assert list(norm.columns) == ["customer_id", "email"]
+        assert "original_columns" not in df.attrs
+        assert norm["email"].iloc[0] == " A@B.COM " and out["email"].iloc[0] == "A@B.COM"
+        assert len(dedup) == 1
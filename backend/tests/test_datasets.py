@@ -0,0 +1,59 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def _csv(name: str, s: str) -> tuple[str, tuple[str, bytes, str]]:
+    return ("files", (name, s.encode("utf-8"), "text/csv"))
+
+
+def _register(*files) -> list[dict]:
+    r = client.post("/api/v1/datasets", files=list(files))
+    assert r.status_code == 200
+    return r.json()["datasets"]
+
+
+def test_register_and_get_dataset():
+    ds = _register(_csv("left.csv", "Customer ID,Email\n1,a@b.com\n2,b@b.com\n"))
+    assert len(ds) == 1
+    info = ds[0]
+    assert info["rows"] == 2
+    assert info["columns"] == ["customer_id", "email"]
+    assert info["sha256"].startswith("sha256:")
+    r = client.get(f"/api/v1/datasets/{info['dataset_id']}")
+    assert r.status_code == 200
+    assert r.json()["name"] == "left.csv"
+
+
+def test_profile_match_merge_accept_dataset_ids():
+    left, right = _register(
+        _csv("left.csv", "id,email\n1,a@b.com\n2,b@b.com\n"),
+        _csv("right.csv", "identifier,e_mail\n1,a@b.com\n3,c@d.com\n"),
+    )
+    ids = [left["dataset_id"], right["dataset_id"]]
+
+    p = client.post("/api/v1/profile", data={"dataset_ids": ids})
+    assert p.status_code == 200
+    assert set(p.json()["profiles"].keys()) == {"left.csv", "right.csv"}
+
+    m = client.post("/api/v1/match", data={"dataset_ids": ids})
+    assert m.status_code == 200
+    assert len(m.json()["candidates"]) == 4
+
+    decisions = [{"left_table": "left", "left_column": "id", "right_table": "right", "right_column": "identifier", "decision": "auto", "confidence": 0.9}]
+    mg = client.post("/api/v1/merge", data={"dataset_ids": ids, "decisions": json.dumps(decisions)})
+    assert mg.status_code == 200
+    assert "identifier" not in mg.json()["columns"]
+    assert len(mg.json()["preview_rows"]) == 4
+
+
+def test_unknown_dataset_id_and_delete():
+    r = client.post("/api/v1/profile", data={"dataset_ids": ["nope"]})
+    assert r.status_code == 404
+    (info,) = _register(_csv("t.csv", "a\n1\n"))
+    d = client.delete(f"/api/v1/datasets/{info['dataset_id']}")
+    assert d.status_code == 200
+    assert client.get(f"/api/v1/datasets/{info['dataset_id']}").status_code == 404
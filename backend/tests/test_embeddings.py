@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core import config
+from app.services import embeddings
+
+
+class _FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, headers, normalize_embeddings=True):
+        self.encoded.append(list(headers))
+        rows = [[float(len(h)), 1.0, float(h.count("_")), 0.5] for h in headers]
+        return np.array([np.array(r) / np.linalg.norm(r) for r in rows])
+
+
+@pytest.fixture
+def fake_model(monkeypatch, tmp_path, override_settings):
+    loads = []
+
+    def load(name):
+        loads.append(name)
+        return _FakeModel()
+
+    monkeypatch.setattr(embeddings, "_load_model", load)
+    override_settings(embeddings_enabled=True, embeddings_cache_path=str(tmp_path / "emb.jsonl"))
+    embeddings.reset()
+    yield loads
+    embeddings.reset()
+
+
+def test_model_loaded_once_and_headers_cached_on_disk(fake_model):
+    first = embeddings.embed_headers(["customer_id", "email"])
+    again = embeddings.embed_headers(["email", "iban", "customer_id"])
+    assert fake_model == [config.settings.embeddings_model]
+    model = embeddings.get_model()
+    assert model.encoded == [["customer_id", "email"], ["iban"]]
+    assert again[0] == first[1] and again[2] == first[0]
+    # a fresh process reads the vectors back instead of encoding them
+    embeddings.reset()
+    assert embeddings.embed_headers(["customer_id", "iban"]) == [first[0], again[1]]
+    assert embeddings.get_model().encoded == []
+
+
+def test_unavailable_model_falls_back_to_zero_vectors(monkeypatch, fake_model):
+    def fail(name):
+        raise ImportError("offline")
+
+    monkeypatch.setattr(embeddings, "_load_model", fail)
+    assert embeddings.embed_headers(["a", "b"]) == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    assert embeddings.get_model() is None
+
+
+def test_match_uses_shared_embeddings(fake_model):
+    from app.services import match
+
+    left = pd.DataFrame({"cust_id": [1, 2]})
+    right = pd.DataFrame({"customer_id": [1, 2], "x": [3, 4]})
+    for _ in range(3):
+        out = match.suggest_mappings(left, right, sample_n=10, threshold=0.0)
+    assert len(fake_model) == 1
+    assert all(r["scores"]["embedding"] > 0 for r in out)
+
+
+def test_cache_rows_of_other_models_are_skipped(fake_model, override_settings):
+    embeddings.embed_headers(["customer_id"])
+    old = config.settings.embeddings_model
+    override_settings(embeddings_model="other-model")
+    # the other model cannot load: its zero vectors do not take the first model's dimension
+    embeddings._MODELS["other-model"] = None
+    assert embeddings.embed_headers(["customer_id"]) == [[0.0] * embeddings._FALLBACK_DIM]
+    with open(config.settings.embeddings_cache_path) as fh:
+        assert all('"model": "%s"' % old in line for line in fh)
+
+
+def test_model_load_does_not_block_cached_lookups(monkeypatch, fake_model):
+    free = []
+
+    def load(name):
+        free.append(embeddings._LOCK.acquire(blocking=False))
+        embeddings._LOCK.release()
+        return _FakeModel()
+
+    monkeypatch.setattr(embeddings, "_load_model", load)
+    embeddings.get_model()
+    assert free == [True]
+
+
+def test_relative_cache_path_lives_under_backend():
+    backend = Path(embeddings.__file__).resolve().parents[2]
+    assert embeddings.cache_path("emb.jsonl") == str(backend / "emb.jsonl")
+    assert embeddings.cache_path("") == ""
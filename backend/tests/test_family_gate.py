@@ -10,3 +10,35 @@ def test_family_gate_caps_cross_domain(monkeypatch):
     cand = next(c for c in out if c["left_column"]=="accountid" and c["right_column"]=="country")
     assert cand["confidence"] <= 0.49
     assert "Cross-family pair" in cand["warnings"]
+
+
+def test_blocking_shortlists_compatible_families_and_similar_headers():
+    left = pd.DataFrame({"customer_id": ["C1", "C2"], "email": ["a@x.io", "b@x.io"], "amount": ["10.50", "3.00"]})
+    right = pd.DataFrame({
+        "cust_id": ["C1", "C9"],
+        "country": ["US", "CA"],
+        "city": ["Oslo", "Rome"],
+        "e_mail": ["a@x.io", "z@x.io"],
+        "amt": [10.5, 3.0],
+    })
+    full = suggest_mappings(left, right, sample_n=10, threshold=0.0)
+    blocked = suggest_mappings(left, right, sample_n=10, threshold=0.0, blocking=True)
+    pairs = {(c["left_column"], c["right_column"]) for c in blocked}
+    assert len(full) == 15 and len(blocked) < 15
+    assert ("customer_id", "cust_id") in pairs and ("email", "e_mail") in pairs
+    # similar headers meet whatever their dtypes: text amount vs float amt
+    assert ("amount", "amt") in pairs
+    assert not any(r == "city" for _, r in pairs)
+    # shortlisted pairs keep exactly the scores of the unblocked run
+    by_pair = {(c["left_column"], c["right_column"]): c for c in full}
+    assert all(c == by_pair[(c["left_column"], c["right_column"])] for c in blocked)
+
+
+def test_top_k_keeps_best_candidates_per_left_column():
+    left = pd.DataFrame({"customer_id": ["C1"], "amount": [1.0]})
+    right = pd.DataFrame({c: ["C1"] for c in ["cust_id", "customer_no", "client", "zz", "yy"]})
+    full = suggest_mappings(left, right, sample_n=10, threshold=0.0)
+    top = suggest_mappings(left, right, sample_n=10, threshold=0.0, top_k=2)
+    assert len(top) == 4
+    for col in ("customer_id", "amount"):
+        assert [c for c in top if c["left_column"] == col] == [c for c in full if c["left_column"] == col][:2]
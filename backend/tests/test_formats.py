@@ -0,0 +1,49 @@
+import pandas as pd
+
+from app.services.profile import profile_table
+from app.services.transform_dsl import apply_ops, validate_ops
+from app.services.validate import _date_order
+from app.utils.normalize import detect_date_format, infer_format, norm_date, parse_numbers
+
+
+def test_infer_format_for_text_numbers_and_dates():
+    assert infer_format(["12", "7", "-3"]) == ("integer", "plain")
+    assert infer_format(["1,234.50", "12.00"]) == ("number", "thousands_comma")
+    assert infer_format(["1.234,5", "2,75"]) == ("number", "decimal_comma")
+    assert infer_format(["$1,200.00", "$3"]) == ("number", "currency")
+    # a day above 12 settles day-first vs month-first
+    assert infer_format(["05/01/2021", "31/12/2021"]) == ("date", "%d/%m/%Y")
+    assert infer_format(["2021-01-05 10:00:00"]) == ("datetime", "%Y-%m-%d %H:%M:%S")
+    assert infer_format(["u1@bank.ca", "u2@bank.ca"]) == (None, None)
+    # fixed-width 8 digits are dates when they parse as such, else still numbers
+    assert infer_format(["20240131", "20231201"]) == ("date", "%Y%m%d")
+    assert infer_format(["20241399", "12345678"]) == ("integer", "plain")
+    # leading zeros mark codes: parsing them as numbers would lose the zeros
+    assert infer_format(["00123", "45678"]) == (None, None)
+    assert infer_format(["0", "10", "0.5"]) == ("number", "plain")
+    assert parse_numbers(pd.Series(["1.234,5", "x"]), "decimal_comma").tolist()[0] == 1234.5
+
+
+def test_profile_exposes_inferred_type_and_format():
+    df = pd.DataFrame({
+        "opened": ["13/01/2020", "02/02/2021", None],
+        "balance": ["1,000.00", "25.10", "3.00"],
+        "name": ["a", "b", "c"],
+        "n": [1, 2, 3],
+    })
+    cols = {c.name: c for c in profile_table(df, "t", sample_n=10).columns_profile}
+    assert cols["opened"].dtype == "string"
+    assert (cols["opened"].inferred_type, cols["opened"].format) == ("date", "%d/%m/%Y")
+    assert (cols["balance"].inferred_type, cols["balance"].format) == ("number", "thousands_comma")
+    assert cols["name"].format is None and cols["n"].inferred_type is None
+
+
+def test_conversions_use_the_probed_format():
+    df = pd.DataFrame({"start": ["02/03/2021", "20/03/2021"], "end": ["01/04/2021", "15/03/2021"]})
+    assert detect_date_format(df["start"]) == "%d/%m/%Y"
+    out = apply_ops(df, validate_ops([{"op": "to_datetime", "args": {"field": "start"}}]))
+    assert out["start"].dt.month.tolist() == [3, 3]
+    v = _date_order(df, "start", "end")
+    assert v is not None and v.count == 1 and v.sample == [1]
+    assert norm_date("02/03/2021", "%d/%m/%Y") == "2021-03-02"
+    assert norm_date("02/03/2021") == "2021-02-03"
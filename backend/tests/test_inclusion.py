@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.inclusion import discover_foreign_keys, estimate_containment, key_bloom
+from app.services.profile import profile_table
+from app.services.sketches import ColumnSketch
+
+
+def _catalog():
+    rng = np.random.default_rng(11)
+    customers = pd.DataFrame({"customer_id": np.arange(1, 5001), "segment": rng.choice(["retail", "sme"], 5000)})
+    accounts = pd.DataFrame({
+        "account_id": np.arange(100000, 112000),
+        "customer_id": rng.integers(1, 5001, 12000),
+        # overlaps the customer id range only partly
+        "branch_code": rng.integers(4000, 9000, 12000),
+    })
+    txns = pd.DataFrame({"account_id": rng.choice(accounts["account_id"], 30000), "amount": rng.random(30000)})
+    return {"customers": customers, "accounts": accounts, "txns": txns}
+
+
+def test_containment_estimates_from_minhash_and_bloom():
+    parent = ColumnSketch("numeric", minhash_k=128).update(pd.Series(np.arange(100000)))
+    inside = ColumnSketch("numeric", minhash_k=128).update(pd.Series(np.arange(0, 100000, 7)))
+    half = ColumnSketch("numeric", minhash_k=128).update(pd.Series(np.arange(50000, 150000)))
+    # comparable sizes: the bottom-k signatures alone are enough
+    assert abs(half.minhash.containment_in(parent.minhash) - 0.5) < 0.15
+    bloom = key_bloom(pd.Series(np.arange(100000)))
+    assert estimate_containment(inside, parent, bloom) > 0.97
+    assert abs(estimate_containment(half, parent, bloom) - 0.5) < 0.15
+
+
+def test_profiles_carry_no_bloom_filters():
+    prof = profile_table(_catalog()["customers"], "customers", sample_n=500, sketches=True)
+    assert "bloom" not in str(prof.model_dump())
+
+
+def test_discovers_and_verifies_foreign_keys():
+    frames = _catalog()
+    profiles = {name: profile_table(df, name, sample_n=500, sketches=True) for name, df in frames.items()}
+    found = discover_foreign_keys(profiles, frames, min_containment=0.95)
+    pairs = {(r["child_table"], r["child_column"], r["parent_table"], r["parent_column"]) for r in found}
+    assert ("accounts", "customer_id", "customers", "customer_id") in pairs
+    assert ("txns", "account_id", "accounts", "account_id") in pairs
+    assert not any(r["child_column"] == "branch_code" for r in found)
+    assert all(r["verified"] and r["containment"] >= 0.95 for r in found)
+    # without frames the estimates are returned unverified
+    assert all(not r["verified"] for r in discover_foreign_keys(profiles))
+
+
+def test_fk_discover_endpoint(monkeypatch):
+    from app.api import routes
+    client = TestClient(app)
+    ids = []
+    for name, df in _catalog().items():
+        r = client.post("/api/v1/datasets", files=[("files", (f"{name}.csv", df.to_csv(index=False).encode(), "text/csv"))])
+        ids.append(r.json()["datasets"][0]["dataset_id"])
+    body = client.post("/api/v1/fk/discover", json={"dataset_ids": ids}).json()
+    refs = {(r["child_table"], r["child_column"], r["parent_table"]) for r in body["candidates"]}
+    assert ("accounts.csv", "customer_id", "customers.csv") in refs
+    # the sketched profiles are cached: a second call does not profile again
+    monkeypatch.setattr(routes, "profile_table", None)
+    assert client.post("/api/v1/fk/discover", json={"dataset_ids": ids}).json() == body
+    assert client.post("/api/v1/fk/discover", json={"dataset_ids": ids[:1]}).status_code == 422
+    assert client.post("/api/v1/fk/discover", json={"dataset_ids": ids, "min_containment": "high"}).status_code == 422
+    assert client.post("/api/v1/fk/discover", json={"dataset_ids": ids, "verify_top": -1}).status_code == 422
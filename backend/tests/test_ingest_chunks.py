@@ -0,0 +1,111 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from app.main import app
+from app.schemas.merge import MappingDecision
+from app.services.ingest import load_table, load_table_chunks
+from app.services.merge import merge_datasets, iter_merge_chunks
+from app.services.profile import profile_table_chunks
+from app.services.validate import run_validation, run_validation_chunks
+
+
+def _rows_csv(n: int, sep: str = ",") -> bytes:
+    lines = [sep.join(["customer_id", "email", "city"])]
+    for i in range(n):
+        lines.append(sep.join([f"C{i % (n - 1)}", f"u{i}@b.com" if i % 7 else "", "Montréal"]))
+    return ("\n".join(lines) + "\n").encode("latin-1")
+
+
+def test_chunks_cover_all_rows_with_continuous_index():
+    content = _rows_csv(25)
+    chunks = list(load_table_chunks(content, "t.csv", chunksize=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    whole = pd.concat(chunks)
+    assert list(whole.index) == list(range(25))
+    # latin-1 bytes decode the same way as load_table
+    assert whole["city"].iloc[0] == load_table(content, "t.csv")["city"].iloc[0] == "Montréal"
+    tsv = list(load_table_chunks(_rows_csv(5, sep="\t"), "t.tsv", chunksize=2))
+    assert list(tsv[0].columns) == ["customer_id", "email", "city"]
+
+
+def test_profile_and_validation_from_chunks_match_whole_frame():
+    content = _rows_csv(30)
+    df = load_table(content, "t.csv")
+    prof = profile_table_chunks(load_table_chunks(content, "t.csv", chunksize=7), "t.csv", sample_n=12)
+    assert prof.rows == 30 and prof.sample_n == 12
+    whole = run_validation(df, "customers")
+    chunked = run_validation_chunks(load_table_chunks(content, "t.csv", chunksize=7), "customers")
+    assert chunked.model_dump() == whole.model_dump()
+
+
+def test_iter_merge_chunks_matches_merge_datasets():
+    left = pd.DataFrame({"id": range(9), "name": list("ABCDEFGHI")})
+    right = pd.DataFrame({"identifier": range(5), "name": list("vwxyz")})
+    decisions = [MappingDecision(left_table="l", left_column="id", right_table="r", right_column="identifier",
+                                 decision="auto", confidence=0.9, transform_ops=[{"op": "upper", "args": {"field": "name"}}])]
+    expected = merge_datasets({"left": left, "right": right}, decisions, lineage_meta={})
+    chunks = iter_merge_chunks((left.iloc[i:i + 4] for i in range(0, 9, 4)),
+                               (right.iloc[i:i + 2] for i in range(0, 5, 2)), decisions, lineage_meta={})
+    got = pd.concat(list(chunks), ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_merge_export_streams_csv():
+    client = TestClient(app)
+    files = [
+        ("files", ("left.csv", b"id,name\n1,A\n2,B\n", "text/csv")),
+        ("files", ("right.csv", b"Identifier,Name\n3,C\n", "text/csv")),
+    ]
+    r = client.post("/api/v1/merge/export", files=files)
+    assert r.status_code == 200
+    lines = r.text.strip().splitlines()
+    assert lines[0].startswith("id,name,identifier,_source_bank")
+    assert len(lines) == 4
+
+
+def test_chunks_switch_to_latin1_after_invalid_byte_past_sniff_window(tmp_path):
+    ascii_rows = "".join(f"C{i},u{i}@b.com,Paris\n" for i in range(5000))
+    content = ("customer_id,email,city\n" + ascii_rows + "C9,z@b.com,Montréal\n").encode("latin-1")
+    path = tmp_path / "t.csv"
+    path.write_bytes(content)
+    chunks = list(load_table_chunks(str(path), "t.csv", chunksize=1000))
+    whole = pd.concat(chunks)
+    assert list(whole.index) == list(range(5001))
+    assert whole["city"].iloc[-1] == "Montréal"
+    pd.testing.assert_frame_equal(whole, load_table(content, "t.csv"))
+
+
+def test_chunked_validation_keeps_cross_chunk_state():
+    df = pd.DataFrame({
+        "customer_id": ["C1", "C2", None, "C3", "C1", "C4", "C2", "C5", None, "C6"],
+        "email": ["a@b.com", "bad", "c@b.com", "d@b.com", "x", "e@b.com", "f@b.com", "g@b.com", "h@b.com", "nope"],
+    })
+    chunks = [df.iloc[i : i + 3] for i in range(0, len(df), 3)]
+    assert run_validation_chunks(chunks, "customers").model_dump() == run_validation(df, "customers").model_dump()
+    loans = pd.DataFrame({"loan_id": range(12), "amount": [10, 11, 12, 10, 11, 500, 12, 10, 11, 12, 10, -300]})
+    chunks = [loans.iloc[i : i + 5] for i in range(0, len(loans), 5)]
+    # start/end columns are absent: reported from the total row count
+    assert run_validation_chunks(chunks, "loans").model_dump() == run_validation(loans, "loans").model_dump()
+
+
+def test_chunked_validation_across_many_chunks():
+    import numpy as np
+    rng = np.random.default_rng(5)
+    amount = rng.uniform(100, 200, 5000)
+    amount[[7, 1500, 1501, 4999]] = [10000, -9000, 12000, 9500]
+    loans = pd.DataFrame({"loan_id": np.arange(5000), "amount": amount})
+    chunks = [loans.iloc[i : i + 1000] for i in range(0, len(loans), 1000)]
+    assert run_validation_chunks(chunks, "loans").model_dump() == run_validation(loans, "loans").model_dump()
+    # ids read as int in one chunk and as float (with a null) in another still collide
+    first = pd.DataFrame({"customer_id": [1, 2, 3], "email": ["a@b.com"] * 3})
+    second = pd.DataFrame({"customer_id": [4.0, None, 2.0], "email": ["a@b.com"] * 3}, index=[3, 4, 5])
+    v = run_validation_chunks([first, second], "customers").violations
+    assert [(x.rule, x.count, x.sample) for x in v if x.rule.startswith("unique")] == [("unique(customer_id)", 2, [1, 5])]
+
+
+def test_validate_endpoint_streams_uploads():
+    client = TestClient(app)
+    content = _rows_csv(30)
+    r = client.post("/api/v1/validate", files=[("files", ("t.csv", content, "text/csv"))], data={"contract": "customers"})
+    assert r.status_code == 200
+    assert r.json()["violations"] == run_validation(load_table(content, "t.csv"), "customers").model_dump()["violations"]
+    assert client.post("/api/v1/validate", data={"contract": "customers"}, files=[]).status_code in (400, 422)
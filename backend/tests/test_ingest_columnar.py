@@ -0,0 +1,70 @@
+import io
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.ingest import load_table, load_table_chunks
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.feather as feather  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def _frame(n: int = 10) -> pd.DataFrame:
+    return pd.DataFrame({"Account ID": [f"A{i}" for i in range(n)], "balance": [float(i) for i in range(n)], "branch": ["X"] * n})
+
+
+def _parquet(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf, row_group_size=4)
+    return buf.getvalue()
+
+
+def _feather(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), buf, chunksize=4)
+    return buf.getvalue()
+
+
+def _ipc_stream(df: pd.DataFrame) -> bytes:
+    sink = io.BytesIO()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as w:
+        w.write_table(table)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize("name,writer", [("t.parquet", _parquet), ("t.feather", _feather), ("t.arrow", _feather), ("t.arrows", _ipc_stream)])
+def test_columnar_formats_with_projection_and_row_limit(name, writer):
+    src = _frame()
+    content = writer(src)
+    pd.testing.assert_frame_equal(load_table(content, name), src)
+    # projection accepts normalized names; row limit stops early
+    df = load_table(content, name, columns=["account_id", "balance"], nrows=6)
+    assert list(df.columns) == ["Account ID", "balance"]
+    assert len(df) == 6
+
+
+def test_columnar_chunks_and_memory_mapped_path(tmp_path):
+    content = _parquet(_frame(10))
+    chunks = list(load_table_chunks(content, "t.parquet", chunksize=4, columns=["branch"]))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert list(pd.concat(chunks).index) == list(range(10))
+    path = tmp_path / "t.feather"
+    path.write_bytes(_feather(_frame(5)))
+    from app.services.ingest import _load_columnar
+    assert len(_load_columnar(str(path), "t.feather", "pandas", None, None)) == 5
+
+
+def test_dataset_upload_with_projection():
+    client = TestClient(app)
+    files = [("files", ("accts.parquet", _parquet(_frame(8)), "application/octet-stream"))]
+    r = client.post("/api/v1/datasets", params={"columns": ["account_id"], "nrows": 3}, files=files)
+    assert r.status_code == 200
+    info = r.json()["datasets"][0]
+    assert info["columns"] == ["account_id"] and info["rows"] == 3
+
+
+def test_csv_projection_and_row_limit():
+    df = load_table(b"Account ID,balance,branch\nA1,1,X\nA2,2,Y\nA3,3,Z\n", "t.csv", columns=["account_id"], nrows=2)
+    assert list(df.columns) == ["Account ID"] and len(df) == 2
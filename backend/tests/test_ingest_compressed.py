@@ -0,0 +1,60 @@
+import gzip
+import io
+import zipfile
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.ingest import load_table, load_tables, load_table_chunks, is_multi_table
+
+
+CSV = b"customer_id,email\nC1,a@b.com\nC2,c@d.com\nC3,e@f.com\n"
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def test_gzip_csv_streams_like_plain_csv():
+    gz = gzip.compress(CSV)
+    pd.testing.assert_frame_equal(load_table(gz, "customers.csv.gz"), load_table(CSV, "customers.csv"))
+    assert len(load_table(gz, "customers.csv.gz", nrows=2)) == 2
+    chunks = list(load_table_chunks(gz, "customers.csv.gz", chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    # NDJSON inside gzip goes through the regular JSON reader
+    assert len(load_table(gzip.compress(b'{"a": 1}\n{"a": 2}\n'), "t.ndjson.gz")) == 2
+
+
+def test_zstd_csv():
+    pa = pytest.importorskip("pyarrow")
+    zst = pa.compress(CSV, codec="zstd", asbytes=True)
+    assert len(load_table(zst, "customers.csv.zst")) == 3
+
+
+def test_zip_members_become_tables():
+    archive = _zip({
+        "customers.csv": CSV,
+        "accounts.tsv": b"account_id\tbalance\nA1\t1.5\n",
+        "__MACOSX/._customers.csv": b"junk",
+    })
+    assert is_multi_table("bank.zip") and not is_multi_table("bank.csv.gz")
+    tables = load_tables(archive, "bank.zip")
+    assert list(tables) == ["bank.zip::customers.csv", "bank.zip::accounts.tsv"]
+    assert list(tables["bank.zip::accounts.tsv"].columns) == ["account_id", "balance"]
+    # load_table / chunks read the first member
+    assert len(load_table(archive, "bank.zip")) == 3
+    assert sum(len(c) for c in load_table_chunks(archive, "bank.zip", chunksize=2)) == 3
+    single = _zip({"only.csv": CSV})
+    assert list(load_tables(single, "one.zip")) == ["one.zip"]
+
+
+def test_profile_route_expands_zip():
+    client = TestClient(app)
+    archive = _zip({"customers.csv": CSV, "more.csv.gz": gzip.compress(CSV)})
+    r = client.post("/api/v1/profile", files=[("files", ("bank.zip", archive, "application/zip"))])
+    assert r.status_code == 200
+    assert set(r.json()["profiles"]) == {"bank.zip::customers.csv", "bank.zip::more.csv.gz"}
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import ingest
+from app.services.ingest import load_table
+
+
+CSV = b"\xef\xbb\xbfid,name,amount,opened\n1,Ann,10.5,2020-01-01\n2,,3.0,2021-02-03\n,Bob,,\n"
+
+
+def test_pyarrow_engine_returns_arrow_backed_dtypes():
+    pytest.importorskip("pyarrow")
+    df = load_table(CSV, "t.csv", engine="pyarrow")
+    assert list(df.columns) == ["id", "name", "amount", "opened"]
+    assert str(df["name"].dtype) == "string"
+    assert df["name"].dtype.storage == "pyarrow"
+    assert str(df["id"].dtype) == "Int64"
+    assert df["id"].isna().sum() == 1
+    assert pd.api.types.is_datetime64_any_dtype(df["opened"])
+    tsv = load_table(b"a\tb\n1\tx\n", "t.tsv", engine="pyarrow")
+    assert list(tsv.columns) == ["a", "b"]
+    nd = load_table(b'{"a": 1, "b": "x"}\n{"a": 2, "b": "y"}\n', "t.ndjson", engine="pyarrow")
+    assert len(nd) == 2 and str(nd["a"].dtype) == "Int64"
+
+
+def test_pyarrow_engine_falls_back_to_pandas(monkeypatch):
+    monkeypatch.setattr(ingest, "pa", None)
+    df = load_table(CSV, "t.csv", engine="pyarrow")
+    assert df["name"].dtype == object
+    # formats Arrow does not handle always use pandas
+    assert len(load_table(b'[{"a": 1}]', "t.json", engine="pyarrow")) == 1
+
+
+def test_engine_is_selectable_per_request():
+    pytest.importorskip("pyarrow")
+    client = TestClient(app)
+    files = [
+        ("files", ("left.csv", b"customer_id,email\n1,a@b.com\n2,b@b.com\n", "text/csv")),
+        ("files", ("right.csv", b"customer_number,e_mail\n1,a@b.com\n3,c@d.com\n", "text/csv")),
+    ]
+    r = client.post("/api/v1/match?engine=pyarrow", files=files)
+    assert r.status_code == 200
+    assert len(r.json()["candidates"]) == 4
+    mg = client.post("/api/v1/merge?engine=pyarrow", files=files)
+    assert mg.status_code == 200
+    assert client.post("/api/v1/profile?engine=fast", files=files[:1]).status_code == 422
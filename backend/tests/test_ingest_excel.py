@@ -0,0 +1,54 @@
+import io
+import pandas as pd
+from fastapi.testclient import TestClient
+from app.main import app
+from app.schemas.profile import TableProfile
+from app.services.ingest import load_table, load_tables
+from app.services.table_pairing import pair_tables
+
+
+def _workbook(sheets: dict[str, pd.DataFrame]) -> bytes:
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as w:
+        for name, df in sheets.items():
+            df.to_excel(w, sheet_name=name, index=False)
+    return buf.getvalue()
+
+
+BOOK = _workbook({
+    "Customers": pd.DataFrame({"customer_id": ["C1", "C2"], "email": ["a@b.com", "c@d.com"]}),
+    "Accounts": pd.DataFrame({"account_id": ["A1", "A2", "A3"], "balance": [1.0, 2.0, 3.0]}),
+})
+
+
+def test_every_sheet_is_a_table_serial_and_parallel(override_settings):
+    from app.services.workers import shutdown_pool
+    serial = load_tables(BOOK, "bank.xlsx", workers=1)
+    override_settings(ingest_parallel_min_bytes=0)
+    try:
+        parallel = load_tables(BOOK, "bank.xlsx", workers=2)
+    finally:
+        shutdown_pool()
+    assert list(serial) == ["bank.xlsx::Customers", "bank.xlsx::Accounts"]
+    for k in serial:
+        pd.testing.assert_frame_equal(serial[k], parallel[k])
+    # load_table keeps returning the first sheet; single-sheet books keep the file name
+    assert list(load_table(BOOK, "bank.xlsx").columns) == ["customer_id", "email"]
+    single = _workbook({"Only": pd.DataFrame({"a": [1]})})
+    assert list(load_tables(single, "one.xlsx")) == ["one.xlsx"]
+
+
+def test_profile_exposes_sheets_for_pairing():
+    client = TestClient(app)
+    files = [("files", ("bank.xlsx", BOOK, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"))]
+    r = client.post("/api/v1/profile", files=files)
+    assert r.status_code == 200
+    profiles = r.json()["profiles"]
+    assert set(profiles) == {"bank.xlsx::Customers", "bank.xlsx::Accounts"}
+    tps = [TableProfile.model_validate(p) for p in profiles.values()]
+    pairs, _, _, matrix = pair_tables(tps, tps)
+    assert len(matrix["scores"]) == 2
+
+    ds = client.post("/api/v1/datasets", files=files)
+    assert ds.status_code == 200
+    assert [d["name"] for d in ds.json()["datasets"]] == ["bank.xlsx::Customers", "bank.xlsx::Accounts"]
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from app.services.keys import discover_keys
+from app.services.profile import profile_table
+from app.services.sampling import sample_frame
+
+
+def _accounts(n=20000):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "branch": np.arange(n) % 50,
+        "account_no": np.arange(n) // 50,
+        "status": rng.choice(["open", "closed"], n),
+        "amount": rng.integers(0, 100, n),
+        "note": [None if i % 7 == 0 else f"n{i}" for i in range(n)],
+    })
+
+
+def test_finds_minimal_composite_key_and_skips_nullable_columns():
+    df = _accounts()
+    keys, complete = discover_keys(df, sample=sample_frame(df, 500), max_arity=3, budget_s=30)
+    assert complete
+    # 'note' is unique where present but has nulls; supersets of the key are not reported
+    assert keys == [["branch", "account_no"]]
+
+
+def test_sample_uniqueness_is_verified_on_all_rows():
+    df = _accounts()
+    # unique within the first 1000 rows only
+    df["ref"] = np.arange(len(df)) % 1000
+    keys, _ = discover_keys(df, sample=df.head(1000), max_arity=1, budget_s=30)
+    assert keys == []
+    assert discover_keys(df.head(1000), max_arity=1, budget_s=30)[0] == [["ref"]]
+
+
+def test_budget_and_arity_limits():
+    df = _accounts()
+    assert discover_keys(df, max_arity=1, budget_s=30) == ([], True)
+    keys, complete = discover_keys(df, max_arity=3, budget_s=0.0)
+    assert keys == [] and complete is False
+
+
+def test_profile_reports_candidate_keys(override_settings):
+    prof = profile_table(_accounts(2000), "accounts", sample_n=200, key_search=True)
+    assert prof.candidate_keys == [["branch", "account_no"]] and prof.candidate_keys_complete is True
+    override_settings(pk_max_arity=0)
+    prof = profile_table(_accounts(2000), "accounts", sample_n=200, key_search=True)
+    assert prof.candidate_keys == [] and prof.candidate_keys_complete is None
+
+
+def test_composite_search_is_opt_in():
+    df = _accounts(2000).assign(account_id=np.arange(2000))
+    # by default only single columns are checked, on every row
+    prof = profile_table(df, "accounts", sample_n=200)
+    assert prof.candidate_keys == [["account_id"]] and prof.candidate_keys_complete is None
+    df.loc[1999, "account_id"] = 0
+    assert profile_table(df, "accounts", sample_n=200, sample=df.head(200)).candidate_keys == []
+
+
+def test_update_profile_drops_keys_the_batch_breaks():
+    from app.services.profile import update_profile
+    df = _accounts(2000)
+    prof = profile_table(df, "accounts", sample_n=200, sketches=True, key_search=True)
+    assert update_profile(prof, df.iloc[:10].assign(account_no=df["account_no"].iloc[:10] + 1000)).candidate_keys == [["branch", "account_no"]]
+    assert update_profile(prof, pd.concat([df.iloc[:2], df.iloc[:2]])).candidate_keys == []
@@ -24,3 +24,35 @@ def test_suggest_mappings_basic():
     assert dob_pairs[0]["right_column"].startswith("date_of_birth")
 
 
+
+
+def test_overlap_matrix_matches_pairwise_jaccard():
+    from app.services.match import _overlap_matrix, column_fingerprints
+
+    left = pd.DataFrame({"a": [1, 2, 3, None], "b": ["x", "y", "y", "z"]})
+    right = pd.DataFrame({"c": [1, 2, 9, 9], "d": ["z", "x", None, None], "e": [None] * 4, "f": ["1", "2", "9", "9"]})
+    lf, rf = column_fingerprints(left, left), column_fingerprints(right, right)
+    m = _overlap_matrix(lf, rf)
+    assert m.shape == (2, 4)
+    # numbers compare by value, as in MinHash mode: 1.0 / 2.0 / 3.0 against 1 / 2 / 9
+    assert m[0, 0] == 2 / 4
+    assert m[1, 1] == 2 / 3
+    assert (m[:, 2] == 0.0).all()
+    # digit strings are text, in both modes
+    assert m[0, 3] == 0.0
+    assert lf[1].examples and lf[0].dtype == "number" and rf[0].family == "other"
+
+
+def test_name_and_embedding_matrices_match_pairwise_scores():
+    import numpy as np
+    from app.services.match import _cosine_matrix, _name_scores
+
+    left, right = ["acct_id", "Cust No", "fname"], ["account_id", "customer_number", "first_name", "email"]
+    m = _name_scores(left, right)
+    assert m.shape == (3, 4)
+    assert m[0, 0] == 1.0
+    # each cell is the score of its pair alone
+    assert all(m[i, j] == _name_scores([a], [b])[0, 0] for i, a in enumerate(left) for j, b in enumerate(right))
+    assert m[2].argmax() == 2
+    cos = _cosine_matrix([[1.0, 0.0], [0.0, 0.0]], [[2.0, 0.0], [1.0, 1.0]])
+    assert np.allclose(cos, [[1.0, 2 ** -0.5], [0.0, 0.0]])
@@ -74,3 +74,14 @@ def test_match_reasons_stats_low_confidence_review():
 
 
 
+
+
+def test_match_top_k_query_limits_candidates():
+    left = "acct_id,name\n1,a\n2,b\n"
+    right = "account_number,full_name,city\n1,a,x\n2,b,y\n"
+    r = client.post("/api/v1/match?top_k=1&blocking=true", files=[_csv(left), _csv(right)])
+    assert r.status_code == 200
+    data = r.json()
+    assert [c["left_column"] for c in data["candidates"]] == ["acct_id", "name"]
+    assert all(c["best_pick"] for c in data["candidates"])
+    assert data["stats"]["total_pairs"] == 2.0
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import match
+from app.services.minhash import LSHIndex, column_signature, jaccard, overlap_matrices
+
+
+def test_signature_estimates_jaccard_over_the_full_column():
+    a = pd.Series(np.arange(0, 20000))
+    b = pd.Series(np.arange(10000, 30000).astype(float))  # same values as floats still agree
+    sa, na = column_signature(a, k=256, chunk_rows=3000)
+    sb, nb = column_signature(b, k=256)
+    assert abs(float(jaccard(sa, sb[None, :])[0]) - 1 / 3) < 0.1
+    assert abs(na - 20000) / 20000 < 0.05
+    empty, n0 = column_signature(pd.Series([None, None], dtype=object), k=256)
+    assert n0 == 0.0 and float(jaccard(empty, sa[None, :])[0]) == 0.0
+
+
+def test_lsh_retrieves_overlapping_columns_only():
+    rng = np.random.default_rng(3)
+    base = [f"v{i}" for i in range(5000)]
+    right = [pd.Series(base[:4000]), pd.Series([f"w{i}" for i in range(5000)]), pd.Series(rng.random(3000))]
+    sigs = [column_signature(s)[0] for s in right]
+    index = LSHIndex(128, bands=64)
+    for j, sig in enumerate(sigs):
+        index.add(j, sig)
+    assert index.query(column_signature(pd.Series(base))[0]) == {0}
+
+
+def test_containment_for_id_like_pairs():
+    parent = column_signature(pd.Series(np.arange(100000)))
+    child = column_signature(pd.Series(np.arange(0, 100000, 4)))
+    jac, cont = overlap_matrices([child[0]], [child[1]], [parent[0]], [parent[1]], containment_pairs=[(0, 0)])
+    assert jac[0, 0] < 0.5 < cont[0, 0]
+
+
+@pytest.fixture
+def minhash_mode(override_settings):
+    override_settings(match_overlap_mode="minhash")
+
+
+def test_suggest_mappings_minhash_mode(minhash_mode):
+    n = 20000
+    left = pd.DataFrame({"customer_id": np.arange(n), "city": [f"c{i % 300}" for i in range(n)], "score": np.linspace(0, 1, n)})
+    right = pd.DataFrame({"cust_id": np.arange(0, n, 5), "town": [f"c{i % 300}" for i in range(n // 5)], "other": -np.arange(n // 5)})
+    out = match.suggest_mappings(left, right, sample_n=100, threshold=0.0)
+    got = {(r["left_column"], r["right_column"]): r["scores"] for r in out}
+    assert got[("customer_id", "cust_id")]["containment"] > 0.8
+    assert got[("customer_id", "cust_id")]["value_overlap"] > 0.8
+    assert got[("city", "town")]["value_overlap"] > 0.9
+    assert got[("score", "other")]["value_overlap"] == 0.0
+    assert "containment" not in got[("city", "town")]
+
+
+def test_minhash_fingerprints_skip_sample_hashes(minhash_mode):
+    df = pd.DataFrame({"a": np.arange(1000), "b": [f"v{i}" for i in range(1000)]})
+    fps = match.column_fingerprints(df, df.head(100), signatures=True)
+    assert all(len(f.hashes) == 0 and f.signature is not None for f in fps)
+    assert [f.examples for f in fps] == [f.examples for f in match.column_fingerprints(df, df.head(100))]
+
+
+def test_exact_and_minhash_modes_hash_values_alike():
+    left = pd.DataFrame({"a": [1, 2, 3, 4]})
+    right = pd.DataFrame({"b": [1.0, 2.0, 3.0, 4.0], "c": ["1", "2", "3", "4"]})
+    exact = match._overlap_matrix(match.column_fingerprints(left, left), match.column_fingerprints(right, right))
+    sigs = np.stack([column_signature(right[c])[0] for c in right])
+    assert exact[0].tolist() == jaccard(column_signature(left["a"])[0], sigs).tolist() == [1.0, 0.0]
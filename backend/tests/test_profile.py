@@ -21,3 +21,34 @@ def test_dtype_mapping():
     assert dtype_to_simple(pd.Series([1.0,2.0]).dtype) == "number"
     assert dtype_to_simple(pd.Series([True, False]).dtype) == "boolean"
 
+
+
+def test_single_pass_stats_min_max_and_examples():
+    n = 300
+    df = pd.DataFrame({
+        "amount": [float(i) for i in range(n - 1)] + [None],
+        "opened": pd.date_range("2021-01-01", periods=n),
+        # head repeats one value, later rows add more distinct ones
+        "city": ["Toronto"] * 250 + ["Montreal", "Calgary"] * 25,
+    })
+    prof = profile_table(df, "t", sample_n=n)
+    cols = {c.name: c for c in prof.columns_profile}
+    assert cols["amount"].null_count == 1 and cols["amount"].unique_count_sampled == n - 1
+    assert (cols["amount"].min_value, cols["amount"].max_value) == (0.0, float(n - 2))
+    assert cols["opened"].min_value.startswith("2021-01-01")
+    assert cols["city"].min_value is None
+    assert len(cols["city"].examples) == 3
+
+
+def test_wide_table_column_groups_match_serial_order(override_settings):
+    n = 50
+    df = pd.DataFrame({
+        f"c{i}": (list(range(n)) if i % 3 == 0 else [f"u{j % 7}@b.com" for j in range(n)] if i % 3 == 1 else [None] * n)
+        for i in range(70)
+    })
+    override_settings(profile_column_workers=1)
+    serial = profile_table(df, "t", sample_n=n)
+    override_settings(profile_column_workers=4, profile_parallel_min_columns=8)
+    parallel = profile_table(df, "t", sample_n=n)
+    assert [c.name for c in parallel.columns_profile] == list(df.columns)
+    assert parallel == serial
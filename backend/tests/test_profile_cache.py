@@ -0,0 +1,55 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import config
+
+
+def _upload(name: str, body: bytes):
+    return [("files", (name, body, "text/csv"))]
+
+
+def _unique_csv() -> bytes:
+    # fresh content per test run so hits from earlier runs (persistent DB) cannot interfere
+    tag = uuid.uuid4().hex
+    return ("id,email\n" + "".join(f"{tag}{i},u{i}@b.com\n" for i in range(20))).encode()
+
+
+def test_second_profile_of_same_content_is_a_cache_hit():
+    client = TestClient(app)
+    body = _unique_csv()
+    first = client.post("/api/v1/profile", files=_upload("a.csv", body)).json()
+    assert first["cache_hits"] == []
+    second = client.post("/api/v1/profile", files=_upload("a.csv", body)).json()
+    assert second["cache_hits"] == ["a.csv"]
+    assert second["profiles"] == first["profiles"]
+    # same bytes under another name: still a hit, reported under the new name
+    renamed = client.post("/api/v1/profile", files=_upload("b.csv", body)).json()
+    assert renamed["cache_hits"] == ["b.csv"] and renamed["profiles"]["b.csv"]["table"] == "b.csv"
+    # a different parse (extension) is a different entry
+    assert client.post("/api/v1/profile", files=_upload("a.tsv", body)).json()["cache_hits"] == []
+
+
+def test_settings_changes_and_disabled_cache_miss(override_settings):
+    client = TestClient(app)
+    body = _unique_csv()
+    client.post("/api/v1/profile", files=_upload("c.csv", body))
+    masked = config.settings.profile_examples_masked
+    override_settings(profile_examples_masked=not masked)
+    assert client.post("/api/v1/profile", files=_upload("c.csv", body)).json()["cache_hits"] == []
+    override_settings(profile_examples_masked=masked)
+    assert client.post("/api/v1/profile?sketches=true", files=_upload("c.csv", body)).json()["cache_hits"] == []
+    override_settings(profile_cache_enabled=False)
+    assert client.post("/api/v1/profile", files=_upload("c.csv", body)).json()["cache_hits"] == []
+
+
+def test_chunking_and_budget_cut_key_searches(override_settings):
+    client = TestClient(app)
+    body = _unique_csv()
+    client.post("/api/v1/profile", files=_upload("d.csv", body))
+    override_settings(ingest_chunk_rows=config.settings.ingest_chunk_rows + 1)
+    assert client.post("/api/v1/profile", files=_upload("d.csv", body)).json()["cache_hits"] == []
+    # key searches stopped by the time budget are not stored
+    override_settings(pk_search_budget_s=0.0)
+    for _ in range(2):
+        r = client.post("/api/v1/profile?key_search=true", files=_upload("d.csv", body)).json()
+        assert r["cache_hits"] == [] and r["profiles"]["d.csv"]["candidate_keys_complete"] is False
@@ -0,0 +1,45 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import config
+from app.services import workers
+from app.services.profile import profile_sources
+
+
+def _csv(prefix: str, n: int) -> bytes:
+    return ("id,email\n" + "".join(f"{prefix}{i},u{i}@b.com\n" for i in range(n))).encode()
+
+
+def test_profile_sources_pool_matches_serial_in_order(override_settings):
+    sources = [(_csv(p, n), f"{p}.csv", None) for p, n in (("A", 5), ("B", 9), ("C", 3))]
+    # workers started earlier still pick up settings changed since
+    override_settings(ingest_parallel_min_bytes=0, profile_examples_masked=not config.settings.profile_examples_masked)
+    try:
+        serial = profile_sources(sources, sample_n=100, workers=1)
+        pooled = profile_sources(sources, sample_n=100, workers=2)
+        pool = workers._POOL
+        profile_sources(sources, sample_n=100, workers=2)
+        assert pool is not None and workers._POOL is pool
+    finally:
+        workers.shutdown_pool()
+    assert [t[0][0] for t, _ in pooled] == ["A.csv", "B.csv", "C.csv"]
+    assert [[p.model_dump() for _, p in t] for t, _ in pooled] == [[p.model_dump() for _, p in t] for t, _ in serial]
+    assert all(ms >= 0 for _, ms in pooled)
+    assert workers._POOL is None
+
+
+def test_small_inputs_stay_in_process():
+    sources = [(_csv(p, 3), f"{p}.csv", None) for p in "AB"]
+    profile_sources(sources, sample_n=100, workers=2)
+    assert workers._POOL is None
+
+
+def test_profile_route_reports_timings_in_request_order(override_settings):
+    client = TestClient(app)
+    override_settings(ingest_workers=2)
+    files = [("files", (f"t{i}.csv", _csv(f"T{i}", 4 + i), "text/csv")) for i in range(3)]
+    r = client.post("/api/v1/profile", files=files)
+    assert r.status_code == 200
+    body = r.json()
+    assert list(body["profiles"]) == ["t0.csv", "t1.csv", "t2.csv"]
+    assert [body["profiles"][f"t{i}.csv"]["rows"] for i in range(3)] == [4, 5, 6]
+    assert list(body["timings_ms"]) == ["t0.csv", "t1.csv", "t2.csv"]
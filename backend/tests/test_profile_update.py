@@ -0,0 +1,121 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.profile import profile_table, update_profile
+
+
+@pytest.fixture
+def head_sampling(override_settings):
+    # sampled fields are exactly reproducible from the old rows only with first-rows samples
+    override_settings(sample_method="head")
+
+
+def _frames():
+    rng = np.random.default_rng(7)
+    n = 3000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": np.where(rng.random(n) < 0.1, np.nan, rng.normal(100, 15, n)),
+        "email": [f"user{i % 700}@bank.ca" for i in range(n)],
+    })
+    return df, df.iloc[:1000].reset_index(drop=True), df.iloc[1000:].reset_index(drop=True)
+
+
+def _cols(prof):
+    return {c.name: c for c in prof.columns_profile}
+
+
+def test_update_matches_full_profile_when_sample_is_full(head_sampling):
+    full_df, old, delta = _frames()
+    full = profile_table(full_df, "t", sample_n=500, sketches=True)
+    updated = update_profile(profile_table(old, "t", sample_n=500, sketches=True), delta, sample_n=500)
+    assert (updated.rows, updated.sample_n) == (3000, 500)
+    for name, col in _cols(full).items():
+        got = _cols(updated)[name]
+        # sampled fields come from the same first 500 rows
+        assert got.model_dump(exclude={"sketches"}) == col.model_dump(exclude={"sketches"})
+        # merged sketches equal sketches of the whole table (HLL / top-k exactly)
+        for key in ("count", "null_count", "distinct_estimate", "hll"):
+            assert got.sketches[key] == col.sketches[key]
+        assert [i[1] for i in got.sketches["top_k"]["items"]] == [i[1] for i in col.sketches["top_k"]["items"]]
+    assert abs(_cols(updated)["amount"].sketches["quantiles"]["p50"] - _cols(full)["amount"].sketches["quantiles"]["p50"]) < 1.0
+
+
+def test_update_tops_up_a_partial_sample(head_sampling):
+    full_df, old, delta = _frames()
+    full = profile_table(full_df, "t", sample_n=5000, sketches=True)
+    updated = update_profile(profile_table(old, "t", sample_n=5000, sketches=True), delta, sample_n=5000)
+    assert (updated.rows, updated.sample_n) == (3000, 3000)
+    want, got = _cols(full), _cols(updated)
+    for name in want:
+        assert got[name].null_count == want[name].null_count
+        assert got[name].candidate_primary_key_sampled == want[name].candidate_primary_key_sampled
+        assert got[name].semantic_tags == want[name].semantic_tags
+        assert (got[name].min_value, got[name].max_value) == (want[name].min_value, want[name].max_value)
+        assert abs(got[name].unique_count_sampled - want[name].unique_count_sampled) <= 0.03 * want[name].unique_count_sampled
+    assert got["id"].candidate_primary_key_sampled and not got["email"].candidate_primary_key_sampled
+
+
+def test_reservoir_update_tops_up_from_the_whole_batch():
+    from app.services.sampling import sample_positions
+    full_df, old, delta = _frames()
+    updated = update_profile(profile_table(old, "t", sample_n=1500, sketches=True), delta, sample_n=1500)
+    assert (updated.rows, updated.sample_n) == (3000, 1500)
+    # the 500 joining rows are a seeded draw over the whole batch, not its first rows
+    joining = delta.iloc[sample_positions(len(delta), 500)]
+    assert joining.index.max() > 500
+    amount = _cols(updated)["amount"]
+    assert amount.null_count == int(old["amount"].isna().sum() + joining["amount"].isna().sum())
+    assert amount.sketches["null_count"] == int(full_df["amount"].isna().sum())
+
+
+def test_update_requires_sketch_state_and_known_columns():
+    _, old, delta = _frames()
+    with pytest.raises(ValueError, match="sketch state"):
+        update_profile(profile_table(old, "t", sample_n=100, sketches=False), delta)
+    with pytest.raises(ValueError, match="not in the profile"):
+        update_profile(profile_table(old, "t", sample_n=100, sketches=True), delta.assign(extra=1))
+
+
+def test_profile_update_endpoint():
+    client = TestClient(app)
+    _, old, delta = _frames()
+    base = profile_table(old, "t", sample_n=100, sketches=True)
+    buf = io.StringIO()
+    delta.to_csv(buf, index=False)
+    r = client.post(
+        "/api/v1/profile/update",
+        data={"profile": json.dumps(base.model_dump())},
+        files=[("files", ("delta.csv", buf.getvalue().encode(), "text/csv"))],
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["rows"] == 3000
+    assert {c["name"]: c["sketches"]["count"] for c in body["columns_profile"]} == {"id": 3000, "amount": 3000, "email": 3000}
+    bad = client.post("/api/v1/profile/update", data={"profile": "{}"}, files=[("files", ("delta.csv", b"id\n1\n", "text/csv"))])
+    assert bad.status_code == 422
+
+
+def test_update_casts_delta_parsed_by_another_engine():
+    pytest.importorskip("pyarrow")
+    client = TestClient(app)
+    old = "id,opened\n" + "".join(f"{i},2024-01-{i % 28 + 1:02d} 10:00:00\n" for i in range(50))
+    delta = "id,opened\n" + "".join(f"{i},2024-03-{i % 28 + 1:02d} 09:30:00\n" for i in range(50, 80))
+    r = client.post("/api/v1/profile?engine=pyarrow&sketches=true", files=[("files", ("t.csv", old.encode(), "text/csv"))])
+    base = r.json()["profiles"]["t.csv"]
+    assert {c["name"]: c["dtype"] for c in base["columns_profile"]}["opened"] == "datetime"
+    up = client.post("/api/v1/profile/update", data={"profile": json.dumps(base)}, files=[("files", ("d.csv", delta.encode(), "text/csv"))])
+    assert up.status_code == 200, up.text
+    opened = {c["name"]: c for c in up.json()["columns_profile"]}["opened"]
+    assert opened["max_value"].startswith("2024-03-28") and opened["sketches"]["count"] == 80
+    bad = client.post(
+        "/api/v1/profile/update",
+        data={"profile": json.dumps(base)},
+        files=[("files", ("d.csv", b"id,opened\n90,not a date\n", "text/csv"))],
+    )
+    assert bad.status_code == 422 and "opened" in bad.json()["message"]
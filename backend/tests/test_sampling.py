@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from app.services.ingest import iter_frame_chunks
+from app.services.profile import profile_table, profile_table_chunks
+from app.services.sampling import Reservoir, sample_chunks, sample_frame
+
+
+def _sorted_extract(n=20000):
+    # sorted by balance, as many core-banking extracts are
+    return pd.DataFrame({"balance": np.arange(n, dtype=float), "region": np.where(np.arange(n) % 10 == 0, "north", "south")})
+
+
+def test_reservoir_over_chunks_is_uniform_seeded_and_in_row_order():
+    df = _sorted_extract()
+    s = sample_chunks(iter_frame_chunks(df, 1000), 500, method="reservoir", seed=1)
+    assert len(s) == 500 and s.index.is_monotonic_increasing
+    # head(500) of a sorted extract would average 249.5
+    assert abs(s["balance"].mean() - df["balance"].mean()) < 0.1 * df["balance"].mean()
+    again = sample_chunks(iter_frame_chunks(df, 3000), 500, method="reservoir", seed=1)
+    assert s.index.equals(again.index)
+    assert not s.index.equals(sample_chunks(iter_frame_chunks(df, 1000), 500, method="reservoir", seed=2).index)
+
+
+def test_stratified_reservoir_allocates_proportionally():
+    df = _sorted_extract()
+    r = Reservoir(100, seed=0, stratify="region")
+    for chunk in iter_frame_chunks(df, 2500):
+        r.add(chunk)
+    counts = r.frame()["region"].value_counts()
+    assert counts.to_dict() == {"south": 90, "north": 10}
+    # a tiny stratum still gets a row
+    rare = pd.concat([df, pd.DataFrame({"balance": [1.0], "region": ["east"]})], ignore_index=True)
+    assert "east" in set(sample_frame(rare, 50, stratify="region")["region"])
+
+
+def test_stratified_reservoir_memory_is_bounded_by_n():
+    df = _sorted_extract().assign(account=np.arange(20000) % 5000)
+    r = Reservoir(100, seed=0, stratify="account")
+    for chunk in iter_frame_chunks(df, 2500):
+        r.add(chunk)
+        assert len(r._frame) <= 200
+    assert len(r.frame()) == 100 and r.frame()["account"].is_unique
+    empty = Reservoir(0, seed=0).add(df).frame()
+    assert empty.empty and list(empty.columns) == list(df.columns)
+    assert list(Reservoir(0, stratify="account").add(df).frame().columns) == list(df.columns)
+
+
+def test_head_method_and_small_tables():
+    df = _sorted_extract(100)
+    assert sample_frame(df, 500) is df
+    assert sample_frame(df, 10, method="head").index.tolist() == list(range(10))
+    assert sample_chunks(iter_frame_chunks(df, 7), 10, method="head").index.tolist() == list(range(10))
+
+
+def test_profiles_use_the_sample_without_materializing_chunks(override_settings):
+    df = _sorted_extract()
+    override_settings(sample_method="reservoir")
+    chunked = profile_table_chunks(iter_frame_chunks(df, 1000), "t", sample_n=200)
+    whole = profile_table(df, "t", sample_n=200)
+    for prof in (chunked, whole):
+        col = prof.columns_profile[0]
+        assert prof.rows == 20000 and prof.sample_n == 200
+        assert col.max_value > 10000  # a head(200) sample would stop at 199
+
+
+def test_stratified_method_comes_from_settings(override_settings):
+    df = _sorted_extract()
+    override_settings(sample_method="stratified", sample_stratify="region")
+    assert sample_frame(df, 100)["region"].value_counts().to_dict() == {"south": 90, "north": 10}
+    streamed = profile_table_chunks(iter_frame_chunks(df, 2500), "t", sample_n=100)
+    assert streamed.rows == 20000 and streamed.sample_n == 100
+    # tables without the column get a plain reservoir
+    plain = sample_frame(df[["balance"]], 100)
+    assert len(plain) == 100 and plain.index.equals(sample_frame(df[["balance"]], 100, method="reservoir").index)
+
+
+def test_inputs_get_their_own_seed():
+    from app.services.sampling import content_seed
+    df = _sorted_extract()
+    a, b = content_seed("sha256:" + "a" * 64), content_seed("b" * 64)
+    assert a == content_seed("a" * 64) and a != b
+    assert not sample_frame(df, 100, seed=a).index.equals(sample_frame(df, 100, seed=b).index)
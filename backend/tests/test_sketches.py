@@ -0,0 +1,90 @@
+import json
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.drift import drift_between
+from app.services.ingest import iter_frame_chunks
+from app.services.profile import profile_table, profile_table_chunks
+from app.services.sketches import ColumnSketch, HyperLogLog, MisraGries, TDigest, merge_sketch_dicts, sketch_chunks
+
+
+def test_hll_estimate_and_merge_are_partition_independent():
+    rng = np.random.default_rng(7)
+    s = pd.Series(rng.integers(0, 50_000, 200_000))
+    whole = ColumnSketch("numeric").update(s)
+    parts = ColumnSketch("numeric").update(s[:70_000]).merge(ColumnSketch("numeric").update(s[70_000:]))
+    assert np.array_equal(whole.hll.registers, parts.hll.registers)
+    assert abs(whole.hll.estimate() - s.nunique()) / s.nunique() < 0.05
+    small = HyperLogLog(12)
+    small.add_hashes(pd.util.hash_pandas_object(pd.Series(range(100)), index=False).to_numpy())
+    assert abs(small.estimate() - 100) < 3
+
+
+def test_tdigest_quantiles_and_round_trip():
+    rng = np.random.default_rng(3)
+    values = rng.normal(100, 15, 100_000)
+    td = TDigest(100)
+    for part in np.array_split(values, 7):
+        td.update(part)
+    assert td.count == 100_000 and len(td.means) <= 60
+    for q in (0.01, 0.5, 0.99):
+        assert abs(td.quantile(q) - np.quantile(values, q)) < 1.0
+    back = TDigest.from_dict(json.loads(json.dumps(td.to_dict())))
+    assert back.quantile(0.5) == td.quantile(0.5)
+
+
+def test_misra_gries_keeps_heavy_hitters_across_merges():
+    a, b = MisraGries(3), MisraGries(3)
+    left = pd.Series(["x"] * 50 + [f"a{i}" for i in range(40)])
+    right = pd.Series(["y"] * 30 + ["x"] * 20 + [f"b{i}" for i in range(40)])
+    for mg, s in ((a, left), (b, right)):
+        mg.update(pd.util.hash_pandas_object(s, index=False).to_numpy(), s)
+    top = a.merge(b).top()
+    assert [t["value"] for t in top[:2]] == ["x", "y"]
+    # counts are underestimates by at most n/(k+1)
+    assert 70 - 180 / 4 <= top[0]["count"] <= 70
+
+
+def test_profile_sketches_from_chunks_match_whole_frame():
+    df = pd.DataFrame({
+        "id": np.arange(5000),
+        "email": [f"user{i % 900}@bank.com" if i % 10 else None for i in range(5000)],
+    })
+    whole = profile_table(df, "t", sample_n=100, sketches=True)
+    chunked = profile_table_chunks(iter_frame_chunks(df, 1300), "t", sample_n=100, sketches=True)
+    for a, b in zip(whole.columns_profile, chunked.columns_profile):
+        assert a.sketches["hll"] == b.sketches["hll"]
+        assert a.sketches["count"] == b.sketches["count"] == 5000
+    email = {c.name: c for c in whole.columns_profile}["email"]
+    assert email.sketches["null_count"] == 500 and email.null_count == 10
+    assert abs(email.sketches["distinct_estimate"] - 810) < 30  # i % 10 == 0 rows are the nulls
+    ids = {c.name: c for c in whole.columns_profile}["id"]
+    assert ids.sketches["quantiles"]["max"] == 4999.0
+    assert profile_table(df, "t", sample_n=100).columns_profile[0].sketches is None
+
+
+def test_serialized_sketches_merge():
+    df = pd.DataFrame({"v": np.arange(1000) % 97})
+    a = sketch_chunks([df.iloc[:400]])["v"].to_dict()
+    b = sketch_chunks([df.iloc[400:]])["v"].to_dict()
+    merged = merge_sketch_dicts(a, b)
+    assert merged["count"] == 1000 and abs(merged["distinct_estimate"] - 97) <= 2
+
+
+def test_profile_route_sketches_and_drift():
+    client = TestClient(app)
+    rows = "".join(f"C{i},{'' if i % 4 == 0 else f'u{i}@b.com'}\n" for i in range(3000))
+    body = ("customer_id,email\n" + rows).encode()
+    r = client.post("/api/v1/profile?sketches=true", files=[("files", ("c.csv", body, "text/csv"))])
+    assert r.status_code == 200
+    cols = {c["name"]: c for c in r.json()["profiles"]["c.csv"]["columns_profile"]}
+    sk = cols["email"]["sketches"]
+    assert sk["null_count"] == 750 and sk["count"] == 3000
+    # top-k values follow the example masking policy
+    assert all("@" not in v or "***" in v for _, _, v in sk["top_k"]["items"])
+    baseline = {"c.csv": r.json()["profiles"]["c.csv"]}
+    current = json.loads(json.dumps(baseline))
+    current["c.csv"]["columns_profile"][1]["sketches"]["null_count"] = 1500
+    delta = drift_between(baseline, current)["nullrate_delta"]
+    assert delta == [{"col": "email", "delta": 0.25}]
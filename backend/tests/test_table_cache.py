@@ -0,0 +1,55 @@
+import pandas as pd
+from app.services import table_cache
+from app.services.table_cache import TableCache, load_table_cached, get_table_cache
+
+
+def test_repeated_bytes_hit_cache_and_skip_parse(monkeypatch):
+    get_table_cache().clear()
+    calls = {"n": 0}
+    real = table_cache.load_table
+
+    def counting(content, filename, **kw):
+        calls["n"] += 1
+        return real(content, filename, **kw)
+
+    monkeypatch.setattr(table_cache, "load_table", counting)
+    content = b"Customer ID,Email\n1,a@b.com\n2,b@b.com\n"
+    a = load_table_cached(content, "left.csv")
+    b = load_table_cached(content, "left.csv")
+    assert calls["n"] == 1
+    assert list(b.columns) == ["customer_id", "email"]
+    # a different extension is parsed separately
+    load_table_cached(content.replace(b",", b"\t"), "left.tsv")
+    assert calls["n"] == 2
+    # callers get their own frame object
+    a.columns = ["x", "y"]
+    assert list(load_table_cached(content, "left.csv").columns) == ["customer_id", "email"]
+    stats = get_table_cache().stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+
+def test_lru_eviction_respects_byte_budget():
+    df = pd.DataFrame({"a": range(1000)})
+    size = int(df.memory_usage(deep=True).sum())
+    cache = TableCache(max_bytes=size * 2 + 1)
+    cache.put("k1", df)
+    cache.put("k2", df)
+    assert cache.get("k1") is not None  # k1 is now most recent
+    cache.put("k3", df)
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None and cache.get("k3") is not None
+    assert cache.stats()["evictions"] == 1
+    # frames bigger than the budget are never stored
+    small = TableCache(max_bytes=10)
+    small.put("big", df)
+    assert small.stats()["entries"] == 0
+
+
+def test_compound_extensions_do_not_share_entries():
+    import gzip
+    get_table_cache().clear()
+    content = gzip.compress(b"a\tb\n1\t2\n")
+    assert table_cache.cache_key("x", "t.csv.gz") != table_cache.cache_key("x", "t.tsv.gz")
+    # same bytes: read as TSV they have two columns, as CSV only one
+    assert list(load_table_cached(content, "t.tsv.gz").columns) == ["a", "b"]
+    assert len(load_table_cached(content, "t.csv.gz").columns) == 1
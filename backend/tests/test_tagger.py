@@ -0,0 +1,45 @@
+import re
+import pandas as pd
+from app.services.profile import profile_table
+from app.services.tagger import _candidates, register_semantic_tag, semantic_tags, tag_strings, unregister_semantic_tag
+
+
+COLUMNS = [
+    ["a@b.com", "c@d.ca", None, "x@y.org"],
+    ["416-555-1234", "+1 (416) 555 9999", "4165550000", "n/a"],
+    ["M5V 2T6", "K1A0B1", "h2x 1y4"],
+    ["2024-01-02", "2024-01-02T10:11:12Z", "2023-12-31 01:02:03+05:30", "2024-13"],
+    ["$1,234.50", "12", "-3.5", "abc"],
+    ["GB82WEST12345698765432", "DE89370400440532013000"],
+    ["12345678", "87654321", "12345678"],
+    ["hello", "world", "hello"],
+    ["1.5", "x", "y"],
+]
+
+
+def _naive(values):
+    s = pd.Series(values).dropna().astype(str)
+    return [t.name for t in semantic_tags() if s.str.fullmatch(re.compile(t.pattern, t.flags)).mean() >= 0.5]
+
+
+def test_compiled_tagger_matches_per_pattern_fullmatch():
+    for values in COLUMNS:
+        assert tag_strings(pd.Series(values).dropna().astype(str)) == _naive(values), values
+
+
+def test_signature_prefilter_skips_impossible_patterns():
+    values = ["12345678", "87654321"]
+    names = {t.name for t in _candidates(values, pd.Series([1.0, 1.0]).to_numpy(), 2.0)}
+    # no letters, no '@', no '-': only the digit-only shapes survive
+    assert names == {"phone_like", "currency_amount_like"}
+
+
+def test_registered_tag_is_used_by_profiles():
+    register_semantic_tag("sin_like", r"\d{3}-\d{3}-\d{3}", min_len=11, max_len=11, requires=("-",))
+    try:
+        df = pd.DataFrame({"sin": ["046-454-286", "123-456-789"], "other": ["a", "b"]})
+        tags = {c.name: c.semantic_tags for c in profile_table(df, "t", sample_n=10).columns_profile}
+        assert "sin_like" in tags["sin"] and tags["other"] == []
+    finally:
+        assert unregister_semantic_tag("sin_like")
+    assert "sin_like" not in tag_strings(pd.Series(["046-454-286"]))
@@ -36,3 +36,14 @@ def test_validation_errors():
     except TransformError:
         pass
 
+
+
+def test_to_datetime_keeps_rows_in_other_layouts():
+    # dominant day-first format, one ISO straggler
+    dates = ["03/02/2024"] * 9 + ["2024-05-06"]
+    out = apply_ops(pd.DataFrame({"d": dates}), validate_ops([{"op": "to_datetime", "args": {"field": "d"}}]))
+    assert out["d"].notna().all()
+    assert out["d"].iloc[-1] == pd.Timestamp("2024-05-06")
+    # no dominant format: every row parsed on its own
+    mixed = pd.DataFrame({"d": ["2024-01-02", "Jan 3 2024", "4 February 2024", "2024/03/05"]})
+    assert apply_ops(mixed, validate_ops([{"op": "to_datetime", "args": {"field": "d"}}]))["d"].notna().all()
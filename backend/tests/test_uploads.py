@@ -0,0 +1,77 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import pandas as pd
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.ingest import load_table, load_table_chunks, load_tables
+from app.services.uploads import spool_upload
+
+
+CSV = ("customer_id,email,city\n" + "".join(f"C{i},u{i}@b.com,Montréal\n" for i in range(50))).encode("latin-1")
+
+
+def test_spool_hashes_incrementally_and_cleans_up(tmp_path, override_settings):
+    override_settings(upload_spool_dir=str(tmp_path))
+    up = asyncio.run(spool_upload(UploadFile(io.BytesIO(CSV), filename="t.csv"), chunk_bytes=7))
+    assert up.filename == "t.csv" and up.size == len(CSV)
+    assert up.sha256 == hashlib.sha256(CSV).hexdigest()
+    assert os.path.dirname(up.path) == str(tmp_path)
+    with open(up.path, "rb") as fh:
+        assert fh.read() == CSV
+    up.cleanup()
+    assert not os.path.exists(up.path)
+    up.cleanup()  # idempotent
+
+
+def test_path_inputs_parse_like_bytes(tmp_path):
+    plain = tmp_path / "t.csv"
+    plain.write_bytes(CSV)
+    pd.testing.assert_frame_equal(load_table(str(plain), "t.csv"), load_table(CSV, "t.csv"))
+    assert len(load_table(plain, "t.csv", nrows=5)) == 5
+    assert sum(len(c) for c in load_table_chunks(str(plain), "t.csv", chunksize=20)) == 50
+    gz = tmp_path / "t.gz"
+    gz.write_bytes(gzip.compress(CSV))
+    pd.testing.assert_frame_equal(load_table(str(gz), "t.csv.gz"), load_table(CSV, "t.csv"))
+    nd = tmp_path / "t.ndjson"
+    nd.write_bytes(b'{"a": 1}\n{"a": 2}\n')
+    assert list(load_tables(str(nd), "t.ndjson")["t.ndjson"]["a"]) == [1, 2]
+
+
+def test_parquet_path_is_memory_mapped(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "t.parquet"
+    load_table(CSV, "t.csv").to_parquet(path)
+    df = load_table(str(path), "t.parquet", columns=["email"])
+    assert list(df.columns) == ["email"] and len(df) == 50
+
+
+def test_routes_leave_no_spooled_files(tmp_path, override_settings):
+    override_settings(upload_spool_dir=str(tmp_path))
+    client = TestClient(app)
+    files = [("files", ("a.csv", CSV, "text/csv")), ("files", ("b.csv", CSV, "text/csv"))]
+    assert client.post("/api/v1/profile", files=files[:1]).status_code == 200
+    assert client.post("/api/v1/match", files=files).status_code == 200
+    r = client.post("/api/v1/merge/export", files=files)
+    assert r.status_code == 200 and r.text.count("\n") == 101
+    r = client.post("/api/v1/datasets", files=files[:1])
+    assert r.json()["datasets"][0]["sha256"] == f"sha256:{hashlib.sha256(CSV).hexdigest()}"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_non_utf8_byte_past_the_sniff_window_falls_back_to_latin1(tmp_path):
+    head = "".join(f"C{i},u{i}@b.com,Paris\n" for i in range(5000))  # > 64 KiB of ASCII
+    content = ("customer_id,email,city\n" + head + "C9,z@b.com,Montréal\n").encode("latin-1")
+    assert len(content) > 64 * 1024
+    path = tmp_path / "t.csv"
+    path.write_bytes(content)
+    spooled = load_table(str(path), "t.csv")
+    assert spooled["city"].iloc[-1] == "Montréal"
+    pd.testing.assert_frame_equal(spooled, load_table(content, "t.csv"))
+    gz = tmp_path / "t.gz"
+    gz.write_bytes(gzip.compress(content))
+    assert load_table(str(gz), "t.csv.gz")["city"].iloc[-1] == "Montréal"
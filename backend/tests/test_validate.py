@@ -14,3 +14,14 @@ def test_validate_customers_contract():
     assert any(v.rule.startswith("unique(customer_id)") for v in res.violations)
 
 
+
+
+def test_date_order_parses_every_layout():
+    from app.services.validate import _date_order
+    df = pd.DataFrame({
+        "start_date": ["2024-01-10"] * 9 + ["Mar 5 2024"],
+        "end_date": ["2024-01-20"] * 9 + ["2024-03-01"],
+    })
+    # the last row only breaks the order once "Mar 5 2024" parses
+    v = _date_order(df, "start_date", "end_date")
+    assert v is not None and v.count == 1 and v.sample == [9]